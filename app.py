@@ -1,150 +1,124 @@
-from flask import Flask, request, jsonify
+import os
+import time
+
+from flask import Flask, request, jsonify, g
 from engine.engine_service import GameEngineService
+from engine.broadcaster import GameBroadcaster
+from engine.metrics import REGISTRY, MetricsRegistry
+from engine.tracing import TRACER, LEVELS
+from engine.equity import EquityService
+from engine.views import render_start_game_view, render_action_view, render_state_view,\
+    render_delta_view, render_action_delta_view, redact_hole_cards
 
 app = Flask(__name__)
 engine = GameEngineService()
+broadcaster = GameBroadcaster()
+equity_service = EquityService()
+
+STREAM_HEARTBEAT_SECONDS = 15
+MAX_BATCH_ACTIONS = 1000
+MAX_EQUITY_QUERIES = 100
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "poker_http_request_seconds", "Time spent handling HTTP requests", ["route", "method"])
+HTTP_REQUESTS_TOTAL = REGISTRY.counter(
+    "poker_http_requests_total", "HTTP requests by response status", ["route", "method", "status"])
+RENDER_SECONDS = REGISTRY.histogram(
+    "poker_render_seconds", "Time spent rendering and encoding response views", ["view"])
+
+
+@app.before_request
+def _start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def _record_request_metrics(response):
+    # The route template, not the path, so game ids do not become label values
+    route = request.url_rule.rule if request.url_rule else "<unmatched>"
+    if "request_started" in g:
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - g.request_started, route=route, method=request.method)
+    HTTP_REQUESTS_TOTAL.inc(route=route, method=request.method, status=str(response.status_code))
+    return response
+
+
+def _etag_for(game_id):
+    """ETag of the game's current version, or None if the game does not exist"""
+    version = engine.get_version(game_id)
+    return None if version is None else f"{game_id}-{version}"
+
+
+def _with_etag(response, game_id):
+    """Attach the game's version so clients can poll /state conditionally"""
+    etag = _etag_for(game_id)
+    if etag is not None:
+        response.set_etag(etag)
+    return response
+
+
+def _encode(view):
+    """Encode a view once so the cached body can be served as is; unknown views stay None"""
+    return None if view is None else app.json.dumps(view) + "\n"
+
+
+def _encode_timed(name, render, game_id, *args):
+    """Render and encode a view for the cache, observing how long a cache miss costs"""
+    with RENDER_SECONDS.time(view=name):
+        return _encode(render(engine, game_id, *args))
+
+
+def _state_body(game_id):
+    """Encoded /state body of the current version, rendered at most once per version"""
+    return engine.get_view(game_id, "state", lambda gid: _encode_timed("state", render_state_view, gid))
+
+
+def _render_stream_update(game_id):
+    """Encode the redacted state once and each player's hole cards once for all their streams"""
+    with RENDER_SECONDS.time(view="stream"):
+        view = render_state_view(engine, game_id)
+        if "error" in view:
+            return None
+        public_view, hole_cards = redact_hole_cards(view)
+        hole_cards_json = {user_id: app.json.dumps(cards) for user_id, cards in hole_cards.items()}
+        return view["version"], app.json.dumps(public_view), hole_cards_json
+
+
+def _publish_state(game_id):
+    """Engine listener pushing every state change to the game's open streams"""
+    if game_id not in engine.games:
+        broadcaster.close(game_id)
+        return
+    if not broadcaster.has_subscribers(game_id):
+        return  # Nobody is watching, so skip rendering entirely
+    update = engine.get_view(game_id, "stream", _render_stream_update)
+    if update is not None:
+        broadcaster.publish(game_id, *update)
+
+
+engine.add_listener(_publish_state)
+
 
 @app.route("/start-game", methods=["POST"])
 def start_game():
     data = request.json
     game_id = data.get("game_id")
     players = data.get("players", [])
+    small_blind_amount = data.get("small_blind_amount", 1)
 
     if not game_id or not players:
         return jsonify({"error": "Missing game_id or players"}), 400
 
     # Start the game using the engine
-    result = engine.start_game(game_id, players)
+    result = engine.start_game(game_id, players, small_blind_amount)
 
     if "error" in result:
         return jsonify(result), 400
 
-    # Get the game state from the engine
-    game = engine.games[game_id]
-    table = game["table"]
-    current_state = game["current_state"]
-
-    # Transform the response to match the expected format
-    transformed_response = {
-        "game_id": result["game_id"],
-        "min_bet": 0,  # Will be calculated based on call amount
-        "next_player": None,  # Will be set below
-        "players": [],
-        "pot": [],
-        "total_pot": 3,  # Small blind (1) + Big blind (2)
-        "valid_actions": [],
-        "is_hand_over": False,
-        "winning_hand": None
-    }
-
-    # Transform players data using PyPokerEngine's built-in methods
-    for i, player in enumerate(result["players"]):
-        # Convert hole cards to string format using PyPokerEngine's __str__ method
-        hole_cards = [str(card) for card in player["hole_cards"]]
-
-        # Convert position to numeric format
-        position_map = {"dealer": 0, "small_blind": 0, "big_blind": 1, "none": 2}
-        position = position_map.get(player["position"], 2)
-
-        transformed_response["players"].append({
-            "hole_cards": hole_cards,
-            "position": position,
-            "stack": player["stack"],
-            "user_id": player["user_id"]
-        })
-
-    # Create pot structure using PyPokerEngine's PayInfo
-    for i, player in enumerate(table.seats.players):
-        pot_amount = player.pay_info.amount if hasattr(player, 'pay_info') else 0
-
-        transformed_response["pot"].append({
-            "amount": pot_amount,
-            "user_id": player.name
-        })
-
-    # Calculate total pot from individual contributions
-    transformed_response["total_pot"] = sum(p["amount"] for p in transformed_response["pot"])
-
-    # Set next_player from the round state
-    next_player_pos = result["round_state"]["next_player"]
-    if next_player_pos is not None and 0 <= next_player_pos < len(result["round_state"]["players"]):
-        transformed_response["next_player"] = result["round_state"]["players"][next_player_pos]["name"]
-    else:
-        transformed_response["next_player"] = None
-
-        # Generate valid actions using our corrected calculation
-    next_player_pos = current_state["next_player"]
-    next_player = table.seats.players[next_player_pos]
-
-    # Calculate valid actions manually to get correct amounts
-    active_players = [p for p in table.seats.players if p.is_active()]
-    max_bet = max(p.pay_info.amount for p in active_players) if active_players else 0
-
-        # Calculate call amount for the next player
-    # In heads-up play, we need to calculate what the small blind will need to call
-    if len(table.seats.players) == 2:
-        # Debug position values
-        print(f"DEBUG: next_player.position={next_player.position}")
-        print(f"DEBUG: next_player.name={next_player.name}")
-        for i, p in enumerate(table.seats.players):
-            print(f"DEBUG: Player {i} position={p.position}, name={p.name}")
-
-        # Find small blind and big blind players
-        small_blind_player = None
-        big_blind_player = None
-        for p in table.seats.players:
-            if p.position == "small_blind":
-                small_blind_player = p
-            elif p.position == "big_blind":
-                big_blind_player = p
-
-        if small_blind_player and big_blind_player:
-            # Calculate what small blind needs to call (big blind amount - small blind amount)
-            call_amount = big_blind_player.pay_info.amount - small_blind_player.pay_info.amount
-            print(f"DEBUG: Small blind needs to call: {big_blind_player.pay_info.amount} - {small_blind_player.pay_info.amount} = {call_amount}")
-            print(f"DEBUG: Small blind player: {small_blind_player.name}, pot: {small_blind_player.pay_info.amount}, stack: {small_blind_player.stack}")
-            print(f"DEBUG: Big blind player: {big_blind_player.name}, pot: {big_blind_player.pay_info.amount}, stack: {big_blind_player.stack}")
-            print(f"DEBUG: Final call_amount: {call_amount}")
-        else:
-            call_amount = 0
-            print(f"DEBUG: Could not find both blind players")
-    else:
-        # For more than 2 players, use the old logic
-        player_contribution = next_player.pay_info.amount
-        call_amount = max(0, max_bet - player_contribution)
-
-    call_amount = max(0, call_amount)  # Can't call negative amounts
-
-
-
-    # Calculate raise amounts using PyPokerEngine's logic
-    from pypokerengine.engine.action_checker import ActionChecker
-
-    # Debug: print action histories to understand what's happening
-    print(f"DEBUG: Action histories for min raise calculation (start-game):")
-    for i, p in enumerate(table.seats.players):
-        print(f"  Player {i} ({p.name}): {p.action_histories}")
-
-    min_raise = ActionChecker._ActionChecker__min_raise_amount(table.seats.players, 1)  # 1 is small blind amount
-    print(f"DEBUG: PyPokerEngine min_raise (start-game): {min_raise}")
-
-    max_raise = next_player.stack
-
-        # Add valid actions
-    transformed_response["valid_actions"].append({"action": "fold", "amount": 0})
-    transformed_response["valid_actions"].append({"action": "call", "amount": call_amount})
-
-    # Only show raise if the player has enough chips to raise more than the call amount
-    if max_raise > call_amount:
-        transformed_response["valid_actions"].append({
-            "action": "raise",
-            "amount": {"max": max_raise, "min": min_raise}
-        })
-
-    # Set min_bet to match the call amount
-    transformed_response["min_bet"] = call_amount
-
-    return jsonify(transformed_response)
+    with TRACER.bind(game_id), RENDER_SECONDS.time(view="start_game"):
+        transformed_response = render_start_game_view(engine, game_id, result)
+    # Only the caller that started the game learns the tokens and hands each player theirs
+    transformed_response["player_tokens"] = engine.get_player_tokens(game_id)
+    return _with_etag(jsonify(transformed_response), game_id)
 
 @app.route("/action", methods=["POST"])
 def action():
@@ -157,240 +131,186 @@ def action():
     if not all([game_id, user_id, action]):
         return jsonify({"error": "Missing required fields"}), 400
 
+    since = data.get("since_version")
+
     result = engine.apply_action(game_id, user_id, action, amount)
 
     if "error" in result:
         return jsonify(result), 400
 
-    # Start with the internal response fields
-    transformed_response = {
-        "game_id": game_id,
-        "success": result.get("success", True),
-        "action_applied": result.get("action_applied", action),
-        "next_player": result.get("next_player", 0),
-        "should_advance_street": result.get("should_advance_street", False),
-        "current_street": result.get("current_street", 0),
-        "round_state": {},  # We'll transform this below
-        "is_hand_over": False,
-        "winning_hand": None
-    }
-
-    # Add client-facing fields
-    if "round_state" in result:
-        round_state = result["round_state"]
-
-        # Get the game to access table for pot calculation
-        game = engine.games.get(game_id)
-        if game:
-            table = game["table"]
-            current_state = game["current_state"]
-
-            # Transform next_player from index to player name
-            next_player_pos = result.get("next_player", 0)
-            if next_player_pos is None:
-                transformed_response["next_player"] = None
-            else:
-                next_player = table.seats.players[next_player_pos]
-                transformed_response["next_player"] = next_player.name
-                print(f"DEBUG: Action response - next_player_pos: {next_player_pos}, next_player.name: {next_player.name}")
-                print(f"DEBUG: Table player order - Player 0: {table.seats.players[0].name}, Player 1: {table.seats.players[1].name}")
-
-            # Extract board (community cards)
-            community_cards = round_state.get("community_cards", [])
-            transformed_response["board"] = [str(card) for card in community_cards]
-
-            # Transform pot to match /start-game format
-            pot = []
-            for player in table.seats.players:
-                pot_amount = player.pay_info.amount if hasattr(player, 'pay_info') else 0
-                pot.append({
-                    "amount": pot_amount,
-                    "user_id": player.name
-                })
-            transformed_response["pot"] = pot
-
-            # Calculate total pot
-            transformed_response["total_pot"] = sum(p["amount"] for p in pot)
-
-            # Set street
-            transformed_response["street"] = round_state.get("street", 0)
-
-            # Generate valid actions for the next player
-            # Check if we're at showdown (no valid actions)
-            if current_state.get("street") == 4:  # SHOWDOWN
-                transformed_response["valid_actions"] = []
-            else:
-                active_players = [p for p in table.seats.players if p.is_active()]
-                max_bet = max(p.pay_info.amount for p in active_players) if active_players else 0
-
-                # Calculate call amount for the next player (who is about to act)
-                if next_player is not None:
-                    player_contribution = next_player.pay_info.amount
-                    call_amount = max(0, max_bet - player_contribution)
-                    print(f"DEBUG: Valid actions - next_player: {next_player.name}, max_bet: {max_bet}, player_contribution: {player_contribution}, call_amount: {call_amount}")
-                else:
-                    call_amount = 0
-
-                call_amount = max(0, call_amount)  # Can't call negative amounts
-
-                                # Calculate raise amounts using PyPokerEngine's logic
-                from pypokerengine.engine.action_checker import ActionChecker
-
-                # Debug: print action histories to understand what's happening
-                print(f"DEBUG: Action histories for min raise calculation:")
-                for i, p in enumerate(table.seats.players):
-                    print(f"  Player {i} ({p.name}): {p.action_histories}")
-
-                min_raise = ActionChecker._ActionChecker__min_raise_amount(table.seats.players, 1)  # 1 is small blind amount
-                print(f"DEBUG: PyPokerEngine min_raise: {min_raise}")
-
-                max_raise = next_player.stack if next_player is not None else 0
-
-                # Add valid actions
-                valid_actions = []
-                valid_actions.append({"action": "fold", "amount": 0})
-
-                # If call amount is 0, it's a check, otherwise it's a call
-                if call_amount == 0:
-                    valid_actions.append({"action": "check", "amount": 0})
-                    print(f"DEBUG: Added check action (call_amount: {call_amount})")
-                else:
-                    valid_actions.append({"action": "call", "amount": call_amount})
-                    print(f"DEBUG: Added call action (call_amount: {call_amount})")
-
-                # Only show raise if the player has enough chips to raise more than the call amount
-                if max_raise > call_amount:
-                    valid_actions.append({
-                        "action": "raise",
-                        "amount": {"max": max_raise, "min": min_raise}
-                    })
-
-                transformed_response["valid_actions"] = valid_actions
-                print(f"DEBUG: Final valid_actions: {valid_actions}")
-
-    # Check if hand is over (showdown)
-    winning_hand = engine.get_winning_hand(game_id)
-    if winning_hand:
-        transformed_response["is_hand_over"] = True
-        transformed_response["winning_hand"] = winning_hand
-        # During showdown, there are no valid actions
-        transformed_response["valid_actions"] = []
-
-    # Transform round_state to handle Card objects
-    if "round_state" in result:
-        round_state = result["round_state"]
-
-        # Transform players data to handle Card objects
-        transformed_players = []
-        for player in round_state.get("players", []):
-            # Convert hole cards to string format
-            hole_cards = [str(card) for card in player.get("hole_cards", [])]
-
-            transformed_players.append({
-                "user_id": player.get("name", ""),  # Use user_id instead of name
-                "stack": player.get("stack", 0),
-                "hole_cards": hole_cards,
-                "is_active": player.get("is_active", True),
-                "position": player.get("position", "none")
-            })
-
-        # Transform community cards to string format
-        community_cards = [str(card) for card in round_state.get("community_cards", [])]
-
-        # Move players to top level
-        transformed_response["players"] = transformed_players
-
-        transformed_response["round_state"] = {
-            "dealer_btn": round_state.get("dealer_btn", 0),
-            "sb_pos": round_state.get("sb_pos", 0),
-            "bb_pos": round_state.get("bb_pos", 0),
-            "community_cards": community_cards,
-            "pot": round_state.get("pot", 0),
-            "street": round_state.get("street", 0),
-            "next_player": round_state.get("next_player", 0)
-        }
-
-    return jsonify(transformed_response)
+    # Clients that pass the last version they saw get only what changed since then
+    transformed_response = None
+    if since is not None:
+        with TRACER.bind(game_id), RENDER_SECONDS.time(view="action_delta"):
+            transformed_response = render_action_delta_view(engine, game_id, action, result, since)
+    if transformed_response is None:
+        with TRACER.bind(game_id), RENDER_SECONDS.time(view="action"):
+            transformed_response = render_action_view(engine, game_id, action, result)
+    return _with_etag(jsonify(transformed_response), game_id)
+
+@app.route("/batch-action", methods=["POST"])
+def batch_action():
+    data = request.json or {}
+    actions = data.get("actions") if isinstance(data, dict) else None
+
+    if not isinstance(actions, list) or not actions:
+        return jsonify({"error": "Missing actions"}), 400
+    if len(actions) > MAX_BATCH_ACTIONS:
+        return jsonify({"error": f"At most {MAX_BATCH_ACTIONS} actions per batch"}), 400
+
+    # Apply in order; a failed item does not stop the ones after it
+    results = []
+    touched_games = []
+    for item in actions:
+        if not isinstance(item, dict):
+            results.append({"game_id": None, "error": "Action must be an object"})
+            continue
+        game_id = item.get("game_id")
+        user_id = item.get("user_id")
+        action = item.get("action")
+        amount = item.get("amount", 0)
+
+        if not all([game_id, user_id, action]):
+            results.append({"game_id": game_id, "error": "Missing required fields"})
+            continue
+        if not all(isinstance(field, str) for field in (game_id, user_id, action)):
+            results.append({"game_id": None, "error": "game_id, user_id and action must be strings"})
+            continue
+
+        result = engine.apply_action(game_id, user_id, action, amount)
+        if "error" in result:
+            results.append({"game_id": game_id, "error": result["error"]})
+            continue
+
+        results.append({
+            "game_id": game_id,
+            "success": result.get("success", True),
+            "action_applied": result.get("action_applied", action),
+            "version": engine.get_version(game_id)
+        })
+        if game_id not in touched_games:
+            touched_games.append(game_id)
+
+    # Only the final state of each game is rendered, reusing the cached /state body
+    game_bodies = []
+    for game_id in touched_games:
+        body = _state_body(game_id)
+        if body is not None:
+            game_bodies.append(app.json.dumps(game_id) + ":" + body.rstrip("\n"))
+
+    body = '{"games":{' + ",".join(game_bodies) + '},"results":' + app.json.dumps(results) + "}\n"
+    return app.response_class(body, mimetype=app.json.mimetype)
 
 @app.route("/state/<game_id>", methods=["GET"])
 def get_state(game_id):
-    result = engine.get_state(game_id)
-
-    if "error" in result:
-        return jsonify(result), 400
+    etag = _etag_for(game_id)
+    if etag is None:
+        return jsonify({"error": "Game not found"}), 400
 
-    # Get the game to access table for pot calculation
-    game = engine.games.get(game_id)
-    if not game:
+    # Polling clients that already hold this version get an empty 304
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+        response.set_etag(etag)
+        return response
+
+    # The encoded body is cached per version, so repeated polls skip rendering and JSON encoding
+    since = request.args.get("since", type=int)
+    body = None
+    if since is not None:
+        body = engine.get_view(game_id, f"delta-{since}", lambda gid: _encode_timed("delta", render_delta_view, gid, since))
+    if body is None:
+        body = _state_body(game_id)
+    if body is None:
         return jsonify({"error": "Game not found"}), 400
 
-    table = game["table"]
-
-    # Transform the response to handle Card objects
-    transformed_response = {
-        "game_id": game_id,
-        "dealer_btn": result.get("dealer_btn", 0),
-        "sb_pos": result.get("sb_pos", 0),
-        "bb_pos": result.get("bb_pos", 0),
-        "community_cards": [],
-        "pot": [],  # Will be calculated from player.pay_info.amount
-        "street": result.get("street", 0),
-        "next_player": "",  # Will be transformed from index to player name
-        "players": [],
-        "is_hand_over": False,
-        "winning_hand": None
-    }
-
-    # Transform community cards to string format
-    if "community_cards" in result:
-        transformed_response["community_cards"] = [str(card) for card in result["community_cards"]]
-
-    # Transform players data to handle Card objects and calculate pot
-    for player in result.get("players", []):
-        # Convert hole cards to string format
-        hole_cards = [str(card) for card in player.get("hole_cards", [])]
-
-        transformed_response["players"].append({
-            "user_id": player.get("name", ""),  # Use user_id instead of name
-            "stack": player.get("stack", 0),
-            "hole_cards": hole_cards,
-            "is_active": player.get("is_active", True),
-            "position": player.get("position", "none")
-        })
+    response = app.response_class(body, mimetype=app.json.mimetype)
+    response.set_etag(etag)
+    return response
 
-    # Transform next_player from index to player name
-    next_player_pos = result.get("next_player", 0)
-    if next_player_pos is None:
-        transformed_response["next_player"] = None
-    elif 0 <= next_player_pos < len(table.seats.players):
-        next_player = table.seats.players[next_player_pos]
-        transformed_response["next_player"] = next_player.name
-    else:
-        transformed_response["next_player"] = ""
-
-    # Calculate pot from player.pay_info.amount (matching /start-game format)
-    for i, player in enumerate(table.seats.players):
-        pot_amount = player.pay_info.amount if hasattr(player, 'pay_info') else 0
-        transformed_response["pot"].append({
-            "amount": pot_amount,
-            "user_id": player.name
-        })
+@app.route("/stream/<game_id>", methods=["GET"])
+def stream(game_id):
+    if engine.get_version(game_id) is None:
+        return jsonify({"error": "Game not found"}), 400
 
-    # Check if hand is over (showdown)
-    winning_hand = engine.get_winning_hand(game_id)
-    if winning_hand:
-        transformed_response["is_hand_over"] = True
-        transformed_response["winning_hand"] = winning_hand
+    # Players prove who they are with the token from /start-game; without user_id it is a spectator
+    user_id = request.args.get("user_id")
+    if user_id is not None and not engine.check_player_token(game_id, user_id, request.args.get("token")):
+        return jsonify({"error": "Invalid player token"}), 403
+    subscription = broadcaster.subscribe(game_id, user_id)
+
+    # Rendered after subscribing so no change can slip between this frame and the stream
+    update = engine.get_view(game_id, "stream", _render_stream_update)
+
+    def generate():
+        try:
+            if update is None:
+                yield GameBroadcaster.END_FRAME
+                return
+            version, public_json, hole_cards_json = update
+            yield GameBroadcaster.format_frame(version, public_json, hole_cards_json.get(user_id))
+
+            while True:
+                frame = subscription.next_frame(timeout=STREAM_HEARTBEAT_SECONDS)
+                if frame is None:
+                    yield ": keepalive\n\n"
+                    continue
+                yield frame
+                if frame == GameBroadcaster.END_FRAME:
+                    break
+        finally:
+            broadcaster.unsubscribe(subscription)
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return app.response_class(generate(), mimetype="text/event-stream", headers=headers)
+
+@app.route("/next-hand/<game_id>", methods=["POST"])
+def next_hand(game_id):
+    result = engine.next_hand(game_id)
 
-    # Calculate total pot
-    transformed_response["total_pot"] = sum(p["amount"] for p in transformed_response["pot"])
+    if "error" in result:
+        return jsonify(result), 400
 
-    return jsonify(transformed_response)
+    with TRACER.bind(game_id), RENDER_SECONDS.time(view="start_game"):
+        transformed_response = render_start_game_view(engine, game_id, result)
+    return _with_etag(jsonify(transformed_response), game_id)
 
 @app.route("/end-game/<game_id>", methods=["POST"])
 def end_game(game_id):
     result = engine.end_game(game_id)
     return jsonify(result)
 
+@app.route("/equity", methods=["POST"])
+def equity():
+    data = request.json or {}
+    queries = data.get("queries")
+
+    if not isinstance(queries, list) or not queries:
+        return jsonify({"error": "Missing queries"}), 400
+    if len(queries) > MAX_EQUITY_QUERIES:
+        return jsonify({"error": f"At most {MAX_EQUITY_QUERIES} queries per request"}), 400
+
+    # Computed in worker processes, so this request only waits and never competes for the GIL
+    return jsonify({"results": equity_service.evaluate(queries)})
+
+@app.route("/trace/<game_id>", methods=["GET"])
+def get_trace(game_id):
+    trace = TRACER.dump(game_id)
+    if trace is None:
+        return jsonify({"error": "Game not found"}), 400
+    return jsonify(trace)
+
+@app.route("/trace/<game_id>", methods=["POST"])
+def set_trace_level(game_id):
+    level = (request.json or {}).get("level")
+    if level not in LEVELS:
+        return jsonify({"error": f"level must be one of {', '.join(LEVELS)}"}), 400
+    if TRACER.set_level(game_id, LEVELS[level]) is None:
+        return jsonify({"error": "Game not found"}), 400
+    return jsonify({"game_id": game_id, "level": level})
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    return app.response_class(REGISTRY.expose(), content_type=MetricsRegistry.CONTENT_TYPE)
+
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=3000)
+    app.run(host="0.0.0.0", port=int(os.environ.get("PORT", 3000)))
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Load generator for the HTTP game API (app.py + GameEngineService)
+
+Simulate concurrent games with bot players against a locally started server and record
+the request stream:
+    python -m benchmarks.http_load simulate --games 200 --concurrency 16 --record run.jsonl
+
+Replay a recorded stream, e.g. before and after a server-side change:
+    python -m benchmarks.http_load replay run.jsonl --concurrency 16
+
+Pass --url to target an already running server instead of starting one. The report lists
+throughput, latency percentiles per route and, for a locally started server, its memory
+growth per game.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import queue
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+from collections import defaultdict
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PERCENTILES = (50, 90, 99)
+
+
+def route_of(path):
+    """Group requests by endpoint, e.g. /state/G1?since=3 → /state"""
+    path = urllib.parse.urlsplit(path).path
+    return "/" + path.strip("/").split("/")[0]
+
+
+def game_id_of(entry):
+    """Game a recorded request belongs to, used to keep each game's requests in order on replay"""
+    body = entry.get("body") or {}
+    if "game_id" in body:
+        return body["game_id"]
+    if body.get("actions"):
+        return body["actions"][0].get("game_id")
+    parts = urllib.parse.urlsplit(entry["path"]).path.strip("/").split("/")
+    return parts[1] if len(parts) > 1 else None
+
+
+def percentile(sorted_samples, pct):
+    index = min(len(sorted_samples) - 1, int(round(pct / 100.0 * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+class LatencyRecorder:
+    """Thread-safe latency samples and error counts per route"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def add(self, route, seconds, ok):
+        with self._lock:
+            self.samples[route].append(seconds)
+            if not ok:
+                self.errors[route] += 1
+
+    def summary(self, elapsed):
+        routes = {}
+        total = 0
+        for route, samples in sorted(self.samples.items()):
+            samples = sorted(samples)
+            total += len(samples)
+            stats = {"requests": len(samples), "errors": self.errors[route]}
+            for pct in PERCENTILES:
+                stats[f"p{pct}_ms"] = round(percentile(samples, pct) * 1000, 3)
+            stats["max_ms"] = round(samples[-1] * 1000, 3)
+            routes[route] = stats
+        return {
+            "requests": total,
+            "elapsed_s": round(elapsed, 3),
+            "throughput_rps": round(total / elapsed, 1) if elapsed > 0 else None,
+            "routes": routes
+        }
+
+
+class RequestLog:
+    """Appends every request as one JSON line so the run can be replayed"""
+
+    def __init__(self, path):
+        self._file = open(path, "w")
+        self._lock = threading.Lock()
+
+    def write(self, method, path, body, headers=None):
+        line = json.dumps({"method": method, "path": path, "body": body, "headers": headers or {}})
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def close(self):
+        self._file.close()
+
+
+class ApiClient:
+    """One connection per worker thread, timing every request it makes"""
+
+    def __init__(self, base_url, recorder, request_log=None):
+        url = urllib.parse.urlsplit(base_url)
+        self.connection = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=30)
+        self.recorder = recorder
+        self.request_log = request_log
+
+    def request(self, method, path, body=None, headers=None):
+        """Return (status, parsed JSON body or None, response headers)"""
+        if self.request_log:
+            self.request_log.write(method, path, body, headers)
+        payload = None if body is None else json.dumps(body)
+        request_headers = {"Content-Type": "application/json"} if payload is not None else {}
+        request_headers.update(headers or {})
+
+        started = time.perf_counter()
+        try:
+            self.connection.request(method, path, body=payload, headers=request_headers)
+            response = self.connection.getresponse()
+            raw = response.read()
+        except (http.client.HTTPException, OSError):
+            self.connection.close()
+            self.recorder.add(route_of(path), time.perf_counter() - started, False)
+            return None, None, {}
+        elapsed = time.perf_counter() - started
+
+        try:
+            data = json.loads(raw) if raw else None
+        except ValueError:
+            # An HTML error page from a proxy or a truncated body: a failed request, not a dead worker
+            self.recorder.add(route_of(path), elapsed, False)
+            return None, None, {}
+        self.recorder.add(route_of(path), elapsed, response.status < 400)
+        return response.status, data, dict(response.getheaders())
+
+    def close(self):
+        self.connection.close()
+
+
+def choose_action(valid_actions, rng, strategy):
+    """Pick (action, amount) from the valid actions of an API response"""
+    if strategy == "passive":
+        passive = [a for a in valid_actions if a["action"] in ("check", "call")]
+        choice = passive[0] if passive else valid_actions[0]
+    else:
+        choice = rng.choice(valid_actions)
+    amount = choice["amount"]
+    if isinstance(amount, dict):
+        amount = amount["min"]
+    return choice["action"], amount
+
+
+def play_game(client, game_id, player_count, rng, args):
+    """Play one hand through /start-game and /action, polling /state between actions"""
+    players = [{"user_id": f"{game_id}-P{i}", "stack": args.stack} for i in range(player_count)]
+    status, data, headers = client.request("POST", "/start-game", {"game_id": game_id, "players": players})
+    if status != 200:
+        return False
+
+    for _ in range(args.max_actions):
+        if data.get("is_hand_over") or not data.get("next_player") or not data.get("valid_actions"):
+            break
+        action, amount = choose_action(data["valid_actions"], rng, args.strategy)
+        status, data, headers = client.request("POST", "/action", {
+            "game_id": game_id, "user_id": data["next_player"], "action": action, "amount": amount
+        })
+        if status != 200:
+            break
+        # Other seats polling conditionally, as real clients do
+        for _ in range(args.polls_per_action):
+            client.request("GET", f"/state/{game_id}", headers={"If-None-Match": headers.get("ETag", "")})
+
+    if not args.keep_games:
+        client.request("POST", f"/end-game/{game_id}")
+    return True
+
+
+def run_simulation(args, base_url, recorder, request_log):
+    games = queue.Queue()
+    for index in range(args.games):
+        games.put(index)
+
+    def worker(worker_index):
+        client = ApiClient(base_url, recorder, request_log)
+        rng = random.Random(args.seed * 1000 + worker_index)
+        while True:
+            try:
+                index = games.get_nowait()
+            except queue.Empty:
+                break
+            player_count = rng.randint(args.min_players, args.max_players)
+            play_game(client, f"LOAD-{args.seed}-{index}", player_count, rng, args)
+        client.close()
+
+    return run_workers(worker, args.concurrency)
+
+
+def run_replay(args, base_url, recorder, request_log):
+    # Requests of one game stay in recorded order; different games run concurrently
+    streams = defaultdict(list)
+    with open(args.path) as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                streams[game_id_of(entry)].append(entry)
+    pending = queue.Queue()
+    for entries in streams.values():
+        pending.put(entries)
+
+    def worker(worker_index):
+        client = ApiClient(base_url, recorder, request_log)
+        while True:
+            try:
+                entries = pending.get_nowait()
+            except queue.Empty:
+                break
+            for entry in entries:
+                client.request(entry["method"], entry["path"], entry.get("body"), entry.get("headers"))
+        client.close()
+
+    return run_workers(worker, args.concurrency), len(streams)
+
+
+def run_workers(worker, concurrency):
+    """Run worker(index) on `concurrency` threads and return the wall time.
+
+    A worker that dies would leave a report with only part of the load, so that fails the run.
+    """
+    failures = []
+
+    def run(index):
+        try:
+            worker(index)
+        except Exception as e:
+            failures.append(e)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if failures:
+        raise RuntimeError(f"{len(failures)} of {concurrency} load workers failed, first: {failures[0]!r}")
+    return time.perf_counter() - started
+
+
+class LocalServer:
+    """Runs app.py in a subprocess on a free port"""
+
+    def __init__(self, port=None):
+        self.port = port or self._free_port()
+        self.process = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self, timeout=15):
+        env = dict(os.environ, PORT=str(self.port))
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT_DIR, "app.py")],
+            cwd=ROOT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            try:
+                socket.create_connection(("127.0.0.1", self.port), timeout=0.2).close()
+                return
+            except OSError:
+                time.sleep(0.1)
+        self.stop()
+        raise RuntimeError(f"Server did not start on port {self.port}")
+
+    def rss_kb(self):
+        """Resident memory of the server process (Linux only, None elsewhere)"""
+        try:
+            with open(f"/proc/{self.process.pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1])
+        except OSError:
+            return None
+        return None
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            self.process.wait(timeout=10)
+
+    @staticmethod
+    def _free_port():
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            return s.getsockname()[1]
+
+
+def parse_args(argv):
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--url", help="Target an already running server instead of starting app.py")
+    common.add_argument("--concurrency", type=int, default=8)
+    common.add_argument("--record", help="Write every request to this JSONL file")
+    common.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    parser = argparse.ArgumentParser(description="Load test the HTTP game API")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    simulate = subparsers.add_parser("simulate", parents=[common], help="Play games with bot players")
+    simulate.add_argument("--games", type=int, default=100)
+    simulate.add_argument("--min-players", type=int, default=2)
+    simulate.add_argument("--max-players", type=int, default=6)
+    simulate.add_argument("--stack", type=int, default=100)
+    simulate.add_argument("--strategy", choices=["random", "passive"], default="random")
+    simulate.add_argument("--polls-per-action", type=int, default=2)
+    simulate.add_argument("--max-actions", type=int, default=200)
+    simulate.add_argument("--keep-games", action="store_true",
+                          help="Do not end games, so memory growth shows the cost of a live game")
+    simulate.add_argument("--seed", type=int, default=0)
+
+    replay = subparsers.add_parser("replay", parents=[common], help="Replay a recorded JSONL request stream")
+    replay.add_argument("path")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    recorder = LatencyRecorder()
+    request_log = RequestLog(args.record) if args.record else None
+    server = None if args.url else LocalServer()
+    if server:
+        server.start()
+    try:
+        base_url = args.url or server.url
+        rss_before = server.rss_kb() if server else None
+        if args.command == "simulate":
+            elapsed = run_simulation(args, base_url, recorder, request_log)
+            game_count = args.games
+        else:
+            elapsed, game_count = run_replay(args, base_url, recorder, request_log)
+        rss_after = server.rss_kb() if server else None
+    finally:
+        if request_log:
+            request_log.close()
+        if server:
+            server.stop()
+
+    report = recorder.summary(elapsed)
+    report["games"] = game_count
+    if rss_before is not None and rss_after is not None:
+        report["memory"] = {
+            "rss_before_kb": rss_before,
+            "rss_after_kb": rss_after,
+            "growth_per_game_kb": round((rss_after - rss_before) / max(game_count, 1), 2)
+        }
+    print_report(report, args.json)
+    return report
+
+
+def print_report(report, as_json=False):
+    if as_json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{report['requests']} requests for {report['games']} games in {report['elapsed_s']}s "
+          f"({report['throughput_rps']} req/s)")
+    print(f"{'route':<16}{'requests':>10}{'errors':>8}" + "".join(f"{'p%d ms' % p:>10}" for p in PERCENTILES)
+          + f"{'max ms':>10}")
+    for route, stats in report["routes"].items():
+        print(f"{route:<16}{stats['requests']:>10}{stats['errors']:>8}"
+              + "".join(f"{stats['p%d_ms' % p]:>10}" for p in PERCENTILES) + f"{stats['max_ms']:>10}")
+    if "memory" in report:
+        memory = report["memory"]
+        print(f"server RSS {memory['rss_before_kb']} KB → {memory['rss_after_kb']} KB "
+              f"({memory['growth_per_game_kb']} KB per game)")
+
+
+if __name__ == "__main__":
+    main()
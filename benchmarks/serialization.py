@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Encode/decode benchmark for game state snapshots
+
+Plays random hands with the round manager, snapshots the game state after every action and
+times the list format (Table.serialize / Table.deserialize, stored with pickle) against the
+binary TableCodec on those snapshots:
+    python -m benchmarks.serialization --players 9 --hands 200
+
+Every snapshot is checked to decode back to the same Table.serialize() before timing.
+"""
+
+import argparse
+import json
+import pickle
+import random
+import time
+
+from pypokerengine.engine.action_checker import ActionChecker
+from pypokerengine.engine.player import Player
+from pypokerengine.engine.poker_constants import PokerConstants as Const
+from pypokerengine.engine.round_manager import RoundManager
+from pypokerengine.engine.table import Table
+from pypokerengine.engine.table_codec import TableCodec
+
+
+def collect_snapshots(players, hands, seed):
+    """Game states seen while playing `hands` random hands, one per action"""
+    rng = random.Random(seed)
+    random.seed(seed)  # deck shuffles
+    snapshots = []
+    for hand in range(hands):
+        table = Table()
+        for i in range(players):
+            table.seats.sitdown(Player("uuid-%d" % i, rng.randint(50, 500), "player %d" % i))
+        table.dealer_btn = hand % players
+        table.set_blind_pos((hand + 1) % players, (hand + 2) % players)
+        state, _ = RoundManager.start_new_round(hand + 1, 5, 1, table)
+        while state["street"] != Const.Street.FINISHED:
+            snapshots.append(state)
+            seats = state["table"].seats.players
+            valid = ActionChecker.legal_actions(seats, state["next_player"], state["small_blind_amount"])
+            action = rng.choice(["fold", "call", "call", "raise"])
+            if action == "raise" and valid[2]["amount"]["min"] == -1:
+                action = "call"
+            amount = {"fold": 0, "call": valid[1]["amount"], "raise": valid[2]["amount"]["min"]}[action]
+            state, _ = RoundManager.apply_action(state, action, amount)
+    return snapshots
+
+
+def measure(func, items, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(items) * 1e6
+
+
+def run(args):
+    snapshots = collect_snapshots(args.players, args.hands, args.seed)
+    tables = [state["table"] for state in snapshots]
+    pickles = [pickle.dumps(table.serialize()) for table in tables]
+    blobs = [TableCodec.encode_game_state(state) for state in snapshots]
+    for state, blob in zip(snapshots, blobs):
+        assert TableCodec.decode_game_state(blob)["table"].serialize() == state["table"].serialize()
+
+    return {
+        "snapshots": len(snapshots),
+        "players": args.players,
+        "list": {
+            "encode_us": round(measure(lambda table: pickle.dumps(table.serialize()), tables, args.repeat), 2),
+            "decode_us": round(measure(lambda data: Table.deserialize(pickle.loads(data)), pickles, args.repeat), 2),
+            "bytes": round(sum(len(data) for data in pickles) / len(pickles), 1)
+        },
+        "binary": {
+            "encode_us": round(measure(TableCodec.encode_game_state, snapshots, args.repeat), 2),
+            "decode_us": round(measure(TableCodec.decode_game_state, blobs, args.repeat), 2),
+            "bytes": round(sum(len(blob) for blob in blobs) / len(blobs), 1)
+        }
+    }
+
+
+def print_report(report, as_json=False):
+    if as_json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{report['snapshots']} snapshots of {report['players']} player tables (per snapshot)")
+    print(f"{'format':<10}{'encode us':>12}{'decode us':>12}{'bytes':>10}")
+    lists, binary = report["list"], report["binary"]
+    print(f"{'list':<10}{lists['encode_us']:>12}{lists['decode_us']:>12}{lists['bytes']:>10}")
+    print(f"{'binary':<10}{binary['encode_us']:>12}{binary['decode_us']:>12}{binary['bytes']:>10}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=9)
+    parser.add_argument("--hands", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3, help="timing runs; the best one is reported")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run(args)
+    print_report(report, args.json)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,9 @@ from slack_bolt import App
 from slack_bolt.adapter.socket_mode import SocketModeHandler
 import os
 from dotenv import load_dotenv
-import threading
 
+from engine.game_runner import GameScheduler, ResumableGame
+from engine.slack_outbox import SlackOutbox
 from slackbot.lobby_manager import LobbyManager
 from slackbot.slack_handlers import register_handlers
 from slackbot.slack_player import SlackPlayer
@@ -17,34 +18,44 @@ app = App(
     signing_secret=os.environ["SLACK_SIGNING_SECRET"]
 )
 
-# Register button action handlers
-register_handlers(app)
+# Games run on a bounded pool and only hold a thread while they have work to do; every seat is a
+# human here, so a player that would answer on a pool thread is refused when the game starts
+game_scheduler = GameScheduler(max_workers=int(os.environ.get("POKER_GAME_WORKERS", 8)), deferred_only=True)
+
+# Register button action handlers; they pass decisions to game_scheduler.submit_action
+register_handlers(app, game_scheduler)
 
 # Lobby store
 lobby_manager = LobbyManager()
 
 
 # ---------- GAME LOOP ----------
-def run_poker_game(code, player_ids, slack_client):
-    from pypokerengine.api.game import setup_config, start_poker
+def build_poker_game(code, player_ids, slack_client):
+    from pypokerengine.api.game import setup_config
 
     config = setup_config(max_round=10, initial_stack=1000, small_blind_amount=20)
 
+    # Players post to the outbox, which sends one coalesced message per player at each decision point
+    outbox = SlackOutbox(slack_client)
+
     for uid in player_ids:
-        player = SlackPlayer(user_id=uid, slack_client=slack_client)
+        # SlackPlayer is a DeferredPlayer: it posts the action buttons and returns immediately
+        player = SlackPlayer(user_id=uid, slack_client=outbox, game_id=code)
         config.register_player(name=uid, algorithm=player)
 
-    game_result = start_poker(config, verbose=1)
+    def on_finish(game, game_result):
+        # Notify players the game is over
+        for uid in player_ids:
+            outbox.chat_postMessage(
+                channel=uid,
+                text="🃏 Game over! Thanks for playing.\n(More detailed results coming soon.)"
+            )
+        outbox.flush()
 
-    # Notify players the game is over
-    for uid in player_ids:
-        slack_client.chat_postMessage(
-            channel=uid,
-            text="🃏 Game over! Thanks for playing.\n(More detailed results coming soon.)"
-        )
+        # Clean up the lobby
+        lobby_manager.clear_lobby(code)
 
-    # Clean up the lobby
-    lobby_manager.clear_lobby(code)
+    return ResumableGame(code, config, on_finish=on_finish, outbox=outbox)
 
 
 # ---------- /start ----------
@@ -99,12 +110,10 @@ def begin_game(ack, body, respond, command):
 
     respond(f"♠️ Starting game *{code}* with players: {', '.join(f'<@{p}>' for p in players)}")
 
-    thread = threading.Thread(
-        target=run_poker_game,
-        args=(code, players, app.client),
-        daemon=True
-    )
-    thread.start()
+    try:
+        game_scheduler.start(build_poker_game(code, players, app.client))
+    except ValueError:
+        respond(f"⏳ Game *{code}* is already running.")
 
 
 # ---------- MAIN ----------
@@ -0,0 +1,95 @@
+import queue
+import threading
+
+
+class Subscription:
+    """One open event stream. Only the newest frame is kept because every frame is a full state."""
+
+    def __init__(self, game_id, user_id=None):
+        self.game_id = game_id
+        self.user_id = user_id  # None for spectators
+        self._frames = queue.Queue(maxsize=1)
+
+    def push(self, frame):
+        """Replace any frame the client has not picked up yet"""
+        while True:
+            try:
+                self._frames.put_nowait(frame)
+                return
+            except queue.Full:
+                try:
+                    self._frames.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def next_frame(self, timeout):
+        """Wait for the next frame, returning None when nothing arrived within timeout"""
+        try:
+            return self._frames.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class GameBroadcaster:
+    """Fans each game state change out to every open stream of that game.
+
+    The public part of an update is serialized once per change. Each player additionally
+    receives their own hole cards, serialized once per player rather than once per stream.
+    """
+
+    END_FRAME = "event: end\ndata: {}\n\n"
+
+    def __init__(self):
+        self._subscriptions = {}  # game_id → [Subscription]
+        self._lock = threading.Lock()
+
+    def subscribe(self, game_id, user_id=None):
+        subscription = Subscription(game_id, user_id)
+        with self._lock:
+            self._subscriptions.setdefault(game_id, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.game_id, [])
+            if subscription in subscriptions:
+                subscriptions.remove(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(subscription.game_id, None)
+
+    def has_subscribers(self, game_id):
+        return bool(self._subscriptions.get(game_id))
+
+    def publish(self, game_id, version, public_json, hole_cards_json):
+        """Send one update: public_json is the redacted view, hole_cards_json maps user_id → JSON list"""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(game_id, []))
+
+        spectator_frame = None
+        player_frames = {}
+        for subscription in subscriptions:
+            user_id = subscription.user_id
+            if user_id in hole_cards_json:
+                if user_id not in player_frames:
+                    player_frames[user_id] = self.format_frame(version, public_json, hole_cards_json[user_id])
+                subscription.push(player_frames[user_id])
+            else:
+                if spectator_frame is None:
+                    spectator_frame = self.format_frame(version, public_json)
+                subscription.push(spectator_frame)
+
+    def close(self, game_id):
+        """Tell every stream of the game that it has ended"""
+        with self._lock:
+            subscriptions = self._subscriptions.pop(game_id, [])
+        for subscription in subscriptions:
+            subscription.push(self.END_FRAME)
+
+    @staticmethod
+    def format_frame(version, public_json, hole_cards_json=None):
+        """Server-sent event for one state version; the JSON parts are spliced in, not re-encoded"""
+        if hole_cards_json is None:
+            data = '{"view":' + public_json + '}'
+        else:
+            data = '{"view":' + public_json + ',"hole_cards":' + hole_cards_json + '}'
+        return f"id: {version}\nevent: state\ndata: {data}\n\n"
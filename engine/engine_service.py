@@ -1,85 +1,172 @@
-from pypokerengine.engine.dealer import Dealer
 from pypokerengine.engine.table import Table
-from pypokerengine.engine.player import Player
-from pypokerengine.engine.round_manager import RoundManager
 from pypokerengine.engine.poker_constants import PokerConstants as Const
-from .models import SetupPlayer
+from .models import TablePlayer
+from .views import snapshot_game
+from .metrics import REGISTRY
+from .tracing import TRACER, DEBUG
+from collections import OrderedDict
+import hmac
+import itertools
 import random
+import secrets
+import time
+
+APPLY_ACTION_SECONDS = REGISTRY.histogram(
+    "poker_apply_action_seconds", "Time spent applying one player action", ["action"])
+ACTIONS_TOTAL = REGISTRY.counter(
+    "poker_actions_total", "Player actions by outcome", ["action", "result"])
+STREET_ADVANCE_SECONDS = REGISTRY.histogram(
+    "poker_street_advance_seconds", "Time spent advancing from a street to the next", ["street"])
+SHOWDOWN_SECONDS = REGISTRY.histogram(
+    "poker_showdown_seconds", "Time spent evaluating hands at the end of a hand", ["phase"])
+VIEW_CACHE_TOTAL = REGISTRY.counter(
+    "poker_view_cache_total", "Cached view lookups by result", ["result"])
+GAMES_ACTIVE = REGISTRY.gauge(
+    "poker_games_active", "Games currently held by the engine")
 
 class GameEngineService:
-    def __init__(self):
-        self.games = {}  # game_id → { dealer, table, players, status, round_state, current_state }
+    SNAPSHOT_HISTORY = 64  # Versions per game that delta responses can be computed from
+    KNOWN_ACTIONS = ("fold", "call", "check", "raise")
+    UUID_CHARS = [chr(code) for code in range(97, 123)]
+    STREET_NAMES = {
+        Const.Street.PREFLOP: "preflop",
+        Const.Street.FLOP: "flop",
+        Const.Street.TURN: "turn",
+        Const.Street.RIVER: "river"
+    }
 
-    def start_game(self, game_id, players):
+    def __init__(self):
+        self.games = {}  # game_id → { table, players, status, round_state, current_state, version, views }
+        self._versions = itertools.count(1)  # Shared so a version is never reused, even after end_game
+        self.listeners = []
+
+    def start_game(self, game_id, players, small_blind_amount=1):
+        # Every game starts with a fresh trace buffer and trace id
+        TRACER.start(game_id)
+        with TRACER.bind(game_id):
+            result = self._start_game(game_id, players, small_blind_amount)
+        if game_id not in self.games:
+            TRACER.discard(game_id)
+        return result
+
+    def _start_game(self, game_id, players, small_blind_amount):
         if len(players) < 2:
             return {"error": "At least 2 players required."}
+        if not isinstance(small_blind_amount, int) or isinstance(small_blind_amount, bool) or small_blind_amount <= 0:
+            return {"error": "small_blind_amount must be a positive integer"}
 
-        # Create dealer with proper configuration
-        dealer = Dealer(
-            small_blind_amount=1,
-            initial_stack=max(p["stack"] for p in players),
-            ante=0
-        )
-
-        # Register players with the dealer
+        # Seat the players on a table that is kept for every hand of the session
+        table = Table()
+        initial_stack = max(p["stack"] for p in players)
         for p in players:
-            player = SetupPlayer(user_id=p["user_id"], stack=p["stack"])
-            dealer.register_player(p["user_id"], player)
+            table.seats.sitdown(TablePlayer(self._generate_uuid(), initial_stack, p["user_id"]))
 
-        # Get the table from dealer
-        table = dealer.table
-
-        # Set blind positions
+        # Deal the first hand
         try:
-            # No need to calculate blind positions since we're handling them manually
-            pass
+            current_state = self._deal_hand(table, round_count=1, small_blind_amount=small_blind_amount)
         except Exception as e:
-            return {"error": f"Failed to set up game: {str(e)}"}
+            return {"error": f"Failed to deal cards and collect blinds: {str(e)}"}
 
-        # Get dealer index for blind collection and position assignment
-        dealer_index = table.dealer_btn
+        # Store game state
+        self.games[game_id] = {
+            "table": table,
+            "players": table.seats.players,
+            "status": "in_progress",
+            "current_state": current_state,
+            "messages": [],
+            "version": None,
+            "views": {},
+            "snapshots": OrderedDict(),  # version → snapshot_game() record
+            "player_tokens": {p.name: secrets.token_urlsafe(16) for p in table.seats.players}
+        }
+        self._mark_changed(game_id, self.games[game_id])
+        GAMES_ACTIVE.set(len(self.games))
 
-        # Manually deal cards and set up game state
-        try:
-            # Shuffle the deck
-            table.deck.shuffle()
+        return self._hand_started_result(game_id, table, current_state)
 
-            # Deal hole cards to each player
-            for player in table.seats.players:
-                hole_cards = table.deck.draw_cards(2)
-                player.add_holecard(hole_cards)
+    def next_hand(self, game_id):
+        """Start the next hand of the session on the same table once the current hand is over"""
+        with TRACER.bind(game_id):
+            return self._next_hand(game_id)
 
-            # Collect blinds based on player count
-            self._collect_blinds(table, dealer_index)
+    def _next_hand(self, game_id):
+        game = self.games.get(game_id)
+        if not game:
+            return {"error": "Game not found"}
+        if game["status"] == "finished":
+            return {"error": "Game is over, fewer than 2 players have chips left"}
 
+        current_state = game["current_state"]
+        if current_state.get("street") != Const.Street.SHOWDOWN:
+            return {"error": "Current hand is not over yet"}
+
+        showdown_results = current_state.get("showdown_results")
+        if showdown_results is None:
+            return {"error": "Current hand has no result to pay out"}
+
+        table = game["table"]
+        self._pay_out(table, showdown_results)
+
+        if len([p for p in table.seats.players if p.stack > 0]) < 2:
+            # Keep the last hand on the table so its result can still be viewed
+            TRACER.info("game_over", stacks=[p.stack for p in table.seats.players])
+            game["status"] = "finished"
+            self._mark_changed(game_id, game)  # Stacks were paid out
+            return {"error": "Game is over, fewer than 2 players have chips left"}
+
+        # Reuse the table: restore the deck and clear cards, bets and action histories
+        table.reset()
+
+        # Players without chips sit out every following hand
+        for player in table.seats.players:
+            if player.stack == 0:
+                player.pay_info.update_to_fold()
+
+        # Move the button to the next player who still has chips
+        table.shift_dealer_btn()
+
+        try:
+            current_state = self._deal_hand(table, round_count=current_state["round_count"] + 1,
+                                            small_blind_amount=current_state["small_blind_amount"])
         except Exception as e:
             return {"error": f"Failed to deal cards and collect blinds: {str(e)}"}
 
+        game["current_state"] = current_state
+        self._mark_changed(game_id, game)
+
+        return self._hand_started_result(game_id, table, current_state)
+
+    def _deal_hand(self, table, round_count, small_blind_amount):
+        """Shuffle, deal hole cards and collect blinds for a new hand; returns the hand's current_state"""
+        table.deck.shuffle()
+
+        # Deal hole cards to each player still in the session
+        for player in table.seats.players:
+            if player.is_active():
+                player.add_holecard(table.deck.draw_cards(2))
+
+        # Blind positions are kept on the table for the rest of the hand
+        table.set_blind_pos(*self._blind_positions(table))
+        self._collect_blinds(table, small_blind_amount)
+
         # Assign positions based on player count
-        self._assign_positions(table, dealer_index)
+        self._assign_positions(table)
+        TRACER.info("hand_started", round_count=round_count, dealer_btn=table.dealer_btn,
+                    sb_pos=table.sb_pos(), bb_pos=table.bb_pos())
 
         # Create a simple game state
-        current_state = {
-            "round_count": 1,
-            "small_blind_amount": 1,
+        return {
+            "round_count": round_count,
+            "small_blind_amount": small_blind_amount,
             "street": Const.Street.PREFLOP,
-            "next_player": self._get_first_actor(dealer_index, len(table.seats.players)),  # Dynamic first actor
+            "next_player": self._get_first_actor(table),  # Dynamic first actor
             "players_acted": set(),  # Track which players have acted this street
             "table": table
         }
 
-        # Store game state
-        self.games[game_id] = {
-            "dealer": dealer,
-            "table": table,
-            "players": table.seats.players,
-            "status": "in_progress",
-            "current_state": current_state,
-            "messages": []
-        }
-
+    def _hand_started_result(self, game_id, table, current_state):
         # Get current round state
-        round_state = self._get_current_round_state(dealer, table, current_state)
+        round_state = self._get_current_round_state(table, current_state)
 
         return {
             "game_id": game_id,
@@ -94,25 +181,24 @@ class GameEngineService:
             "round_state": round_state
         }
 
-    def _get_current_round_state(self, dealer, table, state=None):
-        """Extract current round state from dealer and table"""
+    def _pay_out(self, table, showdown_results):
+        """Move the pot to the winners; prize_map is keyed by seat index"""
+        for index, prize in showdown_results["prize_map"].items():
+            table.seats.players[index].append_chip(prize)
+
+    def _generate_uuid(self):
+        """Same format as Dealer's player uuids, without pre-generating a list of them per game"""
+        return "".join(random.choice(self.UUID_CHARS) for _ in range(22))
+
+    def _get_current_round_state(self, table, state=None):
+        """Extract current round state from the table"""
         if state is None:
             state = {}
 
-        # Calculate blind positions dynamically
-        if len(table.seats.players) == 2:
-            # Heads-up: dealer is small blind
-            sb_pos = table.dealer_btn
-            bb_pos = (table.dealer_btn + 1) % 2
-        else:
-            # 3+ players: dealer has no blind
-            sb_pos = (table.dealer_btn + 1) % len(table.seats.players)
-            bb_pos = (table.dealer_btn + 2) % len(table.seats.players)
-
         return {
             "dealer_btn": table.dealer_btn,
-            "sb_pos": sb_pos,
-            "bb_pos": bb_pos,
+            "sb_pos": table.sb_pos(),
+            "bb_pos": table.bb_pos(),
             "community_cards": table.get_community_card(),
             "pot": self._calculate_pot(table),
             "street": state.get("street", 0),
@@ -138,11 +224,21 @@ class GameEngineService:
         return total_pot
 
     def apply_action(self, game_id, user_id, action, amount):
+        started = time.perf_counter()
+        with TRACER.bind(game_id):
+            result = self._apply_action(game_id, user_id, action, amount)
+
+        # Free-form action names from clients must not create unbounded label values
+        label = action if action in self.KNOWN_ACTIONS else "unknown"
+        APPLY_ACTION_SECONDS.observe(time.perf_counter() - started, action=label)
+        ACTIONS_TOTAL.inc(action=label, result="error" if "error" in result else "ok")
+        return result
+
+    def _apply_action(self, game_id, user_id, action, amount):
         game = self.games.get(game_id)
         if not game:
             return {"error": "Game not found"}
 
-        dealer = game["dealer"]
         table = game["table"]
         current_state = game["current_state"]
 
@@ -169,13 +265,15 @@ class GameEngineService:
 
                 # Check if only one player remains (all others folded)
                 active_players = [p for p in table.seats.players if p.is_active()]
-                print(f"DEBUG: After fold - active players: {[p.name for p in active_players]}")
+                if TRACER.enabled(DEBUG):
+                    TRACER.debug("fold", active_players=[p.name for p in active_players])
                 if len(active_players) == 1:
-                    print(f"DEBUG: Only one player remains after fold - {active_players[0].name} wins")
+                    TRACER.info("fold_win", winner=active_players[0].name)
                     # Set up showdown results for the single winner
                     winner = active_players[0]
                     current_state["street"] = Const.Street.SHOWDOWN
                     current_state["next_player"] = None
+                    self._return_uncalled_chips(table)
 
                     # Create showdown results for the single winner
                     from pypokerengine.engine.hand_evaluator import HandEvaluator
@@ -183,21 +281,23 @@ class GameEngineService:
                     community_cards = table.get_community_card()
 
                     # Get the best 5-card hand for the winner
-                    hand_info = HandEvaluator.gen_hand_rank_info(hole_cards, community_cards)
-                    hand_rank = hand_info["hand"]["strength"]
-                    best_cards = self._find_best_5_cards(hole_cards, community_cards, hand_rank)
+                    with SHOWDOWN_SECONDS.time(phase="fold_win"):
+                        hand_info = HandEvaluator.gen_hand_rank_info(hole_cards, community_cards)
+                        hand_rank = hand_info["hand"]["strength"]
+                        best_cards = self._find_best_5_cards(hole_cards, community_cards, hand_rank)
 
                     current_state["showdown_results"] = {
                         "winners": [winner],
                         "hand_info": [{"uuid": winner.uuid, "hand": hand_info}],
-                        "prize_map": {winner.uuid: sum(p.pay_info.amount for p in table.seats.players)}
+                        "prize_map": {table.seats.players.index(winner): sum(p.pay_info.amount for p in table.seats.players)}
                     }
 
                     # Update game state
                     game["current_state"] = current_state
+                    self._mark_changed(game_id, game)
 
                     # Return early with showdown results
-                    round_state = self._get_current_round_state(dealer, table, current_state)
+                    round_state = self._get_current_round_state(table, current_state)
                     return {
                         "success": True,
                         "round_state": round_state,
@@ -217,12 +317,11 @@ class GameEngineService:
             elif action == "check":
                 # Check is valid when player doesn't need to put in more chips
                 call_amount = self._calculate_call_amount(table, player)
-                print(f"DEBUG: Player {player.name} checking, call_amount needed: {call_amount}")
+                TRACER.debug("check", player=player.name, call_amount=call_amount)
                 if call_amount > 0:
                     return {"error": f"Cannot check - need to call {call_amount} chips"}
                 # Check is equivalent to calling with 0 amount
                 player.add_action_history(Const.Action.CALL, 0)
-                print(f"DEBUG: Check action recorded for {player.name}")
             elif action == "raise":
                 if amount <= 0:
                     return {"error": "Raise amount must be positive"}
@@ -241,10 +340,11 @@ class GameEngineService:
             # Check if both players are all-in (special case)
             both_all_in = all(p.stack == 0 for p in table.seats.players if p.is_active())
             if both_all_in:
-                print(f"DEBUG: Both players are all-in, completing street immediately")
-                # Mark both players as acted (in case the other player hasn't been marked yet)
-                current_state["players_acted"].add(0)
-                current_state["players_acted"].add(1)
+                if TRACER.enabled(DEBUG):
+                    TRACER.debug("all_in", players_acted=sorted(current_state["players_acted"]))
+                # Nobody left can act, so every player still in counts as having acted
+                current_state["players_acted"].update(
+                    i for i, p in enumerate(table.seats.players) if p.is_active())
                 street_complete = True
                 street_advanced = self._advance_street_automatically(current_state, table)
                 # The next_player is already set correctly in _advance_street_automatically
@@ -252,15 +352,14 @@ class GameEngineService:
                 # Move to next player
                 next_player_pos = self._get_next_active_player(table, current_state["next_player"])
                 current_state["next_player"] = next_player_pos
-                print(f"DEBUG: After action '{action}', next_player_pos: {next_player_pos}, player name: {table.seats.players[next_player_pos].name}")
-                print(f"DEBUG: Players acted this street: {current_state['players_acted']}")
-                print(f"DEBUG: Player stacks - U123: {table.seats.players[0].stack}, U456: {table.seats.players[1].stack}")
+                if TRACER.enabled(DEBUG):
+                    TRACER.debug("next_player", action=action, next_player=table.seats.players[next_player_pos].name,
+                                 players_acted=sorted(current_state["players_acted"]),
+                                 stacks=[p.stack for p in table.seats.players])
 
                 # Check if current street is complete (all players have matched bets)
                 street_complete = self._is_street_complete(table, current_state)
-                print(f"DEBUG: Street complete check: {street_complete}")
-                if street_complete:
-                    print(f"DEBUG: All players have matched bets, advancing street")
+                TRACER.debug("street_complete_check", street_complete=street_complete)
 
                 # If street is complete, automatically advance to next street
                 street_advanced = False
@@ -271,14 +370,15 @@ class GameEngineService:
 
             # Update game state
             game["current_state"] = current_state
-            print(f"DEBUG: Updated game state - next_player: {current_state['next_player']}")
+            self._mark_changed(game_id, game)
 
             # Update round state
-            round_state = self._get_current_round_state(dealer, table, current_state)
+            round_state = self._get_current_round_state(table, current_state)
 
             # Use the updated next_player from current_state, not the old next_player_pos
             final_next_player = current_state["next_player"]
-            print(f"DEBUG: Returning result - next_player: {final_next_player}, current_state next_player: {current_state['next_player']}")
+            TRACER.info("action", player=player.name, action=action, amount=amount,
+                        street=current_state["street"], next_player=final_next_player)
             return {
                 "success": True,
                 "round_state": round_state,
@@ -290,75 +390,156 @@ class GameEngineService:
             }
 
         except Exception as e:
+            # The action may have been partially applied, so cached views are stale
+            self._mark_changed(game_id, game)
             return {"error": f"Invalid action: {str(e)}"}
 
+    def add_listener(self, listener):
+        """Call listener(game_id) after every state change and when the game ends"""
+        self.listeners.append(listener)
+
+    def _notify_listeners(self, game_id):
+        for listener in self.listeners:
+            try:
+                listener(game_id)
+            except Exception as e:
+                TRACER.error("listener_failed", game_id=game_id, error=str(e))
+
+    def _mark_changed(self, game_id, game):
+        """Give the game a new version and drop views rendered for the previous one"""
+        game["version"] = next(self._versions)
+        game["views"] = {}
+
+        snapshots = game["snapshots"]
+        snapshots[game["version"]] = snapshot_game(game)
+        while len(snapshots) > self.SNAPSHOT_HISTORY:
+            snapshots.popitem(last=False)
+
+        self._notify_listeners(game_id)
+
+    def get_version(self, game_id):
+        """Current state version of the game, or None if the game does not exist"""
+        game = self.games.get(game_id)
+        return game["version"] if game else None
+
+    def get_player_tokens(self, game_id):
+        """user_id → secret a player presents to see their own hole cards, or None if the game does not exist"""
+        game = self.games.get(game_id)
+        return dict(game["player_tokens"]) if game else None
+
+    def check_player_token(self, game_id, user_id, token):
+        game = self.games.get(game_id)
+        expected = game["player_tokens"].get(user_id) if game else None
+        return expected is not None and isinstance(token, str) and hmac.compare_digest(expected, token)
+
+    def get_view(self, game_id, name, render):
+        """Return the cached view `name` for the current version, rendering it on first use"""
+        game = self.games.get(game_id)
+        if not game:
+            return None
+
+        # Keep a reference so a render racing with an action never lands in the new version's cache
+        views = game["views"]
+        if name in views:
+            VIEW_CACHE_TOTAL.inc(result="hit")
+            return views[name]
+
+        VIEW_CACHE_TOTAL.inc(result="miss")
+        with TRACER.bind(game_id):
+            view = render(game_id)
+        if view is None:
+            return None  # Nothing to cache, e.g. a delta from a version we no longer keep
+        views[name] = view
+        return view
+
     def _is_street_complete(self, table, current_state):
         """Check if all active players have acted AND put in equal amounts for current street"""
         active_players = [p for p in table.seats.players if p.is_active()]
 
-        print(f"DEBUG: _is_street_complete - active_players: {[p.name for p in active_players]}")
-        print(f"DEBUG: _is_street_complete - player stacks: {[p.stack for p in active_players]}")
+        if TRACER.enabled(DEBUG):
+            TRACER.debug("street_complete_check_players", active_players=[p.name for p in active_players],
+                         stacks=[p.stack for p in active_players])
 
         if len(active_players) <= 1:
-            print(f"DEBUG: Street complete - only one player left")
+            TRACER.debug("street_complete", reason="one_player_left")
             return True  # Only one player left, street is complete
 
-        # For heads-up, we need both players to have acted
+        # For heads-up, we need both players to have acted; a player who is all-in has nothing left to act on
         if len(active_players) == 2:
-            active_player_indices = {i for i, p in enumerate(table.seats.players) if p.is_active()}
+            active_player_indices = {i for i, p in enumerate(table.seats.players) if p.is_active() and p.stack > 0}
             players_acted = current_state.get("players_acted", set())
 
             # Check if both players have acted
             if not active_player_indices.issubset(players_acted):
-                print(f"DEBUG: Not all players have acted. Active: {active_player_indices}, Acted: {players_acted}")
+                if TRACER.enabled(DEBUG):
+                    TRACER.debug("street_incomplete", reason="not_all_acted", active=sorted(active_player_indices),
+                                 acted=sorted(players_acted))
                 return False  # Not all players have acted
 
             # Get the highest bet amount for this street
             max_bet = max(p.pay_info.amount for p in active_players)
-            print(f"DEBUG: _is_street_complete - max_bet: {max_bet}")
+            TRACER.debug("max_bet", max_bet=max_bet)
 
-            # Check if all active players have matched
+            # Check if all active players have matched, or are all-in for less
             for player in active_players:
-                if player.pay_info.amount < max_bet:
-                    print(f"DEBUG: Player {player.name} has {player.pay_info.amount} chips, needs {max_bet}")
+                if player.pay_info.amount < max_bet and player.stack > 0:
+                    TRACER.debug("street_incomplete", reason="bet_not_matched", player=player.name, paid=player.pay_info.amount, max_bet=max_bet)
                     return False  # Someone is behind
 
             # Special case: if all players are all-in (stack = 0), street is complete
             all_all_in = all(p.stack == 0 for p in active_players)
             if all_all_in:
-                print(f"DEBUG: Street complete - all players are all-in")
+                TRACER.debug("street_complete", reason="all_in")
                 return True
 
-            print(f"DEBUG: Street complete - all players acted and matched")
+            TRACER.debug("street_complete", reason="all_matched")
             return True  # All players have acted AND matched
 
         # For more than 2 players, use the original logic
-        active_player_indices = {i for i, p in enumerate(table.seats.players) if p.is_active()}
+        active_player_indices = {i for i, p in enumerate(table.seats.players) if p.is_active() and p.stack > 0}
         if not active_player_indices.issubset(current_state.get("players_acted", set())):
-            print(f"DEBUG: Not all players have acted. Active: {active_player_indices}, Acted: {current_state.get('players_acted', set())}")
+            if TRACER.enabled(DEBUG):
+                TRACER.debug("street_incomplete", reason="not_all_acted", active=sorted(active_player_indices),
+                             acted=sorted(current_state.get("players_acted", set())))
             return False  # Not all players have acted
 
         # Get the highest bet amount for this street
         max_bet = max(p.pay_info.amount for p in active_players)
-        print(f"DEBUG: _is_street_complete - max_bet: {max_bet}")
+        TRACER.debug("max_bet", max_bet=max_bet)
 
-        # Check if all active players have matched
+        # Check if all active players have matched, or are all-in for less
         for player in active_players:
-            if player.pay_info.amount < max_bet:
-                print(f"DEBUG: Player {player.name} has {player.pay_info.amount} chips, needs {max_bet}")
+            if player.pay_info.amount < max_bet and player.stack > 0:
+                TRACER.debug("street_incomplete", reason="bet_not_matched", player=player.name, paid=player.pay_info.amount, max_bet=max_bet)
                 return False  # Someone is behind
 
         # Special case: if all players are all-in (stack = 0), street is complete
         all_all_in = all(p.stack == 0 for p in active_players)
         if all_all_in:
-            print(f"DEBUG: Street complete - all players are all-in")
+            TRACER.debug("street_complete", reason="all_in")
             return True
 
-        print(f"DEBUG: Street complete - all players acted and matched")
+        TRACER.debug("street_complete", reason="all_matched")
         return True  # All players have acted AND matched
 
     def _advance_street_automatically(self, current_state, table):
-        """Automatically advance to the next street when betting is complete"""
+        """Automatically advance to the next street when betting is complete
+
+        Once fewer than two players can still bet the rest of the board is dealt straight away,
+        since nobody is left to act on it.
+        """
+        advanced = self._advance_street_timed(current_state, table)
+        while advanced and current_state["street"] != Const.Street.SHOWDOWN \
+                and bin(table.seats.active_mask & table.seats.funded_mask).count("1") < 2:
+            advanced = self._advance_street_timed(current_state, table)
+        return advanced
+
+    def _advance_street_timed(self, current_state, table):
+        street = self.STREET_NAMES.get(current_state["street"], "other")
+        with STREET_ADVANCE_SECONDS.time(street=street):
+            return self._advance_street(current_state, table)
+
+    def _advance_street(self, current_state, table):
         current_street = current_state["street"]
 
         try:
@@ -368,41 +549,40 @@ class GameEngineService:
                     card = table.deck.draw_card()
                     table.add_community_card(card)
                 current_state["street"] = Const.Street.FLOP
-                # Postflop: Dealer acts first (both heads-up and multi-player)
-                current_state["next_player"] = table.dealer_btn
+                current_state["next_player"] = self._get_first_postflop_actor(table)
                 current_state["players_acted"] = set()  # Reset for new street
-                print(f"DEBUG: Advanced to FLOP, dealer_btn: {table.dealer_btn}, next_player: {current_state['next_player']}, player name: {table.seats.players[current_state['next_player']].name}")
+                TRACER.info("street_advanced", street="flop", next_player=self._player_name(table, current_state["next_player"]))
 
             elif current_street == Const.Street.FLOP:
                 # Deal turn (1 community card)
                 card = table.deck.draw_card()
                 table.add_community_card(card)
                 current_state["street"] = Const.Street.TURN
-                # Postflop: Dealer acts first (both heads-up and multi-player)
-                current_state["next_player"] = table.dealer_btn
+                current_state["next_player"] = self._get_first_postflop_actor(table)
                 current_state["players_acted"] = set()  # Reset for new street
-                print(f"DEBUG: Advanced to TURN, dealer_btn: {table.dealer_btn}, next_player: {current_state['next_player']}, player name: {table.seats.players[current_state['next_player']].name}")
+                TRACER.info("street_advanced", street="turn", next_player=self._player_name(table, current_state["next_player"]))
 
             elif current_street == Const.Street.TURN:
                 # Deal river (1 community card)
                 card = table.deck.draw_card()
                 table.add_community_card(card)
                 current_state["street"] = Const.Street.RIVER
-                # Postflop: Dealer acts first (both heads-up and multi-player)
-                current_state["next_player"] = table.dealer_btn
+                current_state["next_player"] = self._get_first_postflop_actor(table)
                 current_state["players_acted"] = set()  # Reset for new street
-                print(f"DEBUG: Advanced to RIVER, dealer_btn: {table.dealer_btn}, next_player: {current_state['next_player']}, player name: {table.seats.players[current_state['next_player']].name}")
+                TRACER.info("street_advanced", street="river", next_player=self._player_name(table, current_state["next_player"]))
 
             elif current_street == Const.Street.RIVER:
-                # Move to showdown - evaluate hands and determine winner
+                # Evaluate hands and determine winner; the hand only moves to showdown once it is judged
+                from pypokerengine.engine.game_evaluator import GameEvaluator
+                self._return_uncalled_chips(table)
+                self._mark_all_in_players(table)
+                with SHOWDOWN_SECONDS.time(phase="judge"):
+                    winners, hand_info, prize_map = GameEvaluator.judge(table)
+
                 current_state["street"] = Const.Street.SHOWDOWN
                 current_state["next_player"] = None  # No next player during showdown
                 current_state["players_acted"] = set()  # Reset for new street
 
-                # Evaluate hands and determine winner
-                from pypokerengine.engine.game_evaluator import GameEvaluator
-                winners, hand_info, prize_map = GameEvaluator.judge(table)
-
                 # Store showdown results
                 current_state["showdown_results"] = {
                     "winners": winners,
@@ -410,7 +590,7 @@ class GameEngineService:
                     "prize_map": prize_map
                 }
 
-                print(f"DEBUG: Advanced to SHOWDOWN, winners: {[w.name for w in winners]}")
+                TRACER.info("showdown", winners=[w.name for w in winners], prize_map=prize_map)
 
             else:
                 return False  # Already at final street
@@ -418,92 +598,88 @@ class GameEngineService:
             return True  # Street was advanced
 
         except Exception as e:
-            print(f"Error advancing street: {e}")
+            TRACER.error("advance_street_failed", street=current_street, error=str(e))
             return False
 
-    def _collect_blinds(self, table, dealer_index):
-        """Collect blinds based on player count and dealer position."""
-        if len(table.seats.players) == 2:
+    def _blind_positions(self, table):
+        """Small and big blind seats for the players still in the session"""
+        if table.seats.count_active_players() == 2:
             # Heads-up: Dealer is small blind, other player is big blind
-            small_blind_player = table.seats.players[dealer_index]
-            big_blind_player = table.seats.players[(dealer_index + 1) % 2]
-
-            # Small blind
-            sb_amount = 1
-            small_blind_player.collect_bet(sb_amount)
-            small_blind_player.add_action_history(Const.Action.SMALL_BLIND, sb_amount=sb_amount)
-            small_blind_player.pay_info.update_by_pay(sb_amount)
-            print(f"DEBUG: Small blind collected {sb_amount}, pay_info.amount now: {small_blind_player.pay_info.amount}")
-
-            # Big blind
-            bb_amount = sb_amount * 2
-            big_blind_player.collect_bet(bb_amount)
-            big_blind_player.add_action_history(Const.Action.BIG_BLIND, sb_amount=sb_amount)
-            big_blind_player.pay_info.update_by_pay(bb_amount)
-            print(f"DEBUG: Big blind collected {bb_amount}, pay_info.amount now: {big_blind_player.pay_info.amount}")
+            sb_pos = table.dealer_btn
         else:
-            # 3+ players: Dealer has no blind, separate small blind and big blind
-            small_blind_player = table.seats.players[(dealer_index + 1) % len(table.seats.players)]
-            big_blind_player = table.seats.players[(dealer_index + 2) % len(table.seats.players)]
-
-            # Small blind
-            sb_amount = 1
-            small_blind_player.collect_bet(sb_amount)
-            small_blind_player.add_action_history(Const.Action.SMALL_BLIND, sb_amount=sb_amount)
-            small_blind_player.pay_info.update_by_pay(sb_amount)
-            print(f"DEBUG: Small blind collected {sb_amount}, pay_info.amount now: {small_blind_player.pay_info.amount}")
-
-            # Big blind
-            bb_amount = sb_amount * 2
-            big_blind_player.collect_bet(bb_amount)
-            big_blind_player.add_action_history(Const.Action.BIG_BLIND, sb_amount=sb_amount)
-            big_blind_player.pay_info.update_by_pay(bb_amount)
-            print(f"DEBUG: Big blind collected {bb_amount}, pay_info.amount now: {big_blind_player.pay_info.amount}")
-
-    def _assign_positions(self, table, dealer_index):
-        """Assign positions to players based on player count and dealer position."""
-        if len(table.seats.players) == 2:
-            # Heads-up: Dealer is small blind, other player is big blind
-            for player in table.seats.players:
-                player.position = "none"
+            # 3+ players: Dealer has no blind
+            sb_pos = table.next_active_player_pos(table.dealer_btn)
+        bb_pos = table.next_active_player_pos(sb_pos)
+        return sb_pos, bb_pos
+
+    def _collect_blinds(self, table, sb_amount):
+        """Collect blinds from the blind positions set on the table."""
+        small_blind_player = table.seats.players[table.sb_pos()]
+        big_blind_player = table.seats.players[table.bb_pos()]
+
+        # Small blind; a short stack posts what it has left
+        paid = min(sb_amount, small_blind_player.stack)
+        small_blind_player.collect_bet(paid)
+        small_blind_player.add_action_history(Const.Action.SMALL_BLIND, sb_amount=sb_amount)
+        small_blind_player.pay_info.update_by_pay(paid)
+        TRACER.debug("small_blind", player=small_blind_player.name, paid=paid)
+
+        # Big blind
+        bb_amount = min(sb_amount * 2, big_blind_player.stack)
+        big_blind_player.collect_bet(bb_amount)
+        big_blind_player.add_action_history(Const.Action.BIG_BLIND, sb_amount=sb_amount)
+        big_blind_player.pay_info.update_by_pay(bb_amount)
+        TRACER.debug("big_blind", player=big_blind_player.name, paid=bb_amount)
+
+    def _return_uncalled_chips(self, table):
+        """Give back what players put in beyond the most any player still in the hand put in
+
+        Nobody left in the hand can win those chips, and GameEvaluator finds no eligible
+        player for a pot made of them.
+        """
+        players = table.seats.players
+        cap = max(p.pay_info.amount for p in players if p.is_active())
+        for player in players:
+            uncalled = player.pay_info.amount - cap
+            if uncalled > 0:
+                player.pay_info.amount = cap
+                player.append_chip(uncalled)
+                TRACER.info("uncalled_returned", player=player.name, amount=uncalled)
+
+    def _mark_all_in_players(self, table):
+        """Players still in without chips only win the side pot they covered"""
+        for player in table.seats.players:
+            if player.is_active() and player.stack == 0:
+                player.pay_info.update_to_allin()
 
-            table.seats.players[dealer_index].position = "small_blind"
-            table.seats.players[(dealer_index + 1) % 2].position = "big_blind"
+    def _assign_positions(self, table):
+        """Assign positions to the players in the hand based on player count and dealer position."""
+        players = table.seats.players
+        for player in players:
+            player.position = "none"
 
-            print(f"DEBUG: Final positions and amounts (Heads-up):")
-            for i, p in enumerate(table.seats.players):
-                print(f"  Player {i}: position={p.position}, pay_info.amount={p.pay_info.amount}, stack={p.stack}")
+        if table.seats.count_active_players() == 2:
+            # Heads-up: Dealer is small blind, other player is big blind
+            players[table.sb_pos()].position = "small_blind"
+            players[table.bb_pos()].position = "big_blind"
         else:
             # 3+ players: Dealer, small blind, big blind, and other positions
-            for player in table.seats.players:
-                player.position = "none"
-
-            # Assign dealer position
-            table.seats.players[dealer_index].position = "dealer"
-
-            # Assign small blind position
-            sb_pos = (dealer_index + 1) % len(table.seats.players)
-            table.seats.players[sb_pos].position = "small_blind"
-
-            # Assign big blind position
-            bb_pos = (dealer_index + 2) % len(table.seats.players)
-            table.seats.players[bb_pos].position = "big_blind"
-
-            # Assign other positions (UTG, MP, CO, etc.)
-            for i in range(len(table.seats.players)):
-                if i not in [dealer_index, sb_pos, bb_pos]:
-                    if i == (dealer_index + 3) % len(table.seats.players):
-                        table.seats.players[i].position = "UTG"  # Under the gun
-                    elif i == (dealer_index + 4) % len(table.seats.players):
-                        table.seats.players[i].position = "MP"   # Middle position
-                    elif i == (dealer_index + 5) % len(table.seats.players):
-                        table.seats.players[i].position = "CO"   # Cutoff
-                    else:
-                        table.seats.players[i].position = "MP"   # Default to middle position
-
-            print(f"DEBUG: Final positions and amounts (Multi-player):")
-            for i, p in enumerate(table.seats.players):
-                print(f"  Player {i}: position={p.position}, pay_info.amount={p.pay_info.amount}, stack={p.stack}")
+            players[table.dealer_btn].position = "dealer"
+            players[table.sb_pos()].position = "small_blind"
+            players[table.bb_pos()].position = "big_blind"
+
+            # Assign other positions (UTG, MP, CO, etc.) by distance from the dealer
+            later_positions = {3: "UTG", 4: "MP", 5: "CO"}
+            pos, distance = table.bb_pos(), 3
+            while True:
+                pos = table.next_active_player_pos(pos)
+                if pos in (table.dealer_btn, table._player_not_found):
+                    break
+                players[pos].position = later_positions.get(distance, "MP")  # Default to middle position
+                distance += 1
+
+        if TRACER.enabled(DEBUG):
+            TRACER.debug("positions", players=[(p.name, p.position, p.pay_info.amount, p.stack) for p in players])
 
     def _calculate_call_amount(self, table, player):
         """Calculate how much the player needs to call"""
@@ -521,33 +697,32 @@ class GameEngineService:
         return max(0, call_amount)  # Can't call negative amounts
 
     def _get_next_active_player(self, table, current_pos):
-        """Get the next active player position"""
-        players = table.seats.players
-
-        # For heads-up, simply alternate between players
-        if len(players) == 2:
-            return (current_pos + 1) % 2
-
-        # For more than 2 players, find next active player
-        next_pos = (current_pos + 1) % len(players)
-
-        # Find next active player
-        for _ in range(len(players)):
-            if players[next_pos].is_active() and players[next_pos].stack > 0:
-                return next_pos
-            next_pos = (next_pos + 1) % len(players)
-
-        return current_pos  # If no one else is active
-
-    def _get_first_actor(self, dealer_btn, player_count):
-        """Get the first player to act based on player count and street"""
-        if player_count == 2:
+        """Next seat after current_pos that has not folded and still has chips to bet"""
+        next_pos = table.next_active_player_pos(current_pos)
+        return current_pos if next_pos == table._player_not_found else next_pos  # If no one else is active
+
+    def _get_first_postflop_actor(self, table):
+        """First player to act after the preflop, skipping seats that folded or have no chips left
+
+        Heads-up the big blind acts first; with three or more players the button does.
+        """
+        heads_up = table.sb_pos() == table.dealer_btn  # _blind_positions puts the heads-up small blind on the button
+        start_pos = table.dealer_btn if heads_up else table.dealer_btn - 1
+        next_pos = table.next_active_player_pos(start_pos)
+        return None if next_pos == table._player_not_found else next_pos
+
+    def _player_name(self, table, pos):
+        return table.seats.players[pos].name if pos is not None else None
+
+    def _get_first_actor(self, table):
+        """Get the first player to act preflop based on player count"""
+        if table.seats.count_active_players() == 2:
             # Heads-up: Small blind (dealer) acts first preflop
-            return dealer_btn
+            return table.sb_pos()
         else:
             # 3+ players: UTG (under the gun) acts first preflop
             # UTG is the player to the left of the big blind
-            return (dealer_btn + 3) % player_count
+            return table.next_active_player_pos(table.bb_pos())
 
     def _fix_poker_hand_names(self, hand_rank):
         """Fix incorrect poker hand names from PyPokerEngine library"""
@@ -563,11 +738,10 @@ class GameEngineService:
         if not game:
             return {"error": "Game not found"}
 
-        dealer = game["dealer"]
         table = game["table"]
         current_state = game.get("current_state", {})
 
-        round_state = self._get_current_round_state(dealer, table, current_state)
+        round_state = self._get_current_round_state(table, current_state)
         return round_state
 
     def get_winning_hand(self, game_id):
@@ -612,17 +786,14 @@ class GameEngineService:
 
                                         # Find the best 5-card hand combination
         hand_info = HandEvaluator.gen_hand_rank_info(hole_cards, community_cards)
-        print(f"DEBUG: Hand info: {hand_info}")
 
         # Extract the hand rank
         hand_rank = hand_info["hand"]["strength"]
-        print(f"DEBUG: Hand rank: {hand_rank}")
 
-                # Find the exact 5 cards that make up the winning hand
-        best_cards = self._find_best_5_cards(hole_cards, community_cards, hand_rank)
-        print(f"DEBUG: Best cards: {[str(card) for card in best_cards]}")
-        print(f"DEBUG: Hand rank: {hand_rank}")
-        print(f"DEBUG: Winner: {winner.name}")
+        # Find the exact 5 cards that make up the winning hand
+        with SHOWDOWN_SECONDS.time(phase="winning_hand"):
+            best_cards = self._find_best_5_cards(hole_cards, community_cards, hand_rank)
+        TRACER.debug("winning_hand", winner=winner.name, rank=hand_rank, hand_info=hand_info, best_cards=best_cards)
 
         # Fix incorrect poker hand names from the library
         corrected_hand_rank = self._fix_poker_hand_names(hand_rank)
@@ -671,7 +842,10 @@ class GameEngineService:
         from itertools import combinations
         from pypokerengine.engine.hand_evaluator import HandEvaluator
 
-        print(f"DEBUG: Evaluating {len(all_cards)} cards: {[str(card) for card in all_cards]}")
+        # Checked once, the loop below runs for every 5-card combination
+        debug = TRACER.enabled(DEBUG)
+        if debug:
+            TRACER.debug("evaluate_best_5_cards", cards=all_cards)
 
         best_hand = None
         best_score = -1
@@ -682,7 +856,8 @@ class GameEngineService:
             hand_info = HandEvaluator.gen_hand_rank_info(list(five_cards), [])
             score = hand_info["hand"]["strength"]
 
-            print(f"DEBUG: 5-card hand {[str(card) for card in five_cards]} -> {score}")
+            if debug:
+                TRACER.debug("five_card_hand", cards=five_cards, score=score)
 
             # Convert hand strength to numeric score for comparison
             strength_order = {
@@ -697,9 +872,11 @@ class GameEngineService:
             if numeric_score > best_score:
                 best_score = numeric_score
                 best_hand = list(five_cards)
-                print(f"DEBUG: New best hand: {[str(card) for card in best_hand]} with score {numeric_score}")
+                if debug:
+                    TRACER.debug("new_best_hand", cards=best_hand, score=numeric_score)
 
-        print(f"DEBUG: Final best hand: {[str(card) for card in best_hand] if best_hand else 'None'}")
+        if debug:
+            TRACER.debug("best_hand", cards=best_hand)
         return best_hand
 
     def _find_straight_flush_cards(self, cards):
@@ -930,5 +1107,8 @@ class GameEngineService:
     def end_game(self, game_id):
         if game_id in self.games:
             del self.games[game_id]
+            TRACER.discard(game_id)
+            GAMES_ACTIVE.set(len(self.games))
+            self._notify_listeners(game_id)
             return {"message": f"Game {game_id} ended."}
         return {"error": "Game not found"}
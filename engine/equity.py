@@ -0,0 +1,143 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError
+
+from pypokerengine.engine.card import Card
+from pypokerengine.utils.card_utils import gen_cards, estimate_hole_card_win_rate
+from .metrics import REGISTRY
+
+DEFAULT_SIMULATIONS = 1000
+MAX_SIMULATIONS = 20000
+MAX_PLAYERS = 10
+EQUITY_CACHE_SIZE = 4096  # Recent results kept, least recently used dropped first
+EQUITY_TIMEOUT_SECONDS = 30
+
+EQUITY_QUERIES_TOTAL = REGISTRY.counter(
+    "poker_equity_queries_total", "Equity queries by how they were answered", ["result"])
+EQUITY_REQUEST_SECONDS = REGISTRY.histogram(
+    "poker_equity_request_seconds", "Time spent answering one /equity request")
+
+
+def _parse_cards(cards, field):
+    if not isinstance(cards, list):
+        raise ValueError(f"{field} must be a list of cards")
+    try:
+        return tuple(str(Card.from_str(card)) for card in cards)
+    except (AssertionError, KeyError, TypeError, IndexError):
+        raise ValueError(f"Invalid card in {field}: {cards}")
+
+
+def normalize_query(query):
+    """Validate a query and return its cache key (hole, board, players, simulations).
+
+    Card order does not change the equity, so cards are sorted and equal queries share a key.
+    """
+    if not isinstance(query, dict):
+        raise ValueError("Query must be an object")
+    hole = _parse_cards(query.get("hole"), "hole")
+    board = _parse_cards(query.get("board", []), "board")
+    players = query.get("players", 2)
+    simulations = query.get("simulations", DEFAULT_SIMULATIONS)
+
+    if len(hole) != 2:
+        raise ValueError("hole must have 2 cards")
+    if len(board) not in (0, 3, 4, 5):
+        raise ValueError("board must have 0, 3, 4 or 5 cards")
+    if len(set(hole + board)) != len(hole) + len(board):
+        raise ValueError("Cards must not repeat")
+    if not isinstance(players, int) or not 2 <= players <= MAX_PLAYERS:
+        raise ValueError(f"players must be between 2 and {MAX_PLAYERS}")
+    if not isinstance(simulations, int) or not 1 <= simulations <= MAX_SIMULATIONS:
+        raise ValueError(f"simulations must be between 1 and {MAX_SIMULATIONS}")
+    return tuple(sorted(hole)), tuple(sorted(board)), players, simulations
+
+
+def compute_equity(key):
+    """Monte Carlo win rate for a normalized query; runs in the worker processes"""
+    hole, board, players, simulations = key
+    return estimate_hole_card_win_rate(simulations, players, gen_cards(list(hole)), gen_cards(list(board)))
+
+
+class EquityService:
+    """Answers equity queries off the request threads.
+
+    Identical queries that are already being computed share one future, results are kept in an
+    LRU cache, and the computation runs in a process pool so it cannot starve game requests of CPU.
+    """
+
+    def __init__(self, executor=None, workers=None, cache_size=EQUITY_CACHE_SIZE):
+        self._executor = executor
+        self._workers = workers
+        self.cache_size = cache_size
+        self._cache = OrderedDict()  # key → win rate
+        self._inflight = {}  # key → Future
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        # Created on first use so importing the app does not fork workers
+        if self._executor is None:
+            workers = self._workers or int(os.environ.get("POKER_EQUITY_WORKERS", 0)) or None
+            self._executor = ProcessPoolExecutor(max_workers=workers)
+        return self._executor
+
+    def submit(self, key):
+        """Return (future, how) for a normalized query; how is "cache_hit", "coalesced" or "computed" """
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                future = Future()
+                future.set_result(self._cache[key])
+                return future, "cache_hit"
+            if key in self._inflight:
+                return self._inflight[key], "coalesced"
+            future = self._get_executor().submit(compute_equity, key)
+            self._inflight[key] = future
+        future.add_done_callback(lambda done: self._finish(key, done))
+        return future, "computed"
+
+    def _finish(self, key, future):
+        with self._lock:
+            self._inflight.pop(key, None)
+            if future.cancelled() or future.exception() is not None:
+                return  # Not cached, so the next query retries
+            self._cache[key] = future.result()
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def evaluate(self, queries, timeout=EQUITY_TIMEOUT_SECONDS):
+        """Answer a batch of queries in order; invalid or failed queries get an error entry"""
+        with EQUITY_REQUEST_SECONDS.time():
+            pending = []
+            for query in queries:
+                try:
+                    key = normalize_query(query)
+                except ValueError as e:
+                    EQUITY_QUERIES_TOTAL.inc(result="invalid")
+                    pending.append((None, None, str(e)))
+                    continue
+                future, how = self.submit(key)
+                EQUITY_QUERIES_TOTAL.inc(result=how)
+                pending.append((key, future, None))
+
+            # All queries are submitted before waiting, so the pool works on them in parallel
+            deadline = time.monotonic() + timeout
+            return [self._result(key, future, error, deadline) for key, future, error in pending]
+
+    def _result(self, key, future, error, deadline):
+        if error is not None:
+            return {"error": error}
+        hole, board, players, simulations = key
+        result = {"hole": list(hole), "board": list(board), "players": players, "simulations": simulations}
+        try:
+            result["win_rate"] = future.result(timeout=max(0, deadline - time.monotonic()))
+        except TimeoutError:
+            result["error"] = "Equity computation timed out"
+        except Exception as e:
+            result["error"] = f"Equity computation failed: {str(e)}"
+        return result
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
@@ -1,4 +1,4 @@
-from pypokerengine.api.game import setup_config
+from pypokerengine.api.game import setup_config, Game
 from .models import SetupPlayer
 import random
 
@@ -19,9 +19,9 @@ class GameManager:
             config.register_player(name=p["user_id"], algorithm=player)
             player_objs.append(player)
 
-        # ✅ Correct way to start the engine and get a live game object
-        engine = config._create_game()
-        engine.start_new_round()
+        # Steppable game: it stops at every decision and waits for apply_action
+        engine = Game(config)
+        self._deliver_events(engine, player_objs)
 
         # Assign roles based on shuffled player order
         dealer_index = 0
@@ -62,24 +62,43 @@ class GameManager:
     def get_game(self, game_id):
         return self.games.get(game_id)
 
+    def _deliver_events(self, engine, player_objs):
+        # Lets the players pick up their hole cards from the round start messages
+        for address, msg in engine.events():
+            for p in player_objs:
+                if address == -1 or address == p.uuid:
+                    p.receive_notification(msg["message"])
+
     def apply_action(self, game_id, user_id, action, amount):
         game = self.get_game(game_id)
         if not game:
             return {"error": "Game not found"}
 
         engine = game["engine"]
+        decision = engine.pending_decision()
+        if decision is None:
+            return {"error": "Game is finished"}
+        player = next((p for p in game["players"] if p.user_id == user_id), None)
+        if player is None or player.uuid != decision["uuid"]:
+            return {"error": "Not your turn"}
 
         try:
-            engine.apply_action(user_id, action, amount)
+            decision = engine.submit(action, amount)
         except Exception as e:
             return {"error": f"Invalid action: {str(e)}"}
+        self._deliver_events(engine, game["players"])
+
+        if decision is None:
+            game["status"] = "finished"
+            return {"status": "finished", "result": engine.result}
 
         # Gather updated state
-        state = engine._round_state
+        state = decision["round_state"]
         next_player = state["next_player"]
-        valid_actions = state["valid_actions"]
+        valid_actions = decision["valid_actions"]
         board = state.get("community_card", [])
         pot = state["pot"]["main"]["amount"]
+        game["current_round"] = state["street"]
 
         return {
             "next_player": next_player,
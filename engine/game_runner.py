@@ -0,0 +1,186 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from pypokerengine.api.game import Game
+from pypokerengine.engine.message_builder import MessageBuilder
+from pypokerengine.players import BasePokerPlayer
+from .tracing import TRACER
+
+
+class DeferredPlayer(BasePokerPlayer):
+    """Player whose decisions arrive later, e.g. a human clicking a Slack button.
+
+    Instead of blocking in declare_action, the game calls request_action and parks until the
+    decision is passed to GameScheduler.submit_action.
+    """
+
+    def request_action(self, valid_actions, hole_card, round_state):
+        """Ask the player for a decision; must return without waiting for it"""
+        raise NotImplementedError("DeferredPlayer must implement request_action")
+
+    def declare_action(self, valid_actions, hole_card, round_state):
+        raise RuntimeError("Deferred players answer through GameScheduler.submit_action")
+
+
+class ResumableGame:
+    """A start_poker game driven through the steppable Game.
+
+    run() advances the game until a DeferredPlayer has to decide or the game is over and then
+    returns, so a game waiting for a human holds no thread. Local bots are asked synchronously,
+    exactly like Dealer does.
+    """
+
+    READY = "ready"
+    WAITING = "waiting"
+    FINISHED = "finished"
+
+    def __init__(self, game_id, config, on_finish=None, outbox=None):
+        self.game_id = game_id
+        self.game = Game(config)
+        self.on_finish = on_finish  # Called with (game, result) once the game is over
+        self.outbox = outbox  # SlackOutbox the players post to; flushed whenever run() stops
+        self.status = self.READY
+        self.result = None
+        self._pending = None  # (uuid, valid_actions) of the deferred player being waited on
+        self._decision = None  # (action, amount) submitted for the pending player
+        self._lock = threading.Lock()
+
+    def blocking_players(self):
+        """Names of the players that are asked synchronously instead of through request_action"""
+        handler = self.game.dealer.message_handler
+        return [player.name for player in self.game.table.seats.players
+                if not isinstance(handler.algo_owner_map[player.uuid], DeferredPlayer)]
+
+    @property
+    def pending_player(self):
+        """uuid of the deferred player the game is waiting on, or None"""
+        return self._pending[0] if self._pending else None
+
+    def submit_action(self, uuid, action, amount):
+        """Record the pending player's decision; returns an error message or None"""
+        with self._lock:
+            if self.status != self.WAITING or self._pending is None:
+                return "Game is not waiting for a decision"
+            pending_uuid, valid_actions = self._pending
+            if uuid != pending_uuid:
+                return "Not your turn"
+            if action not in [a["action"] for a in valid_actions]:
+                return f"Invalid action: {action}"
+            self._decision = (action, amount)
+            self.status = self.READY
+            return None
+
+    def run(self):
+        """Advance the game until it needs a deferred decision or is over; returns the status"""
+        with self._lock:
+            if self.status != self.READY:
+                return self.status
+            with TRACER.bind(self.game_id):
+                try:
+                    self._advance()
+                finally:
+                    # Everything since the last decision point goes out as one message per player
+                    if self.outbox is not None:
+                        self.outbox.flush()
+            return self.status
+
+    def _advance(self):
+        handler = self.game.dealer.message_handler
+        while True:
+            # Notifications are delivered once, even if the game parks on the decision below
+            for address, message in self.game.events():
+                message_type = message["message"]["message_type"]
+                if message_type == MessageBuilder.GAME_RESULT_MESSAGE:
+                    continue  # Dealer does not send it to players either
+                if message_type == MessageBuilder.ROUND_RESULT_MESSAGE:
+                    TRACER.info("round_finished", round_count=message["message"]["round_count"])
+                handler.process_message(address, message)
+
+            decision = self.game.pending_decision()
+            if decision is None:
+                self._finish()
+                return
+            algorithm = handler.algo_owner_map[decision["uuid"]]
+
+            if isinstance(algorithm, DeferredPlayer):
+                if self._decision is None:
+                    if self._pending is None:
+                        self._pending = (decision["uuid"], decision["valid_actions"])
+                        algorithm.request_action(decision["valid_actions"], decision["hole_card"], decision["round_state"])
+                    self.status = self.WAITING
+                    return
+                action, amount = self._decision
+                self._pending, self._decision = None, None
+            else:
+                action, amount = algorithm.respond_to_ask(decision)
+
+            TRACER.debug("declare_action", player=decision["uuid"], action=action, amount=amount)
+            self.game.submit(action, amount)
+
+    def _finish(self):
+        self.status = self.FINISHED
+        self.result = self.game.result
+        TRACER.info("game_finished", rounds=self.game.round_count)
+
+
+class GameScheduler:
+    """Runs ResumableGames on a bounded thread pool.
+
+    A game is only handed to the pool when it can make progress: when it starts and when a
+    deferred player's decision arrives. Waiting games cost memory, not threads.
+
+    That only holds if every player who waits on a person is a DeferredPlayer; any other player
+    answers on a pool thread. With deferred_only=True, start() refuses games that have such a
+    player, so a human adapter that is not a DeferredPlayer fails at once instead of holding a
+    worker for every decision.
+    """
+
+    def __init__(self, max_workers=8, deferred_only=False):
+        self.deferred_only = deferred_only
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="poker-game")
+        self.games = {}  # game_id → ResumableGame, until the game is over
+        self._lock = threading.Lock()
+
+    def start(self, game):
+        if self.deferred_only:
+            blocking = game.blocking_players()
+            if blocking:
+                raise TypeError(f"Game {game.game_id} has players that are not DeferredPlayers "
+                                f"and would block a worker on every decision: {', '.join(blocking)}")
+        with self._lock:
+            if game.game_id in self.games:
+                raise ValueError(f"Game {game.game_id} is already running")
+            self.games[game.game_id] = game
+        TRACER.start(game.game_id)
+        return self._executor.submit(self._run, game)
+
+    def submit_action(self, game_id, uuid, action, amount=0):
+        """Pass a deferred player's decision to its game; returns an error message or None"""
+        game = self.games.get(game_id)
+        if game is None:
+            return "Game not found"
+        error = game.submit_action(uuid, action, amount)
+        if error is None:
+            self._executor.submit(self._run, game)
+        return error
+
+    def waiting_games(self):
+        return [game for game in list(self.games.values()) if game.status == ResumableGame.WAITING]
+
+    def _run(self, game):
+        try:
+            status = game.run()
+        except Exception as e:
+            with TRACER.bind(game.game_id):
+                TRACER.error("game_failed", game_id=game.game_id, error=str(e))
+            game.status = status = ResumableGame.FINISHED
+        if status == ResumableGame.FINISHED:
+            with self._lock:
+                self.games.pop(game.game_id, None)
+            TRACER.discard(game.game_id)
+            if game.on_finish:
+                game.on_finish(game, game.result)
+        return status
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
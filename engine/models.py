@@ -1,4 +1,21 @@
 from pypokerengine.players import BasePokerPlayer
+from pypokerengine.engine.player import Player
+
+
+class TablePlayer(Player):
+    """Engine Player that also carries the seat label (dealer, small_blind, UTG...) shown to clients"""
+
+    __slots__ = ("position",)
+
+    def __init__(self, uuid, initial_stack, name="No Name"):
+        Player.__init__(self, uuid, initial_stack, name)
+        self.position = "none"
+
+    def __reduce__(self):
+        # Player pickles as its serial form; carry the label along with it
+        constructor, args = Player.__reduce__(self)
+        return constructor, args, (None, {"position": self.position})
+
 
 class SetupPlayer(BasePokerPlayer):
     def __init__(self, user_id, stack):
@@ -0,0 +1,139 @@
+import contextvars
+import threading
+from collections import OrderedDict
+
+from .metrics import REGISTRY
+from .tracing import TRACER
+
+SLACK_MAX_RETRIES = 3
+SLACK_BACKOFF_SECONDS = 0.5  # Doubled after every failed attempt unless Slack sends Retry-After
+
+SLACK_MESSAGES_TOTAL = REGISTRY.counter(
+    "poker_slack_messages_total", "Outbound Slack notifications by what happened to them", ["result"])
+
+
+def _retry_after(error):
+    """Seconds Slack asked us to wait for a rate limited call, or None"""
+    response = getattr(error, "response", None)
+    if response is None or getattr(response, "status_code", None) != 429:
+        return None
+    try:
+        return float(response.headers.get("Retry-After"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def _start_timer(delay, callback):
+    timer = threading.Timer(delay, callback)
+    timer.daemon = True  # A pending retry must not keep the process alive
+    timer.start()
+
+
+class SlackOutbox:
+    """Queues a game's Slack notifications and sends one coalesced message per channel.
+
+    It has the same chat_postMessage signature as the Slack client, so players post to it
+    unchanged. Nothing is sent until flush(), which the game calls when it reaches a decision
+    point, turning a street's worth of notifications into a single call per player.
+
+    flush() runs while the game is locked, so a failed call is never waited for there: it is
+    retried later through schedule(delay, callback), on a timer thread by default. Messages for
+    a channel with a retry outstanding stay queued and follow the retry, keeping their order.
+    """
+
+    def __init__(self, client, max_retries=SLACK_MAX_RETRIES, backoff=SLACK_BACKOFF_SECONDS, schedule=_start_timer):
+        self.client = client
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._schedule = schedule
+        self._queued = OrderedDict()  # channel → [(text, blocks)], in order of first message
+        self._retrying = set()  # channels whose last message is waiting for a retry
+        self._lock = threading.Lock()
+
+    def chat_postMessage(self, channel, text="", blocks=None, **kwargs):
+        with self._lock:
+            self._queued.setdefault(channel, []).append((text, blocks))
+        SLACK_MESSAGES_TOTAL.inc(result="queued")
+
+    def pending(self):
+        with self._lock:
+            return sum(len(messages) for messages in self._queued.values())
+
+    def retrying(self):
+        with self._lock:
+            return len(self._retrying)
+
+    def flush(self):
+        """Send everything queued, one call per channel; returns the number of messages sent"""
+        with self._lock:
+            ready = [channel for channel in self._queued if channel not in self._retrying]
+            queued = OrderedDict((channel, self._queued.pop(channel)) for channel in ready)
+
+        sent = 0
+        for channel, messages in queued.items():
+            if self._send(channel, self._coalesce(messages), attempt=0):
+                sent += 1
+        return sent
+
+    @staticmethod
+    def _coalesce(messages):
+        text = "\n".join(text for text, _ in messages if text)
+        blocks = [block for _, message_blocks in messages for block in (message_blocks or [])]
+        if not blocks:
+            return {"text": text}
+        # With blocks Slack only shows the blocks, so the notifications go in front as a section
+        if text:
+            blocks.insert(0, {"type": "section", "text": {"type": "mrkdwn", "text": text}})
+        return {"text": text, "blocks": blocks}
+
+    def _send(self, channel, payload, attempt):
+        """True if sent, False if given up, None if a retry has been scheduled"""
+        try:
+            self.client.chat_postMessage(channel=channel, **payload)
+            SLACK_MESSAGES_TOTAL.inc(result="sent")
+            return True
+        except Exception as e:
+            if attempt == self.max_retries:
+                SLACK_MESSAGES_TOTAL.inc(result="failed")
+                TRACER.error("slack_post_failed", channel=channel, attempts=attempt + 1, error=str(e))
+                return False
+            SLACK_MESSAGES_TOTAL.inc(result="retried")
+            wait = _retry_after(e)
+            with self._lock:
+                self._retrying.add(channel)
+            # The retry keeps the game's trace even though it runs on another thread
+            context = contextvars.copy_context()
+            self._schedule(wait if wait is not None else self.backoff * 2 ** attempt,
+                           lambda: context.run(self._retry, channel, payload, attempt + 1))
+            return None
+
+    def _retry(self, channel, payload, attempt):
+        if self._send(channel, payload, attempt) is None:
+            return
+        # Whatever was queued for the channel meanwhile goes out right behind it
+        with self._lock:
+            self._retrying.discard(channel)
+            messages = self._queued.pop(channel, None)
+        if messages:
+            self._send(channel, self._coalesce(messages), attempt=0)
+
+
+class StubSlackClient:
+    """Records chat_postMessage calls instead of sending them; for tests and local runs.
+
+    fail_times makes that many calls raise first, to exercise the retry path.
+    """
+
+    def __init__(self, fail_times=0):
+        self.calls = []
+        self.fail_times = fail_times
+
+    def chat_postMessage(self, channel, **kwargs):
+        if self.fail_times > 0:
+            self.fail_times -= 1
+            raise ConnectionError("Stub Slack client failure")
+        self.calls.append({"channel": channel, **kwargs})
+        return {"ok": True}
+
+    def messages_for(self, channel):
+        return [call for call in self.calls if call["channel"] == channel]
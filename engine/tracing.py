@@ -0,0 +1,164 @@
+import contextvars
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: "debug", INFO: "info", WARNING: "warning", ERROR: "error"}
+LEVELS = {name: level for level, name in LEVEL_NAMES.items()}
+
+TRACE_BUFFER_SIZE = 512  # Records kept per game; older ones are dropped
+
+# Trace of the game the current request or engine call works on
+_current_trace = contextvars.ContextVar("poker_trace", default=None)
+
+
+def parse_level(value, default=INFO):
+    """Level from a name like "debug" or a number, falling back to default"""
+    if value is None:
+        return default
+    if isinstance(value, int):
+        return value
+    value = str(value).strip().lower()
+    if value.isdigit():
+        return int(value)
+    return LEVELS.get(value, default)
+
+
+def _jsonable(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple, set)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    return str(value)  # Cards, players and the like
+
+
+class GameTrace:
+    """Ring buffer of one game's trace records"""
+
+    def __init__(self, game_id, capacity, level=None):
+        self.game_id = game_id
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.level = level  # None uses the tracer's level
+        self.records = deque(maxlen=capacity)
+
+
+class Tracer:
+    """Structured, level-gated trace records kept per game.
+
+    Records are stored as (time, level, event, fields) and only formatted when dumped or echoed,
+    so a disabled level costs a single comparison. Callers that build expensive fields check
+    enabled() first. Records at or above echo_level are also printed.
+    """
+
+    def __init__(self, level=INFO, capacity=TRACE_BUFFER_SIZE, echo_level=WARNING):
+        self.level = level
+        self.capacity = capacity
+        self.echo_level = echo_level
+        self._traces = {}  # game_id → GameTrace
+        self._lock = threading.Lock()
+
+    def start(self, game_id):
+        """Create a fresh trace for the game, replacing any previous one"""
+        trace = GameTrace(game_id, self.capacity)
+        with self._lock:
+            self._traces[game_id] = trace
+        return trace
+
+    def discard(self, game_id):
+        with self._lock:
+            self._traces.pop(game_id, None)
+
+    def get(self, game_id):
+        return self._traces.get(game_id)
+
+    def set_level(self, game_id, level):
+        """Trace one game at a different level, e.g. DEBUG while investigating a hand"""
+        trace = self._traces.get(game_id)
+        if trace is not None:
+            trace.level = level
+        return trace
+
+    def activate(self, game_id):
+        """Make game_id the target of following records; returns a token for deactivate()"""
+        return _current_trace.set(self._traces.get(game_id))
+
+    def deactivate(self, token):
+        _current_trace.reset(token)
+
+    @contextmanager
+    def bind(self, game_id):
+        token = self.activate(game_id)
+        try:
+            yield
+        finally:
+            self.deactivate(token)
+
+    def enabled(self, level):
+        trace = _current_trace.get()
+        if trace is not None and trace.level is not None:
+            return level >= trace.level
+        return level >= self.level
+
+    def debug(self, event, **fields):
+        if self.enabled(DEBUG):
+            self._record(DEBUG, event, fields)
+
+    def info(self, event, **fields):
+        if self.enabled(INFO):
+            self._record(INFO, event, fields)
+
+    def warning(self, event, **fields):
+        if self.enabled(WARNING):
+            self._record(WARNING, event, fields)
+
+    def error(self, event, **fields):
+        if self.enabled(ERROR):
+            self._record(ERROR, event, fields)
+
+    def _record(self, level, event, fields):
+        record = (time.time(), level, event, fields)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.records.append(record)
+        if level >= self.echo_level:
+            print(self.format(record, trace))
+
+    def dump(self, game_id):
+        """JSON-ready copy of the game's buffered records, oldest first; None if the game has no trace"""
+        trace = self._traces.get(game_id)
+        if trace is None:
+            return None
+        return {
+            "game_id": game_id,
+            "trace_id": trace.trace_id,
+            "level": LEVEL_NAMES.get(trace.level if trace.level is not None else self.level),
+            "records": [
+                {"time": ts, "level": LEVEL_NAMES.get(level, level), "event": event, **_jsonable(fields)}
+                for ts, level, event, fields in list(trace.records)
+            ]
+        }
+
+    @staticmethod
+    def format(record, trace=None):
+        ts, level, event, fields = record
+        prefix = f"{LEVEL_NAMES.get(level, level).upper()}: "
+        if trace is not None:
+            prefix += f"[{trace.game_id} {trace.trace_id}] "
+        return prefix + event + "".join(f" {name}={value}" for name, value in fields.items())
+
+
+# Process wide tracer; POKER_TRACE_LEVEL sets what is buffered, POKER_TRACE_ECHO what is printed
+TRACER = Tracer(
+    level=parse_level(os.environ.get("POKER_TRACE_LEVEL"), INFO),
+    echo_level=parse_level(os.environ.get("POKER_TRACE_ECHO"), WARNING)
+)
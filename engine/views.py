@@ -0,0 +1,457 @@
+from pypokerengine.engine.action_checker import ActionChecker
+from pypokerengine.engine.poker_constants import PokerConstants as Const
+from .tracing import TRACER, DEBUG
+
+
+def render_start_game_view(engine, game_id, result):
+    """Build the /start-game response from the engine's start_game result"""
+    # Get the game state from the engine
+    game = engine.games[game_id]
+    table = game["table"]
+    current_state = game["current_state"]
+
+    # Transform the response to match the expected format
+    transformed_response = {
+        "game_id": result["game_id"],
+        "min_bet": 0,  # Will be calculated based on call amount
+        "next_player": None,  # Will be set below
+        "players": [],
+        "pot": [],
+        "total_pot": 3,  # Small blind (1) + Big blind (2)
+        "valid_actions": [],
+        "is_hand_over": False,
+        "winning_hand": None,
+        "version": engine.get_version(game_id)
+    }
+
+    # Transform players data using PyPokerEngine's built-in methods
+    for i, player in enumerate(result["players"]):
+        # Convert hole cards to string format using PyPokerEngine's __str__ method
+        hole_cards = [str(card) for card in player["hole_cards"]]
+
+        # Convert position to numeric format
+        position_map = {"dealer": 0, "small_blind": 0, "big_blind": 1, "none": 2}
+        position = position_map.get(player["position"], 2)
+
+        transformed_response["players"].append({
+            "hole_cards": hole_cards,
+            "position": position,
+            "stack": player["stack"],
+            "user_id": player["user_id"]
+        })
+
+    # Create pot structure using PyPokerEngine's PayInfo
+    transformed_response["pot"] = _render_pot(table)
+
+    # Calculate total pot from individual contributions
+    transformed_response["total_pot"] = sum(p["amount"] for p in transformed_response["pot"])
+
+    # Set next_player from the round state
+    next_player_pos = result["round_state"]["next_player"]
+    if next_player_pos is not None and 0 <= next_player_pos < len(result["round_state"]["players"]):
+        transformed_response["next_player"] = result["round_state"]["players"][next_player_pos]["name"]
+    else:
+        transformed_response["next_player"] = None
+
+    # Generate valid actions using our corrected calculation
+    next_player_pos = current_state["next_player"]
+    next_player = table.seats.players[next_player_pos]
+
+    # Calculate valid actions manually to get correct amounts
+    active_players = [p for p in table.seats.players if p.is_active()]
+    max_bet = max(p.pay_info.amount for p in active_players) if active_players else 0
+
+    # Calculate call amount for the next player
+    # In heads-up play, we need to calculate what the small blind will need to call
+    if len(table.seats.players) == 2:
+        # Debug position values
+        if TRACER.enabled(DEBUG):
+            TRACER.debug("start_game_positions", next_player=next_player.name,
+                         positions=[(p.name, p.position) for p in table.seats.players])
+
+        # Find small blind and big blind players
+        small_blind_player = None
+        big_blind_player = None
+        for p in table.seats.players:
+            if p.position == "small_blind":
+                small_blind_player = p
+            elif p.position == "big_blind":
+                big_blind_player = p
+
+        if small_blind_player and big_blind_player:
+            # Calculate what small blind needs to call (big blind amount - small blind amount)
+            call_amount = big_blind_player.pay_info.amount - small_blind_player.pay_info.amount
+            TRACER.debug("small_blind_call", call_amount=call_amount,
+                         small_blind=small_blind_player.name, big_blind=big_blind_player.name)
+        else:
+            call_amount = 0
+            TRACER.warning("blind_players_not_found")
+    else:
+        # For more than 2 players, use the old logic
+        player_contribution = next_player.pay_info.amount
+        call_amount = max(0, max_bet - player_contribution)
+
+    call_amount = max(0, call_amount)  # Can't call negative amounts
+
+    # Calculate raise amounts using PyPokerEngine's logic
+    min_raise = ActionChecker._ActionChecker__min_raise_amount(table.seats.players, current_state["small_blind_amount"])
+    if TRACER.enabled(DEBUG):
+        # Copies, the histories keep growing after this record is buffered
+        TRACER.debug("min_raise", min_raise=min_raise,
+                     action_histories={p.name: [h.to_dict() for h in p.action_histories] for p in table.seats.players})
+
+    max_raise = next_player.stack
+
+    # Add valid actions
+    transformed_response["valid_actions"].append({"action": "fold", "amount": 0})
+    transformed_response["valid_actions"].append({"action": "call", "amount": call_amount})
+
+    # Only show raise if the player has enough chips to raise more than the call amount
+    if max_raise > call_amount:
+        transformed_response["valid_actions"].append({
+            "action": "raise",
+            "amount": {"max": max_raise, "min": min_raise}
+        })
+
+    # Set min_bet to match the call amount
+    transformed_response["min_bet"] = call_amount
+
+    return transformed_response
+
+
+def render_action_view(engine, game_id, action, result):
+    """Build the /action response from the engine's apply_action result"""
+    # Start with the internal response fields
+    transformed_response = {
+        "game_id": game_id,
+        "success": result.get("success", True),
+        "action_applied": result.get("action_applied", action),
+        "next_player": result.get("next_player", 0),
+        "should_advance_street": result.get("should_advance_street", False),
+        "current_street": result.get("current_street", 0),
+        "round_state": {},  # We'll transform this below
+        "is_hand_over": False,
+        "winning_hand": None,
+        "version": engine.get_version(game_id)
+    }
+
+    # Add client-facing fields
+    if "round_state" in result:
+        round_state = result["round_state"]
+
+        # Get the game to access table for pot calculation
+        game = engine.games.get(game_id)
+        if game:
+            table = game["table"]
+            current_state = game["current_state"]
+
+            # Transform next_player from index to player name
+            next_player_pos = result.get("next_player", 0)
+            if next_player_pos is None:
+                next_player = None
+                transformed_response["next_player"] = None
+            else:
+                next_player = table.seats.players[next_player_pos]
+                transformed_response["next_player"] = next_player.name
+                TRACER.debug("action_next_player", next_player_pos=next_player_pos, next_player=next_player.name)
+
+            # Extract board (community cards)
+            community_cards = round_state.get("community_cards", [])
+            transformed_response["board"] = [str(card) for card in community_cards]
+
+            # Transform pot to match /start-game format
+            pot = _render_pot(table)
+            transformed_response["pot"] = pot
+
+            # Calculate total pot
+            transformed_response["total_pot"] = sum(p["amount"] for p in pot)
+
+            # Set street
+            transformed_response["street"] = round_state.get("street", 0)
+
+            # Generate valid actions for the next player
+            # Check if we're at showdown (no valid actions)
+            if current_state.get("street") == 4:  # SHOWDOWN
+                transformed_response["valid_actions"] = []
+            else:
+                transformed_response["valid_actions"] = _render_valid_actions(
+                    table, next_player, current_state["small_blind_amount"])
+
+    # Check if hand is over (showdown)
+    winning_hand = engine.get_winning_hand(game_id)
+    if winning_hand:
+        transformed_response["is_hand_over"] = True
+        transformed_response["winning_hand"] = winning_hand
+        # During showdown, there are no valid actions
+        transformed_response["valid_actions"] = []
+
+    # Transform round_state to handle Card objects
+    if "round_state" in result:
+        round_state = result["round_state"]
+
+        # Move players to top level
+        transformed_response["players"] = _render_players(round_state)
+
+        # Transform community cards to string format
+        community_cards = [str(card) for card in round_state.get("community_cards", [])]
+
+        transformed_response["round_state"] = {
+            "dealer_btn": round_state.get("dealer_btn", 0),
+            "sb_pos": round_state.get("sb_pos", 0),
+            "bb_pos": round_state.get("bb_pos", 0),
+            "community_cards": community_cards,
+            "pot": round_state.get("pot", 0),
+            "street": round_state.get("street", 0),
+            "next_player": round_state.get("next_player", 0)
+        }
+
+    return transformed_response
+
+
+def render_state_view(engine, game_id):
+    """Build the /state response for the game's current version"""
+    result = engine.get_state(game_id)
+    if "error" in result:
+        return result
+
+    # Get the game to access table for pot calculation
+    game = engine.games.get(game_id)
+    if not game:
+        return {"error": "Game not found"}
+
+    table = game["table"]
+
+    # Transform the response to handle Card objects
+    transformed_response = {
+        "game_id": game_id,
+        "dealer_btn": result.get("dealer_btn", 0),
+        "sb_pos": result.get("sb_pos", 0),
+        "bb_pos": result.get("bb_pos", 0),
+        "community_cards": [],
+        "pot": [],  # Will be calculated from player.pay_info.amount
+        "street": result.get("street", 0),
+        "next_player": "",  # Will be transformed from index to player name
+        "players": [],
+        "is_hand_over": False,
+        "winning_hand": None,
+        "version": game["version"]
+    }
+
+    # Transform community cards to string format
+    if "community_cards" in result:
+        transformed_response["community_cards"] = [str(card) for card in result["community_cards"]]
+
+    # Transform players data to handle Card objects
+    transformed_response["players"] = _render_players(result)
+
+    # Transform next_player from index to player name
+    next_player_pos = result.get("next_player", 0)
+    if next_player_pos is None:
+        transformed_response["next_player"] = None
+    elif 0 <= next_player_pos < len(table.seats.players):
+        next_player = table.seats.players[next_player_pos]
+        transformed_response["next_player"] = next_player.name
+    else:
+        transformed_response["next_player"] = ""
+
+    # Calculate pot from player.pay_info.amount (matching /start-game format)
+    transformed_response["pot"] = _render_pot(table)
+
+    # Check if hand is over (showdown)
+    winning_hand = engine.get_winning_hand(game_id)
+    if winning_hand:
+        transformed_response["is_hand_over"] = True
+        transformed_response["winning_hand"] = winning_hand
+
+    # Calculate total pot
+    transformed_response["total_pot"] = sum(p["amount"] for p in transformed_response["pot"])
+
+    return transformed_response
+
+
+def snapshot_game(game):
+    """Compact record of the client-visible state, kept per version to compute deltas"""
+    table = game["table"]
+    current_state = game["current_state"]
+    players = table.seats.players
+
+    next_player_pos = current_state.get("next_player")
+    if next_player_pos is not None and 0 <= next_player_pos < len(players):
+        next_player = players[next_player_pos].name
+    else:
+        next_player = None
+
+    return {
+        "seats": [
+            (p.name, p.stack, p.is_active(), getattr(p, 'position', 'none'), p.pay_info.amount)
+            for p in players
+        ],
+        "hole_cards": [[str(card) for card in p.hole_card] for p in players],
+        "community_cards": [str(card) for card in table.get_community_card()],
+        "round_count": current_state.get("round_count"),
+        "street": current_state.get("street", 0),
+        "next_player": next_player,
+        "is_hand_over": current_state.get("street") == Const.Street.SHOWDOWN
+    }
+
+
+def render_delta_view(engine, game_id, since):
+    """Changes between version `since` and the current version, or None if `since` is unknown"""
+    game = engine.games.get(game_id)
+    if not game:
+        return None
+
+    old = game["snapshots"].get(since)
+    new = game["snapshots"].get(game["version"])
+    if old is None or new is None:
+        return None  # Too old (or not from this game), the client needs a full response
+    if new["round_count"] != old["round_count"] or new["hole_cards"] != old["hole_cards"]:
+        return None  # A new hand was dealt, the client needs its new hole cards and board
+
+    delta = {
+        "game_id": game_id,
+        "delta": True,
+        "since": since,
+        "version": game["version"],
+        "players": [],
+        "pot": []
+    }
+
+    # Only seats whose public fields moved, and only the fields that moved
+    for old_seat, new_seat in zip(old["seats"], new["seats"]):
+        user_id, stack, is_active, position, pot_amount = new_seat
+        changes = {}
+        if stack != old_seat[1]:
+            changes["stack"] = stack
+        if is_active != old_seat[2]:
+            changes["is_active"] = is_active
+        if position != old_seat[3]:
+            changes["position"] = position
+        if changes:
+            changes["user_id"] = user_id
+            delta["players"].append(changes)
+        if pot_amount != old_seat[4]:
+            delta["pot"].append({"user_id": user_id, "delta": pot_amount - old_seat[4]})
+
+    # Community cards only grow during a hand; anything else means the board was replaced
+    old_board, new_board = old["community_cards"], new["community_cards"]
+    if new_board[:len(old_board)] == old_board:
+        delta["new_community_cards"] = new_board[len(old_board):]
+    else:
+        delta["community_cards"] = new_board
+
+    if new["street"] != old["street"]:
+        delta["street"] = new["street"]
+    if new["next_player"] != old["next_player"]:
+        delta["next_player"] = new["next_player"]
+    if new["is_hand_over"] != old["is_hand_over"]:
+        delta["is_hand_over"] = new["is_hand_over"]
+        delta["winning_hand"] = engine.get_winning_hand(game_id)
+
+    return delta
+
+
+def render_action_delta_view(engine, game_id, action, result, since):
+    """Compact /action response relative to version `since`, or None if `since` is unknown"""
+    delta = render_delta_view(engine, game_id, since)
+    if delta is None:
+        return None
+
+    delta["success"] = result.get("success", True)
+    delta["action_applied"] = result.get("action_applied", action)
+
+    # The player who acts next still needs the full menu of actions
+    game = engine.games[game_id]
+    table = game["table"]
+    next_player_pos = result.get("next_player")
+    if next_player_pos is None or game["current_state"].get("street") == Const.Street.SHOWDOWN:
+        delta["valid_actions"] = []
+    else:
+        delta["valid_actions"] = _render_valid_actions(
+            table, table.seats.players[next_player_pos], game["current_state"]["small_blind_amount"])
+    return delta
+
+
+def redact_hole_cards(view):
+    """Split a state view into the public part and each player's hole cards"""
+    hole_cards = {}
+    public_players = []
+    for player in view["players"]:
+        hole_cards[player["user_id"]] = player["hole_cards"]
+        public_players.append(dict(player, hole_cards=[]))
+    return dict(view, players=public_players), hole_cards
+
+
+def _render_players(round_state):
+    """Convert round_state players into the client format with string hole cards"""
+    transformed_players = []
+    for player in round_state.get("players", []):
+        # Convert hole cards to string format
+        hole_cards = [str(card) for card in player.get("hole_cards", [])]
+
+        transformed_players.append({
+            "user_id": player.get("name", ""),  # Use user_id instead of name
+            "stack": player.get("stack", 0),
+            "hole_cards": hole_cards,
+            "is_active": player.get("is_active", True),
+            "position": player.get("position", "none")
+        })
+    return transformed_players
+
+
+def _render_pot(table):
+    """Per-player pot contributions taken from PyPokerEngine's PayInfo"""
+    pot = []
+    for player in table.seats.players:
+        pot_amount = player.pay_info.amount if hasattr(player, 'pay_info') else 0
+        pot.append({
+            "amount": pot_amount,
+            "user_id": player.name
+        })
+    return pot
+
+
+def _render_valid_actions(table, next_player, small_blind_amount):
+    """Valid actions for the player who is about to act"""
+    active_players = [p for p in table.seats.players if p.is_active()]
+    max_bet = max(p.pay_info.amount for p in active_players) if active_players else 0
+
+    # Calculate call amount for the next player (who is about to act)
+    if next_player is not None:
+        player_contribution = next_player.pay_info.amount
+        call_amount = max(0, max_bet - player_contribution)
+        TRACER.debug("call_amount", next_player=next_player.name, max_bet=max_bet,
+                     player_contribution=player_contribution, call_amount=call_amount)
+    else:
+        call_amount = 0
+
+    call_amount = max(0, call_amount)  # Can't call negative amounts
+
+    # Calculate raise amounts using PyPokerEngine's logic
+    min_raise = ActionChecker._ActionChecker__min_raise_amount(table.seats.players, small_blind_amount)
+    if TRACER.enabled(DEBUG):
+        # Copies, the histories keep growing after this record is buffered
+        TRACER.debug("min_raise", min_raise=min_raise,
+                     action_histories={p.name: [h.to_dict() for h in p.action_histories] for p in table.seats.players})
+
+    max_raise = next_player.stack if next_player is not None else 0
+
+    # Add valid actions
+    valid_actions = []
+    valid_actions.append({"action": "fold", "amount": 0})
+
+    # If call amount is 0, it's a check, otherwise it's a call
+    if call_amount == 0:
+        valid_actions.append({"action": "check", "amount": 0})
+    else:
+        valid_actions.append({"action": "call", "amount": call_amount})
+
+    # Only show raise if the player has enough chips to raise more than the call amount
+    if max_raise > call_amount:
+        valid_actions.append({
+            "action": "raise",
+            "amount": {"max": max_raise, "min": min_raise}
+        })
+
+    TRACER.debug("valid_actions", valid_actions=valid_actions)
+    return valid_actions
@@ -0,0 +1,300 @@
+"""Counterfactual regret minimization over the engine's rules
+
+CFRSolver plays one round from a fixed table setup (seats, stacks, blinds)
+through RoundManager, with a GameTree limiting the raises to a
+BetAbstraction and a card abstraction grouping hands into buckets. It keeps
+regrets and average strategies per information set in a StrategyTable
+(numpy arrays, one row per information set, one column per abstract
+action), which can be checkpointed and loaded back at decision time.
+
+    solver = CFRSolver(table, small_blind_amount=5, bet_abstraction=BetAbstraction([1]))
+    solver.iterate(1000)                      # or solver.iterate_parallel(1000, processes=4)
+    solver.table.save("strategy.npz")
+
+numpy is only needed here; the rest of the package does not import it.
+"""
+
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from pypokerengine.api.game_tree import BetAbstraction, GameTree
+from pypokerengine.engine.deck import Deck
+from pypokerengine.engine.table import Table
+from pypokerengine.engine.hand_evaluator import HandEvaluator
+from pypokerengine.engine.round_manager import RoundManager
+from pypokerengine.engine.action_checker import ActionChecker
+
+EXTERNAL_SAMPLING = "external"
+OUTCOME_SAMPLING = "outcome"
+
+class HandClassAbstraction(object):
+    """Card buckets: the 169 hole card classes preflop, the made hand category after
+
+    Preflop a bucket is (high rank, low rank, suited), which loses nothing
+    but the suits' names; on later streets it is the hand category of
+    HandEvaluator (high card ... straight flush), so hands of one category
+    share a strategy.
+    """
+
+    def bucket(self, hole_card, community_card):
+        if not community_card:
+            low, high = sorted(card.rank for card in hole_card)
+            suited = hole_card[0].suit == hole_card[1].suit
+            return (high * 15 + low) * 2 + suited
+        strength = HandEvaluator.eval_hand(hole_card, community_card) >> 8
+        return 1000 + strength.bit_length()
+
+class StrategyTable(object):
+    """Regret and strategy sums per information set, in two numpy arrays
+
+    Row i of `regrets` and `strategy_sums` belongs to the information set
+    keys[i]; column j to the j-th label of the bet abstraction. Rows are
+    added as information sets are first reached and the arrays grow by
+    doubling.
+    """
+
+    def __init__(self, labels, capacity=1024):
+        if np is None:
+            raise ImportError("The CFR solver needs numpy (pip install numpy)")
+        self.labels = list(labels)
+        self.keys = []
+        self.index = {}
+        self.regrets = np.zeros((capacity, len(self.labels)))
+        self.strategy_sums = np.zeros((capacity, len(self.labels)))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def row(self, key):
+        row = self.index.get(key)
+        if row is None:
+            row = len(self.keys)
+            if row == len(self.regrets): self.__grow()
+            self.index[key] = row
+            self.keys.append(key)
+        return row
+
+    def current_strategy(self, row, columns):
+        """Regret matching over the given columns (the actions playable at the node)"""
+        positive = np.maximum(self.regrets[row, columns], 0)
+        total = positive.sum()
+        if total > 0: return positive / total
+        return np.full(len(columns), 1.0 / len(columns))
+
+    def average_strategy(self, key):
+        """{label: probability} of the average strategy at key, or None if it was never reached"""
+        row = self.index.get(key)
+        if row is None: return None
+        sums = self.strategy_sums[row]
+        total = sums.sum()
+        if total <= 0: return None
+        return { label: sums[column] / total for column, label in enumerate(self.labels) if sums[column] > 0 }
+
+    def copy(self):
+        table = StrategyTable(self.labels, capacity=max(len(self.keys), 1))
+        table.keys, table.index = list(self.keys), dict(self.index)
+        table.regrets = self.regrets[:len(self.keys)].copy()
+        table.strategy_sums = self.strategy_sums[:len(self.keys)].copy()
+        return table
+
+    def add_difference(self, other, base):
+        """Add what other gained over base (a worker's table and the table it started from)"""
+        for row, key in enumerate(other.keys):
+            target = self.row(key)
+            base_row = base.index.get(key)
+            self.regrets[target] += other.regrets[row]
+            self.strategy_sums[target] += other.strategy_sums[row]
+            if base_row is not None:
+                self.regrets[target] -= base.regrets[base_row]
+                self.strategy_sums[target] -= base.strategy_sums[base_row]
+
+    def save(self, path):
+        size = len(self.keys)
+        np.savez_compressed(path, labels=np.array(self.labels), keys=np.array(self.keys, dtype=str),
+                regrets=self.regrets[:size], strategy_sums=self.strategy_sums[:size])
+
+    @classmethod
+    def load(self, path):
+        with np.load(path) as data:
+            table = self(data["labels"].tolist(), capacity=max(len(data["keys"]), 1))
+            table.keys = data["keys"].tolist()
+            table.index = { key: row for row, key in enumerate(table.keys) }
+            table.regrets = data["regrets"].copy()
+            table.strategy_sums = data["strategy_sums"].copy()
+        return table
+
+    def __grow(self):
+        self.regrets = np.concatenate([self.regrets, np.zeros_like(self.regrets)])
+        self.strategy_sums = np.concatenate([self.strategy_sums, np.zeros_like(self.strategy_sums)])
+
+class CFRSolver(object):
+    """Monte Carlo CFR (or CFR+) over one round dealt from a table setup
+
+    table is a Table with the players seated, the dealer button and blind
+    positions set; every iteration deals it a fresh shuffled deck.
+    sampling is EXTERNAL_SAMPLING (every action of the updated player is
+    explored, the others' are sampled) or OUTCOME_SAMPLING (one action per
+    node, with `exploration` for the updated player). plus=True turns on
+    CFR+: regrets are floored at 0 and the average is weighted by iteration.
+
+    An information set is the acting seat, its card bucket and the
+    abstract actions taken so far in the round (info_set_key). At decision
+    time, keep that history by mapping the real actions through
+    BetAbstraction.to_abstract and look the key up with average_strategy.
+    """
+
+    def __init__(self, table, small_blind_amount, ante=0, bet_abstraction=None, card_abstraction=None,
+            sampling=EXTERNAL_SAMPLING, plus=False, exploration=0.6, seed=None):
+        if sampling not in (EXTERNAL_SAMPLING, OUTCOME_SAMPLING):
+            raise ValueError("Unknown sampling %s" % sampling)
+        self.root_table = table
+        self.small_blind_amount, self.ante = small_blind_amount, ante
+        self.tree = GameTree(bet_abstraction or BetAbstraction())
+        self.card_abstraction = card_abstraction or HandClassAbstraction()
+        self.sampling, self.plus, self.exploration = sampling, plus, exploration
+        self.table = StrategyTable(self.tree.bet_abstraction.labels)
+        self.iterations = 0
+        self.rng = random.Random(seed)
+        self.__columns = { label: column for column, label in enumerate(self.table.labels) }
+
+    def iterate(self, iterations=1):
+        for _ in range(iterations):
+            self.iterations += 1
+            for traverser in range(self.root_table.seats.size()):
+                state, initial_stacks = self.__deal()
+                buckets = {}
+                if self.sampling == EXTERNAL_SAMPLING:
+                    self.__external(state, "", traverser, initial_stacks, buckets)
+                else:
+                    self.__outcome(state, "", traverser, initial_stacks, buckets, 1.0, 1.0, 1.0)
+            if self.plus: np.maximum(self.table.regrets, 0, out=self.table.regrets)
+
+    def iterate_parallel(self, iterations, processes):
+        """Split iterations over worker processes and add up what each of them learned"""
+        per_worker, extra = divmod(iterations, processes)
+        counts = [per_worker + 1] * extra + [per_worker] * (processes - extra)
+        counts = [count for count in counts if count > 0]
+        if not counts: return
+        seeds = [self.rng.randrange(2**32) for _ in counts]
+        base = self.table.copy()
+        with ProcessPoolExecutor(len(counts)) as pool:
+            tables = list(pool.map(_run_iterations, [(self, count, seed) for count, seed in zip(counts, seeds)]))
+        for table in tables:
+            self.table.add_difference(table, base)
+        if self.plus: np.maximum(self.table.regrets, 0, out=self.table.regrets)
+        self.iterations += iterations
+
+    def info_set_key(self, game_state, history, bucket=None):
+        seat = game_state["next_player"]
+        if bucket is None:
+            player = game_state["table"].seats.players[seat]
+            bucket = self.card_abstraction.bucket(player.hole_card, game_state["table"].get_community_card())
+        return "%d|%d|%s" % (seat, bucket, history)
+
+    def average_strategy(self, game_state, history):
+        """{label: probability} for the next player of game_state, None if the solver never got there"""
+        return self.table.average_strategy(self.info_set_key(game_state, history))
+
+    def extend_history(self, history, parent, child, label):
+        """history after label was played in parent and led to child ("/" marks a new street)"""
+        history += _ACTION_CHARS[self.__columns[label]]
+        if child["street"] != parent["street"]: history += "/"
+        return history
+
+    """ private """
+
+    def __deal(self):
+        table = Table.deserialize(self.root_table.serialize())
+        card_ids = list(range(1, 53))
+        self.rng.shuffle(card_ids)
+        table.deck = Deck(cheat=True, cheat_card_ids=card_ids)  # drawn in this order, not reshuffled
+        initial_stacks = [player.stack for player in table.seats.players]
+        state, _ = RoundManager.start_new_round(1, self.small_blind_amount, self.ante, table, runout_messages=False)
+        return state, initial_stacks
+
+    def __node(self, state, history, buckets):
+        seat = state["next_player"]
+        table = state["table"]
+        community_card = table.get_community_card()
+        cache_key = (seat, len(community_card))
+        if cache_key not in buckets:
+            player = table.seats.players[seat]
+            buckets[cache_key] = self.card_abstraction.bucket(player.hole_card, community_card)
+        actions = self.__playable(state)
+        row = self.table.row(self.info_set_key(state, history, buckets[cache_key]))
+        columns = [self.__columns[label] for label, _, _ in actions]
+        return seat, actions, row, columns
+
+    def __playable(self, state):
+        actions = self.tree.actions(state)
+        players = state["table"].seats.players
+        if ActionChecker.agree_amount(players) <= players[state["next_player"]].paid_sum():
+            actions = [action for action in actions if action[1] != "fold"]  # folding when checking is free
+        return actions
+
+    def __child(self, state, history, label):
+        child = self.tree.child(state, label)
+        return child, self.extend_history(history, state, child, label)
+
+    def __payoff(self, state, traverser, initial_stacks):
+        return state["table"].seats.players[traverser].stack - initial_stacks[traverser]
+
+    def __external(self, state, history, traverser, initial_stacks, buckets):
+        if self.tree.is_terminal(state): return self.__payoff(state, traverser, initial_stacks)
+        seat, actions, row, columns = self.__node(state, history, buckets)
+        strategy = self.table.current_strategy(row, columns)
+        if seat == traverser:
+            values = np.array([self.__external(*self.__child(state, history, label), traverser,
+                initial_stacks, buckets) for label, _, _ in actions])
+            value = strategy.dot(values)
+            self.table.regrets[row, columns] += values - value
+            return value
+        self.table.strategy_sums[row, columns] += strategy * self.__average_weight()
+        choice = self.__sample(strategy)
+        child, child_history = self.__child(state, history, actions[choice][0])
+        return self.__external(child, child_history, traverser, initial_stacks, buckets)
+
+    def __outcome(self, state, history, traverser, initial_stacks, buckets, own_reach, other_reach, sample_prob):
+        """(sampled utility / sample probability, probability of the rest of the sampled path)"""
+        if self.tree.is_terminal(state):
+            return self.__payoff(state, traverser, initial_stacks) / sample_prob, 1.0
+        seat, actions, row, columns = self.__node(state, history, buckets)
+        strategy = self.table.current_strategy(row, columns)
+        mine = seat == traverser
+        probs = self.exploration / len(actions) + (1 - self.exploration) * strategy if mine else strategy
+        choice = self.__sample(probs)
+        child, child_history = self.__child(state, history, actions[choice][0])
+        p = strategy[choice]
+        utility, tail = self.__outcome(child, child_history, traverser, initial_stacks, buckets,
+                own_reach * p if mine else own_reach, other_reach if mine else other_reach * p,
+                sample_prob * probs[choice])
+        if mine:
+            weight = utility * other_reach
+            regrets = -weight * tail * p * np.ones(len(columns))
+            regrets[choice] += weight * tail
+            self.table.regrets[row, columns] += regrets
+            self.table.strategy_sums[row, columns] += own_reach / sample_prob * strategy * self.__average_weight()
+        return utility, tail * p
+
+    def __sample(self, probs):
+        r, total = self.rng.random(), 0.0
+        for choice, p in enumerate(probs):
+            total += p
+            if r < total: return choice
+        return len(probs) - 1
+
+    def __average_weight(self):
+        return self.iterations if self.plus else 1
+
+def _run_iterations(args):
+    solver, iterations, seed = args
+    solver.rng = random.Random(seed)
+    solver.iterate(iterations)
+    return solver.table
+
+_ACTION_CHARS = "0123456789abcdefghijklmnopqrstuvwxyz"
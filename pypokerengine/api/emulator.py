@@ -10,6 +10,7 @@ from pypokerengine.engine.round_manager import RoundManager
 from pypokerengine.engine.action_checker import ActionChecker
 from pypokerengine.engine.message_builder import MessageBuilder
 from pypokerengine.players import BasePokerPlayer
+from pypokerengine.api.game_tree import BetAbstraction
 from pypokerengine.utils.game_state_utils import deepcopy_game_state
 
 class Emulator(object):
@@ -18,6 +19,7 @@ class Emulator(object):
         self.game_rule = {}
         self.blind_structure = {}
         self.players_holder = {}
+        self.runout_messages = True
 
     def set_game_rule(self, player_num, max_round, small_blind_amount, ante_amount):
         self.game_rule["player_num"] = player_num
@@ -28,6 +30,10 @@ class Emulator(object):
     def set_blind_structure(self, blind_structure):
         self.blind_structure = blind_structure
 
+    def set_runout_messages(self, enabled):
+        """False leaves out the new street events of streets dealt after everyone is all-in"""
+        self.runout_messages = enabled
+
     def register_player(self, uuid, player):
         if not isinstance(player, BasePokerPlayer):
             raise TypeError("player must inherit %s class." % BasePokerPlayer)
@@ -56,10 +62,14 @@ class Emulator(object):
         sb_amount = game_state["small_blind_amount"]
         return ActionChecker.legal_actions(players, player_pos, sb_amount)
 
+    def generate_abstract_actions(self, game_state, bet_abstraction=None):
+        """[(label, action, amount)] of a BetAbstraction instead of the raw raise range"""
+        return (bet_abstraction or BetAbstraction()).legal_actions(game_state)
+
     def apply_action(self, game_state, action, bet_amount=0):
         if game_state["street"] == Const.Street.FINISHED:
             game_state, events = self._start_next_round(game_state)
-        updated_state, messages = RoundManager.apply_action(game_state, action, bet_amount)
+        updated_state, messages = RoundManager.apply_action(game_state, action, bet_amount, self.runout_messages)
         events = [self.create_event(message[1]["message"]) for message in messages]
         events = [e for e in events if e]
         if self._is_last_round(updated_state, self.game_rule):
@@ -82,7 +92,7 @@ class Emulator(object):
             msg = MessageBuilder.build_ask_message(next_player_pos, game_state)["message"]
             action, amount = next_player_algorithm.declare_action(\
                     msg["valid_actions"], msg["hole_card"], msg["round_state"])
-            game_state, messages = RoundManager.apply_action(game_state, action, amount)
+            game_state, messages = RoundManager.apply_action(game_state, action, amount, self.runout_messages)
             mailbox += messages
         events = [self.create_event(message[1]["message"]) for message in mailbox]
         events = [e for e in events if e]
@@ -119,7 +129,8 @@ class Emulator(object):
         is_game_finished = len([1 for p in deepcopy_table.seats.players if p.is_active()])==1
         if is_game_finished: return deepcopy, self._generate_game_result_event(deepcopy)
 
-        new_state, messages = RoundManager.start_new_round(round_count, sb_amount, ante, deepcopy_table)
+        new_state, messages = RoundManager.start_new_round(
+                round_count, sb_amount, ante, deepcopy_table, self.runout_messages)
         events = [self.create_event(message[1]["message"]) for message in messages]
         events = [e for e in events if e]
         return new_state, events
@@ -175,14 +186,13 @@ def _steal_money_from_poor_player(table, ante, sb_amount):
     for player in [p for p in players if p.stack < ante]: player.stack = 0
     if players[table.dealer_btn].stack == 0: table.shift_dealer_btn()
 
-    search_targets = players + players + players
-    search_targets = search_targets[table.dealer_btn+1:table.dealer_btn+1+len(players)]
+    search_targets = table.seats.players_after(table.dealer_btn)
     # exclude player who cannot pay small blind
     sb_player = _find_first_elligible_player(search_targets, sb_amount + ante)
     sb_relative_pos = search_targets.index(sb_player)
     for player in search_targets[:sb_relative_pos]: player.stack = 0
     # exclude player who cannot pay big blind
-    search_targets = search_targets[sb_relative_pos+1:sb_relative_pos+len(players)]
+    search_targets = search_targets[sb_relative_pos+1:]
     bb_player = _find_first_elligible_player(search_targets, sb_amount*2 + ante, sb_player)
     if sb_player == bb_player:  # no one can pay big blind. So steal money from all players except small blind
         for player in [p for p in players if p!=bb_player]: player.stack = 0
@@ -1,4 +1,6 @@
-from pypokerengine.engine.dealer import Dealer
+from pypokerengine.engine.dealer import Dealer, AsyncDealer
+from pypokerengine.engine.round_manager import RoundManager
+from pypokerengine.engine.poker_constants import PokerConstants as Const
 from pypokerengine.players import BasePokerPlayer
 
 def setup_config(max_round, initial_stack, small_blind_amount, ante=0):
@@ -9,16 +11,38 @@ def start_poker(config, verbose=2):
     dealer = Dealer(config.sb_amount, config.initial_stack, config.ante)
     dealer.set_verbose(verbose)
     dealer.set_blind_structure(config.blind_structure)
+    _set_decision_time(dealer, config)
+    dealer.set_runout_messages(config.runout_messages)
     for info in config.players_info:
         dealer.register_player(info["name"], info["algorithm"])
     result_message = dealer.start_game(config.max_round)
-    return _format_result(result_message)
+    return _format_result(result_message, dealer)
 
-def _format_result(result_message):
-    return {
+async def start_poker_async(config, verbose=2):
+    """start_poker for an event loop; await it (or gather many) from a coroutine"""
+    config.validation()
+    dealer = AsyncDealer(config.sb_amount, config.initial_stack, config.ante)
+    dealer.set_verbose(verbose)
+    dealer.set_blind_structure(config.blind_structure)
+    _set_decision_time(dealer, config)
+    dealer.set_runout_messages(config.runout_messages)
+    for info in config.players_info:
+        dealer.register_player(info["name"], info["algorithm"])
+    result_message = await dealer.start_game(config.max_round)
+    return _format_result(result_message, dealer)
+
+def _set_decision_time(dealer, config):
+    if config.decision_time is not None:
+        dealer.set_decision_time(config.decision_time, config.time_bank)
+
+def _format_result(result_message, dealer=None):
+    result = {
             "rule": result_message["message"]["game_information"]["rule"],
             "players": result_message["message"]["game_information"]["seats"]
             }
+    if dealer and dealer.decision_timer:
+        result["decision_stats"] = dealer.decision_timer.stats
+    return result
 
 class Config(object):
 
@@ -29,6 +53,9 @@ class Config(object):
         self.initial_stack = initial_stack
         self.sb_amount = sb_amount
         self.ante = ante
+        self.decision_time = None
+        self.time_bank = 0
+        self.runout_messages = True
 
     def register_player(self, name, algorithm):
         if not isinstance(algorithm, BasePokerPlayer):
@@ -41,6 +68,15 @@ class Config(object):
     def set_blind_structure(self, blind_structure):
         self.blind_structure = blind_structure
 
+    def set_decision_time(self, decision_time, time_bank=0):
+        """Seconds per decision, and an extra time bank per player; slower players check or fold"""
+        self.decision_time = decision_time
+        self.time_bank = time_bank
+
+    def set_runout_messages(self, enabled):
+        """False skips street start messages once nobody can act; the round goes straight to showdown"""
+        self.runout_messages = enabled
+
     def validation(self):
         player_num = len(self.players_info)
         if player_num < 2:
@@ -48,3 +84,87 @@ class Config(object):
             base_msg = "At least 2 players are needed to start the game"
             raise Exception("%s (but %s.)" % (base_msg, detail_msg))
 
+
+class Game(object):
+    """A game you step through yourself
+
+    start_poker asks the registered players for their actions and runs to
+    the end. Game instead stops at every decision: read pending_decision(),
+    answer it with submit(action, amount) and collect what happened with
+    events(). No threads or callbacks are involved and the players'
+    methods are never called, so one process can interleave many games.
+    """
+
+    def __init__(self, config):
+        config.validation()
+        self.max_round = config.max_round
+        self.dealer = Dealer(config.sb_amount, config.initial_stack, config.ante)
+        self.dealer.set_blind_structure(config.blind_structure)
+        self.dealer.set_runout_messages(config.runout_messages)
+        for info in config.players_info:
+            self.dealer.register_player(info["name"], info["algorithm"])
+        self.table = self.dealer.table
+        self.round_count = 0
+        self.result = None
+        self._ante, self._sb_amount = self.dealer.ante, self.dealer.small_blind_amount
+        self._state = None
+        self._ask = None
+        self._events = [(-1, self.dealer._build_game_start_message(self.max_round))]
+        self.__advance()
+
+    def is_finished(self):
+        return self.result is not None
+
+    def pending_decision(self):
+        """The ask message of the player to act (with its "uuid"), or None when the game is finished"""
+        if self._ask is None: return None
+        address, msg = self._ask
+        decision = { "uuid": address }
+        decision.update(msg["message"])
+        return decision
+
+    def submit(self, action, amount=0):
+        """Apply the pending player's action and advance to the next decision"""
+        if self._ask is None:
+            raise Exception("Failed to submit action. Because game is already finished.")
+        self._ask = None
+        self._state, msgs = RoundManager.apply_action(self._state, action, amount, self.dealer.runout_messages)
+        self.__receive(msgs)
+        self.__advance()
+        return self.pending_decision()
+
+    def events(self):
+        """Notifications since the last call, as (address, message) pairs. Address -1 means all players."""
+        events, self._events = self._events, []
+        return events
+
+    def __advance(self):
+        while self._ask is None and self.result is None:
+            if self._state is None:
+                self.__start_next_round()
+            elif self._state["street"] == Const.Street.FINISHED:
+                self.table = self._state["table"]
+                self.table.shift_dealer_btn()
+                self._state = None
+
+    def __start_next_round(self):
+        if self.round_count < self.max_round:
+            self.round_count += 1
+            self._ante, self._sb_amount, self.table = self.dealer._prepare_round(
+                    self.round_count, self._ante, self._sb_amount, self.table)
+            if not self.dealer._is_game_finished(self.table):
+                self._state, msgs = RoundManager.start_new_round(self.round_count,
+                        self._sb_amount, self._ante, self.table, self.dealer.runout_messages)
+                self.__receive(msgs)
+                return
+        result_message = self.dealer._generate_game_result(self.max_round, self.table.seats)
+        self._events.append((-1, result_message))
+        self.result = _format_result(result_message)
+
+    def __receive(self, msgs):
+        self.dealer._message_check(msgs, self._state["street"])
+        if self._state["street"] == Const.Street.FINISHED:
+            self._events += msgs
+        else:
+            self._events += msgs[:-1]
+            self._ask = msgs[-1]
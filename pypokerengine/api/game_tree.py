@@ -0,0 +1,113 @@
+from pypokerengine.engine.poker_constants import PokerConstants as Const
+from pypokerengine.engine.round_manager import RoundManager
+from pypokerengine.engine.action_checker import ActionChecker
+
+FOLD = "fold"
+CALL = "call"
+MIN_RAISE = "min_raise"
+ALLIN = "allin"
+
+class BetAbstraction(object):
+    """The actions a search considers instead of every legal raise amount
+
+    An abstract action is a label: "fold", "call", "min_raise", "allin" or
+    "pot_<fraction>" (a raise by that fraction of the pot after calling,
+    e.g. "pot_0.5", "pot_1"). translate() turns a label into a legal
+    (action, amount) for a given state.
+
+        abstraction = BetAbstraction(pot_fractions=[0.5, 1])
+        for label, action, amount in abstraction.legal_actions(game_state):
+            ...
+    """
+
+    def __init__(self, pot_fractions=(0.5, 1), min_raise=True, allin=True):
+        self.labels = [FOLD, CALL]
+        if min_raise: self.labels.append(MIN_RAISE)
+        self.labels += ["pot_%g" % fraction for fraction in pot_fractions]
+        if allin: self.labels.append(ALLIN)
+
+    def translate(self, game_state, label):
+        """(action, amount) for label in game_state, or None if it cannot be played there"""
+        valid_actions = _valid_actions(game_state)
+        if label == FOLD: return FOLD, 0
+        if label == CALL: return CALL, valid_actions[1]["amount"]
+        min_raise, max_raise = valid_actions[2]["amount"]["min"], valid_actions[2]["amount"]["max"]
+        if min_raise == -1: return None
+        if label == MIN_RAISE: return "raise", min_raise
+        if label == ALLIN: return "raise", max_raise
+        if not label.startswith("pot_"): raise ValueError("Unknown abstract action %s" % label)
+        amount = pot_raise_amount(game_state, float(label[len("pot_"):]))
+        return "raise", min(max(amount, min_raise), max_raise)
+
+    def legal_actions(self, game_state):
+        """[(label, action, amount)] for the labels playable in game_state
+
+        Labels that come to the same concrete action (a pot raise bigger than
+        the stack is all-in) are listed once, under the first of them.
+        """
+        actions, seen = [], set()
+        for label in self.labels:
+            concrete = self.translate(game_state, label)
+            if concrete is None or concrete in seen: continue
+            seen.add(concrete)
+            actions.append((label,) + concrete)
+        return actions
+
+    def to_abstract(self, game_state, action, amount):
+        """The label of legal_actions(game_state) closest to an action taken in the real game"""
+        actions = self.legal_actions(game_state)
+        if action != "raise":
+            return next(label for label, act, _ in actions if act == action)
+        raises = [(abs(amount - raise_amount), label) for label, act, raise_amount in actions if act == "raise"]
+        if not raises: return CALL
+        return min(raises)[1]
+
+class GameTree(object):
+    """Child states of a game state under a BetAbstraction
+
+    Every child is a copy of its parent (RoundManager copies the state
+    before applying an action), so expanding a node never changes it. The
+    tree ends with the round: states whose street is FINISHED are leaves.
+
+        tree = GameTree(BetAbstraction(pot_fractions=[1]))
+        for label, child in tree.children(game_state):
+            value = search(child)
+    """
+
+    def __init__(self, bet_abstraction=None):
+        self.bet_abstraction = bet_abstraction or BetAbstraction()
+
+    def is_terminal(self, game_state):
+        return game_state["street"] == Const.Street.FINISHED
+
+    def actions(self, game_state):
+        if self.is_terminal(game_state): return []
+        return self.bet_abstraction.legal_actions(game_state)
+
+    def child(self, game_state, label):
+        concrete = self.bet_abstraction.translate(game_state, label)
+        if concrete is None: raise ValueError("%s cannot be played in this state" % label)
+        return self.__apply(game_state, *concrete)
+
+    def children(self, game_state):
+        """[(label, child_state)] for every abstract action playable in game_state"""
+        return [(label, self.__apply(game_state, action, amount))\
+                for label, action, amount in self.actions(game_state)]
+
+    def __apply(self, game_state, action, amount):
+        # the street start messages of an all-in runout are of no use to a search
+        child, _ = RoundManager.apply_action(game_state, action, amount, runout_messages=False)
+        return child
+
+def pot_raise_amount(game_state, fraction):
+    """Total street bet of a raise by fraction of the pot, after calling, for the next player"""
+    players = game_state["table"].seats.players
+    player = players[game_state["next_player"]]
+    call_amount = ActionChecker.agree_amount(players)
+    pot = sum(p.pay_info.amount for p in players)
+    to_call = call_amount - player.paid_sum()
+    return call_amount + int((pot + to_call) * fraction)
+
+def _valid_actions(game_state):
+    players = game_state["table"].seats.players
+    return ActionChecker.legal_actions(players, game_state["next_player"], game_state["small_blind_amount"])
@@ -0,0 +1,214 @@
+"""Players that run in separate bot processes
+
+A RemotePlayerPool starts worker processes once and hosts any number of
+bots in them. Its players are ordinary BasePokerPlayer objects on the
+engine side, so they work with start_poker, Dealer and Game unchanged,
+while the bots' own work runs in parallel with the engine and with each
+other.
+
+Messages travel over the workers' stdin/stdout pipes as frames: a 5 byte
+header (payload length, frame kind) followed by the payload in marshal's
+binary format. Both ends are the same interpreter (workers are started with
+sys.executable), which is what marshal needs; messages are plain dicts,
+lists, strings and numbers, and unlike JSON it keeps int dict keys and
+tuples as they were. Notifications
+are not sent one by one; they are held back and go out in the same frame
+as the next ask, so a decision costs a single round trip.
+
+    pool = RemotePlayerPool(workers=4)
+    config.register_player("fish", pool.player("examples.players.fish_player:FishPlayer"))
+    start_poker(config)
+    pool.close()
+"""
+import importlib
+import itertools
+import marshal
+import os
+import struct
+import subprocess
+import sys
+import threading
+
+from pypokerengine.players import BasePokerPlayer
+
+HEADER = struct.Struct("!IB")  # payload length, frame kind
+
+CREATE = 1  # { player, factory, args }: build a bot in the worker
+UUID = 2  # { player, uuid }
+NOTIFY = 3  # { player, messages }: notifications nobody waits for
+ASK = 4  # { player, messages, ask }: notifications so far, then the ask; answered with ACTION or ERROR
+RELEASE = 5  # { player }: drop the bot
+ACTION = 6  # { action, amount }
+ERROR = 7  # { error }
+
+class RemotePlayerError(Exception):
+  pass
+
+def write_frame(stream, kind, payload):
+  data = marshal.dumps(payload)
+  stream.write(HEADER.pack(len(data), kind) + data)
+
+def read_frame(stream):
+  """Returns (kind, payload), or (None, None) when the other side has closed the stream"""
+  header = _read_exactly(stream, HEADER.size)
+  if header is None: return None, None
+  size, kind = HEADER.unpack(header)
+  data = _read_exactly(stream, size)
+  if data is None: raise RemotePlayerError("Connection closed in the middle of a frame")
+  try:
+    return kind, marshal.loads(data)
+  except (EOFError, ValueError, TypeError):
+    raise RemotePlayerError("Frame payload is not valid")
+
+def _read_exactly(stream, size):
+  chunks, remaining = [], size
+  while remaining > 0:
+    chunk = stream.read(remaining)
+    if not chunk:
+      if remaining == size: return None
+      raise RemotePlayerError("Connection closed in the middle of a frame")
+    chunks.append(chunk)
+    remaining -= len(chunk)
+  return b"".join(chunks)
+
+def load_factory(path):
+  """"package.module:Name" => the class or function it names"""
+  module_name, _, attr = path.partition(":")
+  return getattr(importlib.import_module(module_name), attr)
+
+
+class RemotePlayer(BasePokerPlayer):
+  """Engine side stand-in for a bot living in a worker process"""
+
+  def __init__(self, connection, player_id, factory, args=()):
+    self.connection = connection
+    self.player_id = player_id
+    self.pending = []  # notifications waiting for the next ask
+    connection.send(CREATE, { "player": player_id, "factory": factory, "args": list(args) })
+
+  def set_uuid(self, uuid):
+    BasePokerPlayer.set_uuid(self, uuid)
+    self.connection.send(UUID, { "player": self.player_id, "uuid": uuid })
+
+  def respond_to_ask(self, message):
+    messages, self.pending = self.pending, []
+    kind, payload = self.connection.request(ASK, { "player": self.player_id, "messages": messages, "ask": message })
+    if kind == ERROR: raise RemotePlayerError(payload["error"])
+    return payload["action"], payload["amount"]
+
+  def receive_notification(self, message):
+    self.pending.append(message)
+
+  def flush(self):
+    """Send held back notifications now, e.g. the last round result of a game"""
+    if self.pending:
+      messages, self.pending = self.pending, []
+      self.connection.send(NOTIFY, { "player": self.player_id, "messages": messages })
+
+  def release(self):
+    self.flush()
+    self.connection.send(RELEASE, { "player": self.player_id })
+
+
+class WorkerConnection:
+  """Persistent connection to one worker process; shared by all bots placed on it"""
+
+  def __init__(self):
+    self.process = subprocess.Popen(
+        [sys.executable, "-m", "pypokerengine.api.remote"],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=self.__worker_env())
+    self.lock = threading.Lock()
+
+  def send(self, kind, payload):
+    with self.lock:
+      self.__write(kind, payload)
+
+  def request(self, kind, payload):
+    with self.lock:
+      self.__write(kind, payload)
+      kind, payload = read_frame(self.process.stdout)
+    if kind is None: raise RemotePlayerError("Worker process exited")
+    return kind, payload
+
+  def close(self):
+    with self.lock:
+      if self.process.poll() is None:
+        self.process.stdin.close()
+        self.process.wait()
+
+  def __write(self, kind, payload):
+    try:
+      write_frame(self.process.stdin, kind, payload)
+      self.process.stdin.flush()
+    except (BrokenPipeError, ValueError):
+      raise RemotePlayerError("Worker process exited")
+
+  def __worker_env(self):
+    # workers import the bots the same way this process does
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([p for p in sys.path if p] + [env.get("PYTHONPATH", "")])
+    return env
+
+
+class RemotePlayerPool:
+  """A fixed set of worker processes; bots are spread over them round robin"""
+
+  def __init__(self, workers=None):
+    self.connections = [WorkerConnection() for _ in range(workers or os.cpu_count() or 1)]
+    self.__ids = itertools.count()
+    self.__next_connection = itertools.cycle(self.connections)
+
+  def player(self, factory, *args):
+    """A player whose bot is built in a worker by calling factory(*args); factory is "module:Name" """
+    return RemotePlayer(next(self.__next_connection), next(self.__ids), factory, args)
+
+  def close(self):
+    for connection in self.connections:
+      connection.close()
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *exc_info):
+    self.close()
+
+
+def serve(stdin, stdout):
+  """Worker loop: host bots and answer asks until stdin is closed"""
+  bots = {}
+  while True:
+    kind, payload = read_frame(stdin)
+    if kind is None: return
+    if kind == CREATE:
+      try:
+        bots[payload["player"]] = load_factory(payload["factory"])(*payload["args"])
+      except Exception as e:
+        bots[payload["player"]] = e  # reported on the first ask
+    elif kind == UUID:
+      bot = bots.get(payload["player"])
+      if isinstance(bot, BasePokerPlayer): bot.set_uuid(payload["uuid"])
+    elif kind == RELEASE:
+      bots.pop(payload["player"], None)
+    elif kind in (NOTIFY, ASK):
+      bot = bots.get(payload["player"])
+      try:
+        if not isinstance(bot, BasePokerPlayer):
+          raise RemotePlayerError("Bot could not be created: %s" % bot)
+        for message in payload["messages"]:
+          bot.receive_notification(message)
+        if kind == ASK:
+          action, amount = bot.respond_to_ask(payload["ask"])
+          write_frame(stdout, ACTION, { "action": action, "amount": amount })
+      except Exception as e:
+        if kind == ASK: write_frame(stdout, ERROR, { "error": "%s: %s" % (type(e).__name__, e) })
+      stdout.flush()
+
+def main():
+  # The protocol owns the real stdout; anything the bots print goes to stderr
+  stdout = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+  os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+  sys.stdout = sys.stderr
+  serve(sys.stdin.buffer, stdout)
+
+if __name__ == "__main__":
+  main()
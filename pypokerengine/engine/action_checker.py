@@ -1,5 +1,7 @@
 from functools import reduce
 
+from pypokerengine.engine.action_record import ActionRecord
+
 class ActionChecker:
 
   @classmethod
@@ -78,9 +80,12 @@ class ActionChecker:
 
   @classmethod
   def __fetch_last_raise(self, players):
+    log = players[0]._log if players else None
+    if log is not None and all(p._log is log for p in players):
+      return log.last_raise()  # seated players share the table's log, which keeps the highest raise
     all_histories = [p.action_histories for p in players]
     all_histories = reduce(lambda acc, e: acc + e, all_histories)  # flatten
-    raise_histories = [h for h in all_histories if h["action"] in ["RAISE", "SMALLBLIND", "BIGBLIND"]]
+    raise_histories = [h for h in all_histories if h.kind in ActionRecord.RAISING]
     if len(raise_histories) == 0:
       return None
     else:
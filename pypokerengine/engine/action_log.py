@@ -0,0 +1,183 @@
+from array import array
+
+from pypokerengine.engine.action_record import ActionRecord
+from pypokerengine.engine import zobrist
+
+class ActionLog:
+  """Every action of the round, in the order it was taken
+
+  The players at a table share one log. An entry is a row across parallel
+  arrays (seat, street, action code, amount, add_amount, paid), appended
+  and never moved, so there is exactly one chronological order and message
+  encoding reads it front to back. Per-player and per-street views
+  (Player.action_histories, round_action_histories) are built from the
+  rows when asked for.
+
+  Streets before `street` are finished. For the current one the log keeps
+  what each seat has put in (`street_paid`), each seat's rows and the
+  highest raise (last_raise), so the per-action checks never scan the
+  whole log.
+
+  sequence_hash() is an order sensitive 64 bit hash of the rows (see
+  zobrist). It is extended over the rows appended since it was last asked
+  for and travels with serialize(), so keeping it costs O(1) per action
+  however many times the log is copied.
+  """
+
+  def __init__(self):
+    self.clear()
+
+  def clear(self):
+    self.street = 0
+    self.seats, self.streets, self.kinds = array("b"), array("b"), array("b")
+    self.amounts, self.add_amounts, self.paids = array("q"), array("q"), array("q")
+    self.__reset_street_index()
+    self.__reset_hash()
+
+  def __len__(self):
+    return len(self.kinds)
+
+  def append(self, seat, kind, amount=None, add_amount=None, paid=None, street=None):
+    street = self.street if street is None else street
+    amount, add_amount, paid = amount or 0, add_amount or 0, paid or 0
+    row = len(self.kinds)
+    if type(self.amounts) is array and not self.__all_int(amount, add_amount, paid):
+      self.__widen()
+    self.seats.append(seat)
+    self.streets.append(street)
+    self.kinds.append(kind)
+    self.amounts.append(amount)
+    self.add_amounts.append(add_amount)
+    self.paids.append(paid)
+    if street == self.street: self.__index_row(row)
+
+  def append_record(self, seat, record, street=None):
+    self.append(seat, record.kind, record.amount, record.add_amount, record.paid, street)
+
+  def close_street(self, street):
+    if street >= self.street:
+      self.street = street + 1
+      self.__reset_street_index()
+
+  def count(self, seat, street):
+    return len(self.__rows(seat, street))
+
+  def record(self, row, uuid=None):
+    kind = self.kinds[row]
+    fields = ActionRecord.FIELDS[kind]
+    return ActionRecord(kind,
+        self.amounts[row] if "amount" in fields else None,
+        self.add_amounts[row] if "add_amount" in fields else None,
+        self.paids[row] if "paid" in fields else None,
+        uuid)
+
+  def last_raise(self):
+    """The highest raise (or blind) of the current street, or None"""
+    return None if self._last_raise is None else self.record(self._last_raise)
+
+  def records(self, seat, street, uuid=None):
+    return [self.record(row, uuid) for row in self.__rows(seat, street)]
+
+  def to_dicts(self, street, uuids):
+    """The street's actions as message dicts, in the order they were taken"""
+    build, seats, kinds = ActionRecord.build_dict, self.seats, self.kinds
+    amounts, add_amounts, paids = self.amounts, self.add_amounts, self.paids
+    return [build(kinds[row], amounts[row], add_amounts[row], paids[row], uuids[seats[row]])\
+        for row in self.__rows(None, street)]
+
+  def replace(self, seat, street, records):
+    """Drop seat's entries on street and append records in their place"""
+    keep = [row for row in range(len(self)) if self.seats[row] != seat or self.streets[row] != street]
+    if len(keep) != len(self):
+      for name in self.__columns:
+        column = getattr(self, name)
+        kept = [column[row] for row in keep]
+        setattr(self, name, array(column.typecode, kept) if type(column) is array else kept)
+      self.__index_street()  # rows moved
+      self.__reset_hash()
+    for record in records:
+      self.append_record(seat, record, street)
+
+  def merge(self, other, seat_map):
+    """Append other's entries of the seats in seat_map (old seat => new seat), keeping their order"""
+    if other.street > self.street:
+      self.street = other.street
+      self.__reset_street_index()
+    for row in range(len(other)):
+      seat = other.seats[row]
+      if seat in seat_map:
+        self.append(seat_map[seat], other.kinds[row], other.amounts[row], other.add_amounts[row],
+            other.paids[row], other.streets[row])
+
+  def sequence_hash(self):
+    h = self._sequence_hash
+    seats, streets, kinds = self.seats, self.streets, self.kinds
+    amounts, add_amounts, paids = self.amounts, self.add_amounts, self.paids
+    for row in range(self._hashed_rows, len(kinds)):
+      h = zobrist.chain(h, zobrist.action_key(seats[row], streets[row], kinds[row],\
+          amounts[row], add_amounts[row], paids[row]))
+    self._sequence_hash, self._hashed_rows = h, len(kinds)
+    return h
+
+  def serialize(self):
+    # the trailing sequence hash is optional; a log deserialized without it is rehashed when asked
+    return [self.street] + [getattr(self, name).tolist() if type(getattr(self, name)) is array\
+        else getattr(self, name)[::] for name in self.__columns] + [self.sequence_hash()]
+
+  @classmethod
+  def deserialize(self, serial):
+    log = self()
+    log.street = serial[0]
+    log.seats, log.streets, log.kinds = array("b", serial[1]), array("b", serial[2]), array("b", serial[3])
+    amounts = serial[4:7]
+    if all(self.__all_int(*column) for column in amounts):
+      log.amounts, log.add_amounts, log.paids = [array("q", column) for column in amounts]
+    else:
+      log.amounts, log.add_amounts, log.paids = [list(column) for column in amounts]
+    log.__index_street()
+    if len(serial) > 7: log._hashed_rows, log._sequence_hash = len(log), serial[7]
+    return log
+
+  def __reduce__(self):
+    return (self.__class__.deserialize, (self.serialize(),))
+
+  """ private """
+
+  __columns = ("seats", "streets", "kinds", "amounts", "add_amounts", "paids")
+
+  def __rows(self, seat, street):
+    if street == self.street and seat is not None:
+      return self.street_rows.get(seat, [])[::]
+    if seat is None:
+      return [row for row, s in enumerate(self.streets) if s == street]
+    return [row for row, (s, p) in enumerate(zip(self.streets, self.seats)) if s == street and p == seat]
+
+  @staticmethod
+  def __all_int(*values):
+    return all(type(value) is int for value in values)
+
+  def __reset_street_index(self):
+    self.street_paid = {}  # seat => amount paid on the current street
+    self.street_rows = {}  # seat => its rows on the current street
+    self._last_raise = None  # row of the highest raise on the current street
+
+  def __index_street(self):
+    self.__reset_street_index()
+    for row, street in enumerate(self.streets):
+      if street == self.street: self.__index_row(row)
+
+  def __index_row(self, row):
+    seat, kind, amount = self.seats[row], self.kinds[row], self.amounts[row]
+    self.street_rows.setdefault(seat, []).append(row)
+    if kind in ActionRecord.PAYING:
+      self.street_paid[seat] = amount
+    if kind in ActionRecord.RAISING and (self._last_raise is None or amount > self.amounts[self._last_raise]):
+      self._last_raise = row
+
+  def __reset_hash(self):
+    self._hashed_rows, self._sequence_hash = 0, 0
+
+  def __widen(self):
+    # chip amounts are ints in the engine, but nothing stops a bot or a restored
+    # message from using floats; those rows are kept exactly in plain lists
+    self.amounts, self.add_amounts, self.paids = list(self.amounts), list(self.add_amounts), list(self.paids)
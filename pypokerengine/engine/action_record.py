@@ -0,0 +1,110 @@
+from pypokerengine.engine.poker_constants import PokerConstants as Const
+
+class ActionRecord(object):
+  """One entry of Player.action_histories
+
+  A fixed layout record with an integer action code (Const.Action) instead
+  of a dict keyed by strings. It still reads like the dict it replaced
+  (record["action"] == "CALL", record["paid"]), and to_dict() builds that
+  dict when a message is encoded. Records are never changed once added, so
+  copies of a player share them.
+  """
+
+  __slots__ = ("kind", "amount", "add_amount", "paid", "uuid")
+
+  NAMES = {
+      Const.Action.FOLD: "FOLD",
+      Const.Action.CALL: "CALL",
+      Const.Action.RAISE: "RAISE",
+      Const.Action.SMALL_BLIND: "SMALLBLIND",
+      Const.Action.BIG_BLIND: "BIGBLIND",
+      Const.Action.ANTE: "ANTE"
+  }
+  CODES = { name: code for code, name in NAMES.items() }
+
+  # fields each kind of record has, in the order of the old dicts
+  FIELDS = {
+      Const.Action.FOLD: (),
+      Const.Action.CALL: ("amount", "paid"),
+      Const.Action.RAISE: ("amount", "paid", "add_amount"),
+      Const.Action.SMALL_BLIND: ("amount", "add_amount"),
+      Const.Action.BIG_BLIND: ("amount", "add_amount"),
+      Const.Action.ANTE: ("amount",)
+  }
+
+  # kinds whose amount is what the player has put in on the street so far
+  PAYING = frozenset([Const.Action.CALL, Const.Action.RAISE, Const.Action.SMALL_BLIND, Const.Action.BIG_BLIND])
+  RAISING = frozenset([Const.Action.RAISE, Const.Action.SMALL_BLIND, Const.Action.BIG_BLIND])
+
+  def __init__(self, kind, amount=None, add_amount=None, paid=None, uuid=None):
+    self.kind = kind
+    self.amount = amount
+    self.add_amount = add_amount
+    self.paid = paid
+    self.uuid = uuid
+
+  def to_dict(self):
+    return self.build_dict(self.kind, self.amount, self.add_amount, self.paid, self.uuid)
+
+  @classmethod
+  def build_dict(self, kind, amount, add_amount, paid, uuid):
+    """The message dict of a record, without building the record; fields the kind lacks are ignored"""
+    if kind == Const.Action.CALL:
+      record = { "action": "CALL", "amount": amount, "paid": paid }
+    elif kind == Const.Action.RAISE:
+      record = { "action": "RAISE", "amount": amount, "paid": paid, "add_amount": add_amount }
+    elif kind == Const.Action.FOLD:
+      record = { "action": "FOLD" }
+    elif kind == Const.Action.ANTE:
+      record = { "action": "ANTE", "amount": amount }
+    else:
+      record = { "action": self.NAMES[kind], "amount": amount, "add_amount": add_amount }
+    if uuid is not None: record["uuid"] = uuid
+    return record
+
+  @classmethod
+  def from_dict(self, record):
+    return self(self.CODES[record["action"]], record.get("amount"), record.get("add_amount"),
+        record.get("paid"), record.get("uuid"))
+
+  def __getitem__(self, key):
+    if key == "action": return self.NAMES[self.kind]
+    if key in self.FIELDS[self.kind] or (key == "uuid" and self.uuid is not None):
+      return getattr(self, key)
+    raise KeyError(key)
+
+  def get(self, key, default=None):
+    try:
+      return self[key]
+    except KeyError:
+      return default
+
+  def __contains__(self, key):
+    return key == "action" or key in self.FIELDS[self.kind] or (key == "uuid" and self.uuid is not None)
+
+  def keys(self):
+    return self.to_dict().keys()
+
+  def __eq__(self, other):
+    if isinstance(other, ActionRecord): return self.__key() == other.__key()
+    if isinstance(other, dict): return self.to_dict() == other
+    return NotImplemented
+
+  def __ne__(self, other):
+    result = self.__eq__(other)
+    return result if result is NotImplemented else not result
+
+  def __hash__(self):
+    return hash(self.__key())
+
+  def __repr__(self):
+    return repr(self.to_dict())
+
+  def __getstate__(self):
+    return self.__key()
+
+  def __setstate__(self, state):
+    self.kind, self.amount, self.add_amount, self.paid, self.uuid = state
+
+  def __key(self):
+    return (self.kind, self.amount, self.add_amount, self.paid, self.uuid)
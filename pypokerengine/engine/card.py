@@ -36,6 +36,9 @@ class Card:
   def __eq__(self, other):
     return self.suit == other.suit and self.rank == other.rank
 
+  def __reduce__(self):
+    return (Card, (self.suit, self.rank))
+
   def __str__(self):
     suit = self.SUIT_MAP[self.suit]
     rank = self.RANK_MAP[self.rank]
@@ -1,5 +1,3 @@
-from functools import reduce
-
 from pypokerengine.engine.pay_info import PayInfo
 from pypokerengine.engine.poker_constants import PokerConstants as Const
 from pypokerengine.engine.game_evaluator import GameEvaluator
@@ -79,13 +77,11 @@ class DataEncoder:
 
   @classmethod
   def encode_action_histories(self, table):
-    all_street_histories = [[player.round_action_histories[street] for player in table.seats.players] for street in range(4)]
-    past_street_histories = [histories for histories in all_street_histories if any([e is not None for e in histories])]
-    current_street_histories = [player.action_histories for player in table.seats.players]
-    street_histories = past_street_histories + [current_street_histories]
-    street_histories = [self.__order_histories(table.sb_pos(), histories) for histories in street_histories]
+    log = table.seats.action_log
+    uuids = [player.uuid for player in table.seats.players]
     street_name = ["preflop", "flop", "turn", "river"]
-    action_histories = { name:histories for name, histories in zip(street_name, street_histories) }
+    # finished streets and the current one; histories are in the order the actions were taken
+    action_histories = { name:log.to_dicts(street, uuids) for street, name in zip(range(log.street+1), street_name) }
     return { "action_histories": action_histories }
 
   @classmethod
@@ -136,19 +132,4 @@ class DataEncoder:
   def __encode_players(self, players):
     return [self.encode_player(player) for player in players]
 
-  @classmethod
-  def __order_histories(self, start_pos, player_histories):
-    ordered_player_histories = [player_histories[(start_pos+i)%len(player_histories)] for i in range(len(player_histories))]
-    all_player_histories = [histories[::] for histories in ordered_player_histories]
-    max_len = max([len(h) for h in all_player_histories])
-    unified_histories = [self.__unify_length(max_len, l) for l in all_player_histories]
-    ordered_histories = reduce(lambda acc, zp: acc + list(zp), zip(*unified_histories), [])
-    return [history for history in ordered_histories if not history is None]
-
-  @classmethod
-  def __unify_length(self, max_len, lst):
-    for _ in range(max_len-len(lst)):
-      lst.append(None)
-    return lst
-
 
@@ -1,4 +1,8 @@
+import asyncio
+import inspect
 import random
+import threading
+import time
 from collections import OrderedDict
 
 from pypokerengine.engine.poker_constants import PokerConstants as Const
@@ -18,6 +22,16 @@ class Dealer:
     self.message_summarizer = MessageSummarizer(verbose=0)
     self.table = Table()
     self.blind_structure = {}
+    self.decision_timer = None
+    self.runout_messages = True
+
+  def set_decision_time(self, decision_time, time_bank=0):
+    """Limit every decision to decision_time seconds plus whatever is left of the player's time bank"""
+    self.decision_timer = DecisionTimer(decision_time, time_bank)
+
+  def set_runout_messages(self, enabled):
+    """With False, streets dealt after everyone is all-in send no street start message"""
+    self.runout_messages = enabled
 
   def register_player(self, player_name, algorithm):
     self.__config_check()
@@ -30,23 +44,22 @@ class Dealer:
 
   def start_game(self, max_round):
     table = self.table
-    self.__notify_game_start(max_round)
+    self.message_handler.process_message(-1, self._build_game_start_message(max_round))
     ante, sb_amount = self.ante, self.small_blind_amount
     for round_count in range(1, max_round+1):
-      ante, sb_amount = self.__update_forced_bet_amount(ante, sb_amount, round_count, self.blind_structure)
-      table = self.__exclude_short_of_money_players(table, ante, sb_amount)
-      if self.__is_game_finished(table): break
+      ante, sb_amount, table = self._prepare_round(round_count, ante, sb_amount, table)
+      if self._is_game_finished(table): break
       table = self.play_round(round_count, sb_amount, ante, table)
       table.shift_dealer_btn()
-    return self.__generate_game_result(max_round, table.seats)
+    return self._generate_game_result(max_round, table.seats)
 
   def play_round(self, round_count, blind_amount, ante, table):
-    state, msgs = RoundManager.start_new_round(round_count, blind_amount, ante, table)
+    state, msgs = RoundManager.start_new_round(round_count, blind_amount, ante, table, self.runout_messages)
     while True:
-      self.__message_check(msgs, state["street"])
+      self._message_check(msgs, state["street"])
       if state["street"] != Const.Street.FINISHED:  # continue the round
         action, bet_amount = self.__publish_messages(msgs)
-        state, msgs = RoundManager.apply_action(state, action, bet_amount)
+        state, msgs = RoundManager.apply_action(state, action, bet_amount, self.runout_messages)
       else:  # finish the round after publish round result
         self.__publish_messages(msgs)
         break
@@ -80,16 +93,21 @@ class Dealer:
     self.table.seats.sitdown(player)
     return uuid
 
-  def __notify_game_start(self, max_round):
+  def _build_game_start_message(self, max_round):
     config = self.__gen_config(max_round)
     start_msg = MessageBuilder.build_game_start_message(config, self.table.seats)
-    self.message_handler.process_message(-1, start_msg)
     self.message_summarizer.summarize(start_msg)
+    return start_msg
 
-  def __is_game_finished(self, table):
+  def _prepare_round(self, round_count, ante, sb_amount, table):
+    ante, sb_amount = self.__update_forced_bet_amount(ante, sb_amount, round_count, self.blind_structure)
+    table = self.__exclude_short_of_money_players(table, ante, sb_amount)
+    return ante, sb_amount, table
+
+  def _is_game_finished(self, table):
     return len([player for player in  table.seats.players if player.is_active()]) == 1
 
-  def __message_check(self, msgs, street):
+  def _message_check(self, msgs, street):
     address, msg = msgs[-1]
     invalid = msg["type"] != 'ask'
     invalid &= street != Const.Street.FINISHED or msg["message"]["message_type"] == 'round_result'
@@ -98,9 +116,17 @@ class Dealer:
 
   def __publish_messages(self, msgs):
     for address, msg in msgs[:-1]:
-      self.message_handler.process_message(address, msg)
+      self.__notify(address, msg)
     self.message_summarizer.summarize_messages(msgs)
-    return self.message_handler.process_message(*msgs[-1])
+    address, msg = msgs[-1]
+    if self.decision_timer and msg["type"] == 'ask':
+      return self.decision_timer.ask(self.message_handler, address, msg)
+    return self.__notify(address, msg)
+
+  def __notify(self, address, msg):
+    if self.decision_timer and msg["type"] == 'notification':
+      return self.decision_timer.notify(self.message_handler, address, msg)
+    return self.message_handler.process_message(address, msg)
 
   def __exclude_short_of_money_players(self, table, ante, sb_amount):
     sb_pos, bb_pos = self.__steal_money_from_poor_player(table, ante, sb_amount)
@@ -115,14 +141,13 @@ class Dealer:
     for player in [p for p in players if p.stack < ante]: player.stack = 0
     if players[table.dealer_btn].stack == 0: table.shift_dealer_btn()
 
-    search_targets = players + players + players
-    search_targets = search_targets[table.dealer_btn+1:table.dealer_btn+1+len(players)]
+    search_targets = table.seats.players_after(table.dealer_btn)
     # exclude player who cannot pay small blind
     sb_player = self.__find_first_elligible_player(search_targets, sb_amount + ante)
     sb_relative_pos = search_targets.index(sb_player)
     for player in search_targets[:sb_relative_pos]: player.stack = 0
     # exclude player who cannot pay big blind
-    search_targets = search_targets[sb_relative_pos+1:sb_relative_pos+len(players)]
+    search_targets = search_targets[sb_relative_pos+1:]
     bb_player = self.__find_first_elligible_player(search_targets, sb_amount*2 + ante, sb_player)
     if sb_player == bb_player:  # no one can pay big blind. So steal money from all players except small blind
         for player in [p for p in players if p!=bb_player]: player.stack = 0
@@ -141,7 +166,7 @@ class Dealer:
     for player in no_money_players:
       player.pay_info.update_to_fold()
 
-  def __generate_game_result(self, max_round, seats):
+  def _generate_game_result(self, max_round, seats):
     config = self.__gen_config(max_round)
     result_message = MessageBuilder.build_game_result_message(config, seats)
     self.message_summarizer.summarize(result_message)
@@ -185,7 +210,7 @@ class MessageHandler:
     self.algo_owner_map[uuid] = algorithm
 
   def process_message(self, address, msg):
-    receivers = self.__fetch_receivers(address)
+    receivers = self._fetch_receivers(address)
     for receiver in receivers:
       if msg["type"] == 'ask':
         return receiver.respond_to_ask(msg["message"])
@@ -195,7 +220,7 @@ class MessageHandler:
         raise ValueError("Received unexpected message which type is [%s]" % msg["type"])
 
 
-  def __fetch_receivers(self, address):
+  def _fetch_receivers(self, address):
     if address == -1:
       return self.algo_owner_map.values()
     else:
@@ -203,6 +228,185 @@ class MessageHandler:
         raise ValueError("Received message its address [%s] is unknown" % address)
       return [self.algo_owner_map[address]]
 
+class AsyncDealer(Dealer):
+  """Dealer whose game loop is a coroutine, so one event loop can run many games.
+
+  Players may be AsyncPokerPlayer (their hooks are awaited) or ordinary BasePokerPlayer
+  (called directly, which is fine for local bots that answer without waiting).
+  """
+
+  def __init__(self, small_blind_amount=None, initial_stack=None, ante=None):
+    Dealer.__init__(self, small_blind_amount, initial_stack, ante)
+    self.message_handler = AsyncMessageHandler()
+
+  async def start_game(self, max_round):
+    table = self.table
+    await self.message_handler.process_message(-1, self._build_game_start_message(max_round))
+    ante, sb_amount = self.ante, self.small_blind_amount
+    for round_count in range(1, max_round+1):
+      ante, sb_amount, table = self._prepare_round(round_count, ante, sb_amount, table)
+      if self._is_game_finished(table): break
+      table = await self.play_round(round_count, sb_amount, ante, table)
+      table.shift_dealer_btn()
+    return self._generate_game_result(max_round, table.seats)
+
+  async def play_round(self, round_count, blind_amount, ante, table):
+    state, msgs = RoundManager.start_new_round(round_count, blind_amount, ante, table, self.runout_messages)
+    while True:
+      self._message_check(msgs, state["street"])
+      if state["street"] != Const.Street.FINISHED:  # continue the round
+        action, bet_amount = await self.__publish_messages(msgs)
+        state, msgs = RoundManager.apply_action(state, action, bet_amount, self.runout_messages)
+      else:  # finish the round after publish round result
+        await self.__publish_messages(msgs)
+        break
+    return state["table"]
+
+  async def __publish_messages(self, msgs):
+    for address, msg in msgs[:-1]:
+      await self.message_handler.process_message(address, msg)
+    self.message_summarizer.summarize_messages(msgs)
+    address, msg = msgs[-1]
+    if self.decision_timer and msg["type"] == 'ask':
+      return await self.decision_timer.ask_async(self.message_handler, address, msg)
+    return await self.message_handler.process_message(address, msg)
+
+class DecisionTimer:
+  """Enforces decision deadlines and time banks, and keeps timing stats per player
+
+  A player has decision_time seconds for every decision, plus a time bank
+  which pays for the time spent beyond that and is not refilled. When both
+  run out the player checks if that is free and folds otherwise, and the
+  game goes on. A late answer is ignored.
+
+  A player that timed out is stalled until its late answer comes back: it
+  is not asked again meanwhile (it gets the default action right away), and
+  its notifications are queued and delivered by the late thread once it has
+  returned, so there is never more than one thread inside a player. That also
+  keeps the dealer off a stalled RemotePlayer's worker connection. With
+  decision_time None the player is asked directly and only the stats are kept.
+  """
+
+  def __init__(self, decision_time, time_bank=0):
+    self.decision_time = decision_time
+    self.time_bank = time_bank
+    self.banks = {}  # uuid => seconds left in the time bank
+    self.stats = {}  # uuid => {"decisions", "timeouts", "total_time", "max_time"}
+    self.stalled = {}  # uuid => thread still answering a decision that timed out
+    self.backlog = {}  # uuid => notifications held back while the player is stalled
+    self.lock = threading.Lock()  # guards stalled and backlog against the late threads
+
+  def time_limit(self, uuid):
+    if self.decision_time is None: return None
+    return self.decision_time + self.banks.setdefault(uuid, self.time_bank)
+
+  def is_stalled(self, uuid):
+    with self.lock:
+      return uuid in self.stalled
+
+  def notify(self, message_handler, address, msg):
+    """Deliver a notification, holding it back for stalled receivers"""
+    with self.lock:
+      if not self.stalled:
+        held = []
+      elif address == -1:
+        held = list(self.stalled)
+      else:
+        held = [address] if address in self.stalled else []
+      for uuid in held:
+        self.backlog.setdefault(uuid, []).append(msg)
+    if not held:
+      return message_handler.process_message(address, msg)
+    for uuid in (message_handler.algo_owner_map if address == -1 else [address]):
+      if uuid not in held:
+        message_handler.process_message(uuid, msg)
+
+  def ask(self, message_handler, address, msg):
+    limit, start = self.time_limit(address), time.monotonic()
+    if limit is None:
+      action = message_handler.process_message(address, msg)
+      self.__record(address, time.monotonic() - start, False)
+      return action
+    if self.is_stalled(address):
+      self.__record(address, 0, True)
+      return self.default_action(msg)
+    answer = {}
+    def respond():
+      try:
+        answer["action"] = message_handler.process_message(address, msg)
+      except Exception as e:
+        answer["error"] = e
+      finally:
+        self.__catch_up(message_handler, address, worker)
+    # daemon thread: a player which never answers must not keep the process alive
+    worker = threading.Thread(target=respond, daemon=True)
+    worker.start()
+    worker.join(limit)
+    with self.lock:
+      timed_out = not answer
+      if timed_out: self.stalled[address] = worker
+    if "error" in answer: raise answer["error"]
+    self.__record(address, time.monotonic() - start, timed_out)
+    return self.default_action(msg) if timed_out else answer["action"]
+
+  async def ask_async(self, message_handler, address, msg):
+    # wait_for cancels a late coroutine, so nothing is left running in the player
+    limit, start = self.time_limit(address), time.monotonic()
+    try:
+      action = await asyncio.wait_for(message_handler.process_message(address, msg), limit)
+      timed_out = False
+    except asyncio.TimeoutError:
+      action, timed_out = self.default_action(msg), True
+    self.__record(address, time.monotonic() - start, timed_out)
+    return action
+
+  def default_action(self, msg):
+    call_action_info = msg["message"]["valid_actions"][1]
+    if call_action_info["amount"] == 0: return call_action_info["action"], 0
+    return "fold", 0
+
+  def __catch_up(self, message_handler, uuid, worker):
+    # runs on the late thread: hand over what was held back, then clear the stall
+    while True:
+      with self.lock:
+        if self.stalled.get(uuid) is not worker: return
+        held = self.backlog.pop(uuid, [])
+        if not held:
+          del self.stalled[uuid]
+          return
+      for msg in held:
+        try:
+          message_handler.process_message(uuid, msg)
+        except Exception:
+          pass  # nobody is waiting on a late player; its answer is already ignored
+
+  def __record(self, uuid, elapsed, timed_out):
+    if self.decision_time is not None:
+      elapsed = min(elapsed, self.time_limit(uuid))
+      self.banks[uuid] = max(0, self.banks[uuid] - max(0, elapsed - self.decision_time))
+    stats = self.stats.setdefault(uuid, { "decisions": 0, "timeouts": 0, "total_time": 0, "max_time": 0 })
+    stats["decisions"] += 1
+    stats["timeouts"] += 1 if timed_out else 0
+    stats["total_time"] += elapsed
+    stats["max_time"] = max(stats["max_time"], elapsed)
+
+class AsyncMessageHandler(MessageHandler):
+
+  async def process_message(self, address, msg):
+    receivers = self._fetch_receivers(address)
+    if msg["type"] == 'ask':
+      for receiver in receivers:
+        return await self.__resolve(receiver.respond_to_ask(msg["message"]))
+    elif msg["type"] == 'notification':
+      # every receiver gets the notification at once, so one slow client does not hold up the others
+      results = [receiver.receive_notification(msg["message"]) for receiver in receivers]
+      await asyncio.gather(*[result for result in results if inspect.isawaitable(result)])
+    else:
+      raise ValueError("Received unexpected message which type is [%s]" % msg["type"])
+
+  async def __resolve(self, result):
+    return await result if inspect.isawaitable(result) else result
+
 class MessageSummarizer(object):
 
     def __init__(self, verbose):
@@ -8,7 +8,7 @@ class Deck:
   def __init__(self, deck_ids=None, cheat=False, cheat_card_ids=[]):
     self.cheat = cheat
     self.cheat_card_ids = cheat_card_ids
-    self.deck = [Card.from_id(cid) for cid in deck_ids] if deck_ids else self.__setup()
+    self.deck = [Card.from_id(cid) for cid in deck_ids] if deck_ids is not None else self.__setup()
 
   def draw_card(self):
     return self.deck.pop()
@@ -35,6 +35,9 @@ class Deck:
     cheat, cheat_card_ids, deck_ids = serial
     return self(deck_ids=deck_ids, cheat=cheat, cheat_card_ids=cheat_card_ids)
 
+  def __reduce__(self):
+    return (self.__class__.deserialize, (self.serialize(),))
+
   def __setup(self):
     return self.__setup_cheat_deck() if self.cheat else self.__setup_52_cards()
 
@@ -1,12 +1,36 @@
 class PayInfo:
 
+  __slots__ = ("_amount", "_status", "_owner")
+
   PAY_TILL_END = 0
   ALLIN  = 1
   FOLDED = 2
 
   def __init__(self, amount=0, status=0):
-    self.amount = amount
-    self.status = status
+    self._amount = amount
+    self._status = status
+    self._owner = None  # Player to tell about changes
+
+  @property
+  def amount(self):
+    return self._amount
+
+  @amount.setter
+  def amount(self, amount):
+    self._amount = amount
+    if self._owner is not None: self._owner._seat_changed()
+
+  @property
+  def status(self):
+    return self._status
+
+  @status.setter
+  def status(self, status):
+    self._status = status
+    if self._owner is not None: self._owner._seat_changed()
+
+  def __reduce__(self):
+    return (PayInfo, (self.amount, self.status))
 
   def update_by_pay(self, amount):
     self.amount += amount
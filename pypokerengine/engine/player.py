@@ -1,10 +1,14 @@
 from pypokerengine.engine.pay_info import PayInfo
 from pypokerengine.engine.card import Card
+from pypokerengine.engine.action_record import ActionRecord
+from pypokerengine.engine.action_log import ActionLog
 from pypokerengine.engine.poker_constants import PokerConstants as Const
 
 
 class Player:
 
+  __slots__ = ("name", "uuid", "_hole_card", "_stack", "_log", "_pay_info", "_seats", "_seat_pos")
+
   ACTION_FOLD_STR = "FOLD"
   ACTION_CALL_STR = "CALL"
   ACTION_RAISE_STR = "RAISE"
@@ -13,14 +17,68 @@ class Player:
   ACTION_ANTE = "ANTE"
 
   def __init__(self, uuid, initial_stack, name="No Name"):
+    self._seats, self._seat_pos = None, 0  # set by Seats, which keeps bitmasks of its players
+    self._log = ActionLog()  # replaced by the table's log when the player sits down
     self.name = name
     self.uuid = uuid
-    self.hole_card = []
+    self._hole_card = []
     self.stack = initial_stack
-    self.round_action_histories = self.__init_round_action_histories()
-    self.action_histories = []
     self.pay_info = PayInfo()
 
+  @property
+  def stack(self):
+    return self._stack
+
+  @stack.setter
+  def stack(self, stack):
+    self._stack = stack
+    if self._seats is not None: self._seats._update_seat(self)
+
+  @property
+  def hole_card(self):
+    return self._hole_card
+
+  @hole_card.setter
+  def hole_card(self, hole_card):
+    self._hole_card = hole_card
+    if self._seats is not None: self._seats._update_seat(self)
+
+  @property
+  def action_histories(self):
+    return self._log.records(self._seat_pos, self._log.street, self.uuid)
+
+  @action_histories.setter
+  def action_histories(self, action_histories):
+    self._log.replace(self._seat_pos, self._log.street, self.__to_records(action_histories))
+    if self._seats is not None: self._seats._histories_replaced()
+
+  @property
+  def round_action_histories(self):
+    log = self._log
+    return [log.records(self._seat_pos, street, self.uuid) if street < log.street else None\
+        for street in range(4)]  # 4 == len(["preflop", "flop", "turn", "river"])
+
+  @round_action_histories.setter
+  def round_action_histories(self, round_action_histories):
+    for street, histories in enumerate(round_action_histories):
+      if histories is None: continue
+      self._log.close_street(street)
+      self._log.replace(self._seat_pos, street, self.__to_records(histories))
+    if self._seats is not None: self._seats._histories_replaced()
+
+  @property
+  def pay_info(self):
+    return self._pay_info
+
+  @pay_info.setter
+  def pay_info(self, pay_info):
+    self._pay_info = pay_info
+    pay_info._owner = self
+    if self._seats is not None: self._seats._update_seat(self)
+
+  def _seat_changed(self):
+    if self._seats is not None: self._seats._update_seat(self)
+
   def add_holecard(self, cards):
     if len(self.hole_card) != 0:
       raise ValueError(self.__dup_hole_msg)
@@ -63,30 +121,34 @@ class Player:
       history = self.__ante_history(chip_amount)
     else:
       raise "UnKnown action history is added (kind = %s)" % kind
-    history = self.__add_uuid_on_history(history)
-    self.action_histories.append(history)
+    self._log.append_record(self._seat_pos, history)
+    if self._seats is not None: self._seats._paid_changed(self)
 
   def save_street_action_histories(self, street_flg):
-    self.round_action_histories[street_flg] = self.action_histories
-    self.action_histories = []
+    # the log is shared with the table, so this closes the street for everyone
+    self._log.close_street(street_flg)
+    if self._seats is not None: self._seats._histories_replaced()
 
   def clear_action_histories(self):
-    self.round_action_histories = self.__init_round_action_histories()
-    self.action_histories = []
+    self._log.clear()
+    if self._seats is not None: self._seats._histories_replaced()
 
   def clear_pay_info(self):
     self.pay_info = PayInfo()
 
   def paid_sum(self):
-    pay_history = [h for h in self.action_histories if h["action"] not in ["FOLD", "ANTE"]]
-    last_pay_history = pay_history[-1] if len(pay_history)!=0 else None
-    return last_pay_history["amount"] if last_pay_history else 0
+    return self._log.street_paid.get(self._seat_pos, 0)
 
-  def serialize(self):
+  def serialize(self, histories=True):
+    """histories=False leaves out the action histories; Seats serializes its log on its own"""
     hole = [card.to_id() for card in self.hole_card]
+    # the serial form is plain data (pickle, JSON), so the records go out as dicts
+    round_histories = [[record.to_dict() for record in street] if street is not None else None\
+        for street in self.round_action_histories] if histories else [None]*4
     return [
         self.name, self.uuid, self.stack, hole,\
-            self.action_histories[::], self.pay_info.serialize(), self.round_action_histories[::]
+            [record.to_dict() for record in self.action_histories] if histories else [],\
+            self.pay_info.serialize(), round_histories
     ]
 
   @classmethod
@@ -94,11 +156,15 @@ class Player:
     hole = [Card.from_id(cid) for cid in serial[3]]
     player = self(serial[1], serial[2], serial[0])
     if len(hole)!=0: player.add_holecard(hole)
-    player.action_histories = serial[4]
     player.pay_info = PayInfo.deserialize(serial[5])
-    player.round_action_histories = serial[6]
+    if any(histories is not None for histories in serial[6]): player.round_action_histories = serial[6]
+    if serial[4]: player.action_histories = serial[4]
     return player
 
+  def __reduce__(self):
+    # pickles as the flat serial form; the copy is not seated (Seats pickles its players itself)
+    return (self.__class__.deserialize, (self.serialize(),))
+
   """ private """
 
   __dup_hole_msg = "Hole card is already set"
@@ -106,46 +172,25 @@ class Player:
   __wrong_type_hole_msg = "You passed not Card object as hole card"
   __collect_err_msg = "Failed to collect %d chips. Because he has only %d chips"
 
-  def __init_round_action_histories(self):
-    return [None for _ in range(4)]  # 4 == len(["preflop", "flop", "turn", "river"])
+  def __to_records(self, histories):
+    # serial may come from before histories were ActionRecords
+    return [ActionRecord.from_dict(h) if isinstance(h, dict) else h for h in histories]
 
   def __fold_history(self):
-    return { "action" : self.ACTION_FOLD_STR }
+    return ActionRecord(Const.Action.FOLD, uuid=self.uuid)
 
   def __call_history(self, bet_amount):
-    return {
-        "action" : self.ACTION_CALL_STR,
-        "amount" : bet_amount,
-        "paid" : bet_amount - self.paid_sum()
-    }
+    return ActionRecord(Const.Action.CALL, bet_amount, paid=bet_amount - self.paid_sum(), uuid=self.uuid)
 
   def __raise_history(self, bet_amount, add_amount):
-    return {
-        "action" : self.ACTION_RAISE_STR,
-        "amount" : bet_amount,
-        "paid" : bet_amount - self.paid_sum(),
-        "add_amount" : add_amount
-        }
+    return ActionRecord(Const.Action.RAISE, bet_amount, add_amount, bet_amount - self.paid_sum(), self.uuid)
 
   def __blind_history(self, small_blind, sb_amount):
     assert(sb_amount is not None)
-    action = self.ACTION_SMALL_BLIND if small_blind else self.ACTION_BIG_BLIND
+    kind = Const.Action.SMALL_BLIND if small_blind else Const.Action.BIG_BLIND
     amount = sb_amount if small_blind else sb_amount*2
-    add_amount = sb_amount
-    return {
-        "action" : action,
-        "amount" : amount,
-        "add_amount" : add_amount
-        }
+    return ActionRecord(kind, amount, sb_amount, uuid=self.uuid)
 
   def __ante_history(self, pay_amount):
     assert(pay_amount > 0)
-    return {
-        "action" : self.ACTION_ANTE,
-        "amount" : pay_amount
-        }
-
-  def __add_uuid_on_history(self, history):
-    history["uuid"] = self.uuid
-    return history
-
+    return ActionRecord(Const.Action.ANTE, pay_amount, uuid=self.uuid)
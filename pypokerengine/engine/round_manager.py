@@ -1,7 +1,6 @@
 from functools import reduce
 
 from pypokerengine.engine.table import Table
-from pypokerengine.engine.player import Player
 from pypokerengine.engine.pay_info import PayInfo
 from pypokerengine.engine.poker_constants import PokerConstants as Const
 from pypokerengine.engine.action_checker import ActionChecker
@@ -11,7 +10,7 @@ from pypokerengine.engine.message_builder import MessageBuilder
 class RoundManager:
 
   @classmethod
-  def start_new_round(self, round_count, small_blind_amount, ante_amount, table):
+  def start_new_round(self, round_count, small_blind_amount, ante_amount, table, runout_messages=True):
     _state = self.__gen_initial_state(round_count, small_blind_amount, table)
     state = self.__deep_copy_state(_state)
     table = state["table"]
@@ -21,18 +20,19 @@ class RoundManager:
     self.__correct_blind(small_blind_amount, table)
     self.__deal_holecard(table.deck, table.seats.players)
     start_msg = self.__round_start_message(round_count, table)
-    state, street_msgs = self.__start_street(state)
+    state, street_msgs = self.__start_street(state, runout_messages)
     return state, start_msg + street_msgs
 
   @classmethod
-  def apply_action(self, original_state, action, bet_amount):
+  def apply_action(self, original_state, action, bet_amount, runout_messages=True):
+    """runout_messages=False skips the street start messages of streets nobody can act on"""
     state = self.__deep_copy_state(original_state)
     state = self.__update_state_by_action(state, action, bet_amount)
     update_msg = self.__update_message(state, action, bet_amount)
     if self.__is_everyone_agreed(state):
       [player.save_street_action_histories(state["street"]) for player in state["table"].seats.players]
       state["street"] += 1
-      state, street_msgs = self.__start_street(state)
+      state, street_msgs = self.__start_street(state, runout_messages)
       return state, [update_msg] + street_msgs
     else:
       state["next_player"] = state["table"].next_ask_waiting_player_pos(state["next_player"])
@@ -69,44 +69,44 @@ class RoundManager:
       player.add_holecard(deck.draw_cards(2))
 
   @classmethod
-  def __start_street(self, state):
+  def __start_street(self, state, runout_messages):
     next_player_pos = state["table"].next_ask_waiting_player_pos(state["table"].sb_pos()-1)
     state["next_player"] = next_player_pos
     street = state["street"]
     if street == Const.Street.PREFLOP:
-      return self.__preflop(state)
+      return self.__preflop(state, runout_messages)
     elif street == Const.Street.FLOP:
-      return self.__flop(state)
+      return self.__flop(state, runout_messages)
     elif street == Const.Street.TURN:
-      return self.__turn(state)
+      return self.__turn(state, runout_messages)
     elif street == Const.Street.RIVER:
-      return self.__river(state)
+      return self.__river(state, runout_messages)
     elif street == Const.Street.SHOWDOWN:
       return self.__showdown(state)
     else:
       raise ValueError("Street is already finished [street = %d]" % street)
 
   @classmethod
-  def __preflop(self, state):
+  def __preflop(self, state, runout_messages):
     for i in range(2):
       state["next_player"] = state["table"].next_ask_waiting_player_pos(state["next_player"])
-    return self.__forward_street(state)
+    return self.__forward_street(state, runout_messages)
 
   @classmethod
-  def __flop(self, state):
+  def __flop(self, state, runout_messages):
     for card in state["table"].deck.draw_cards(3):
       state["table"].add_community_card(card)
-    return self.__forward_street(state)
+    return self.__forward_street(state, runout_messages)
 
   @classmethod
-  def __turn(self, state):
+  def __turn(self, state, runout_messages):
     state["table"].add_community_card(state["table"].deck.draw_card())
-    return self.__forward_street(state)
+    return self.__forward_street(state, runout_messages)
 
   @classmethod
-  def __river(self, state):
+  def __river(self, state, runout_messages):
     state["table"].add_community_card(state["table"].deck.draw_card())
-    return self.__forward_street(state)
+    return self.__forward_street(state, runout_messages)
 
   @classmethod
   def __showdown(self, state):
@@ -129,20 +129,39 @@ class RoundManager:
     return reduce(lambda acc, idx: acc + [gen_msg(idx)], range(len(players)), [])
 
   @classmethod
-  def __forward_street(self, state):
+  def __forward_street(self, state, runout_messages):
     table = state["table"]
-    street_start_msg = [(-1, MessageBuilder.build_street_start_message(state))]
-    if table.seats.count_active_players() == 1: street_start_msg = []
     if table.seats.count_ask_wait_players() <= 1:
-      state["street"] += 1
-      state, messages = self.__start_street(state)
-      return state, street_start_msg + messages
+      return self.__runout(state, runout_messages)
     else:
+      street_start_msg = [(-1, MessageBuilder.build_street_start_message(state))]
+      if table.seats.count_active_players() == 1: street_start_msg = []
       next_player_pos = state["next_player"]
       next_player = table.seats.players[next_player_pos]
       ask_message = [(next_player.uuid, MessageBuilder.build_ask_message(next_player_pos, state))]
       return state, street_start_msg + ask_message
 
+  @classmethod
+  def __runout(self, state, runout_messages):
+    # Nobody can act any more: deal the rest of the board and go straight to showdown.
+    # Street start messages are only built when asked for (and more than one player is left).
+    table = state["table"]
+    street_msgs = runout_messages and table.seats.count_active_players() != 1
+    messages = [(-1, MessageBuilder.build_street_start_message(state))] if street_msgs else []
+    if street_msgs:
+      while state["street"] < Const.Street.RIVER:
+        state["street"] += 1
+        state["next_player"] = table.next_ask_waiting_player_pos(table.sb_pos()-1)
+        cards = table.deck.draw_cards(3 if state["street"] == Const.Street.FLOP else 1)
+        [table.add_community_card(card) for card in cards]
+        messages.append((-1, MessageBuilder.build_street_start_message(state)))
+    else:
+      [table.add_community_card(card) for card in table.deck.draw_cards(5 - len(table.get_community_card()))]
+    state["street"] = Const.Street.SHOWDOWN
+    state["next_player"] = table.next_ask_waiting_player_pos(table.sb_pos()-1)
+    state, result_msgs = self.__showdown(state)
+    return state, messages + result_msgs
+
   @classmethod
   def __update_state_by_action(self, state, action, bet_amount):
     table = state["table"]
@@ -187,8 +206,8 @@ class RoundManager:
     players = state["table"].seats.players
     next_player_pos = state["table"].next_ask_waiting_player_pos(state["next_player"])
     next_player = players[next_player_pos] if next_player_pos != "not_found" else None
-    max_pay = max([p.paid_sum() for p in players])
-    everyone_agreed = len(players) == len([p for p in players if self.__is_agreed(max_pay, p)])
+    max_pay = state["table"].seats.max_paid_sum()
+    everyone_agreed = len(players) == len([p for p in players if self.__is_agreed(max_pay, p, state["street"])])
     lonely_player = state["table"].seats.count_active_players() == 1
     no_need_to_ask = state["table"].seats.count_ask_wait_players() == 1 and\
             next_player and next_player.is_waiting_ask() and next_player.paid_sum() == max_pay
@@ -200,13 +219,13 @@ class RoundManager:
       raise "[__is_everyone_agreed] no-active-players!!"
 
   @classmethod
-  def __is_agreed(self, max_pay, player):
+  def __is_agreed(self, max_pay, player, street):
     # BigBlind should be asked action at least once
-    is_preflop = player.round_action_histories[0] == None
-    bb_ask_once = len(player.action_histories)==1 \
-            and player.action_histories[0]["action"] == Player.ACTION_BIG_BLIND
+    histories = player.action_histories
+    is_preflop = street == Const.Street.PREFLOP
+    bb_ask_once = len(histories)==1 and histories[0].kind == Const.Action.BIG_BLIND
     bb_ask_check = not is_preflop or not bb_ask_once
-    return (bb_ask_check and player.paid_sum() == max_pay and len(player.action_histories) != 0)\
+    return (bb_ask_check and player.paid_sum() == max_pay and len(histories) != 0)\
         or player.pay_info.status in [PayInfo.FOLDED, PayInfo.ALLIN]
 
   @classmethod
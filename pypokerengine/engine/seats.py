@@ -1,29 +1,167 @@
+import os
+import operator
+from functools import reduce
+
 from pypokerengine.engine.pay_info import PayInfo
 from pypokerengine.engine.player import Player
+from pypokerengine.engine.action_log import ActionLog
+from pypokerengine.engine import zobrist
 
 class Seats:
+  """Players in seat order
+
+  Besides the list, Seats keeps bitmasks (bit i = seat i) of the active
+  (not folded), ask waiting and funded (stack != 0) seats. Players report
+  their changes, so the masks are always current and "next seat after pos
+  which is X" is a few integer operations instead of a scan. The player
+  counts and the highest paid_sum of the street come from the same
+  bookkeeping.
+
+  The players share one ActionLog (action_log) holding the round's
+  actions in the order they were taken; a player's histories are views of
+  it. Histories a player brings along when seated are moved into it.
+
+  zobrist_hash() covers the players (stacks, pay info, hole cards) and
+  the log. It is the XOR of one key per seat, and a seat's key is only
+  recomputed after that seat reported a change, so an action costs one or
+  two seat keys. The keys travel with serialize(), so a copy starts with
+  them instead of rekeying every seat.
+
+  With check_invariants on (or PYPOKERENGINE_CHECK_SEATS=1) every count
+  is compared against a scan of the players, which catches a change that
+  bypassed the bookkeeping.
+  """
+
+  check_invariants = os.environ.get("PYPOKERENGINE_CHECK_SEATS") == "1"
 
   def __init__(self):
     self.players = []
 
+  @property
+  def players(self):
+    return self._players
+
+  @players.setter
+  def players(self, players):
+    log = ActionLog()
+    for old_log in self.__distinct_logs(players):
+      log.merge(old_log, { p._seat_pos: pos for pos, p in enumerate(players) if p._log is old_log })
+    self.action_log = log
+    self._players = players
+    self.active_mask = self.waiting_mask = self.funded_mask = 0
+    self._max_paid = None  # highest paid_sum of the street, None until computed
+    self._seat_keys, self._players_hash, self._stale_mask = [0] * len(players), 0, 0
+    for pos, player in enumerate(players):
+      self.__attach(player, pos)
+
   def sitdown(self, player):
-    self.players.append(player)
+    self._players.append(player)
+    self._max_paid = None
+    pos = len(self._players) - 1
+    self._seat_keys.append(0)
+    self.action_log.merge(player._log, { player._seat_pos: pos })
+    self.__attach(player, pos)
 
   def size(self):
     return len(self.players)
 
   def count_active_players(self):
-    return len([p for p in self.players if p.is_active()])
+    count = bin(self.active_mask).count("1")
+    if self.check_invariants:
+      self.__check("active players", count, len([p for p in self.players if p.is_active()]))
+    return count
 
   def count_ask_wait_players(self):
-    return len([p for p in self.players if p.is_waiting_ask()])
+    count = bin(self.waiting_mask).count("1")
+    if self.check_invariants:
+      self.__check("ask waiting players", count, len([p for p in self.players if p.is_waiting_ask()]))
+    return count
+
+  def max_paid_sum(self):
+    """Highest amount any player has put in on this street"""
+    if self._max_paid is None:
+      self._max_paid = max([p.paid_sum() for p in self._players]) if self._players else 0
+    elif self.check_invariants:
+      self.__check("max paid sum", self._max_paid, max([p.paid_sum() for p in self._players]))
+    return self._max_paid
+
+  def zobrist_hash(self):
+    """64 bit hash of the players' state and the round's action sequence"""
+    self.__rekey_stale_seats()
+    if self.check_invariants:
+      scanned = 0
+      for pos, player in enumerate(self._players): scanned ^= zobrist.seat_key(pos, player)
+      self.__check("players hash", self._players_hash, scanned)
+    return self._players_hash ^ self.action_log.sequence_hash()
+
+  def __rekey_stale_seats(self):
+    stale = self._stale_mask
+    while stale:
+      pos = (stale & -stale).bit_length() - 1
+      stale &= stale - 1
+      new_key = zobrist.seat_key(pos, self._players[pos])
+      self._players_hash ^= self._seat_keys[pos] ^ new_key
+      self._seat_keys[pos] = new_key
+    self._stale_mask = 0
+
+  def next_seat_pos(self, mask, start_pos):
+    """First seat in mask after start_pos, going round the table; None if mask is empty"""
+    if not mask: return None
+    size = len(self._players)
+    shift = (start_pos + 1) % size
+    rotated = ((mask >> shift) | (mask << (size - shift))) & ((1 << size) - 1)
+    return ((rotated & -rotated).bit_length() - 1 + shift) % size
+
+  def players_after(self, pos):
+    """All players in seat order, starting with the one after pos"""
+    return self._players[pos+1:] + self._players[:pos+1]
 
   def serialize(self):
-    return [player.serialize() for player in self.players]
+    self.__rekey_stale_seats()
+    return [[player.serialize(histories=False) for player in self.players], self.action_log.serialize(),
+        list(self._seat_keys)]
 
   @classmethod
   def deserialize(self, serial):
     seats = self()
-    seats.players = [Player.deserialize(s) for s in serial]
+    seats.players = [Player.deserialize(s) for s in serial[0]]
+    seats.action_log = ActionLog.deserialize(serial[1])
+    for player in seats.players:
+      player._log = seats.action_log
+    if len(serial) > 2:  # seat keys; without them every seat is rekeyed on the first zobrist_hash()
+      seats._seat_keys, seats._stale_mask = list(serial[2]), 0
+      seats._players_hash = reduce(operator.xor, seats._seat_keys, 0)
     return seats
 
+  def __reduce__(self):
+    # the flat serial form instead of the object graph of players, logs and back references
+    return (self.__class__.deserialize, (self.serialize(),))
+
+  def _update_seat(self, player):
+    bit = 1 << player._seat_pos
+    status = player.pay_info.status
+    self.active_mask = self.active_mask | bit if status != PayInfo.FOLDED else self.active_mask & ~bit
+    self.waiting_mask = self.waiting_mask | bit if status == PayInfo.PAY_TILL_END else self.waiting_mask & ~bit
+    self.funded_mask = self.funded_mask | bit if player.stack != 0 else self.funded_mask & ~bit
+    self._stale_mask |= bit
+
+  def _paid_changed(self, player):
+    # paid_sum never goes down within a street, so the max only has to be raised
+    if self._max_paid is not None: self._max_paid = max(self._max_paid, player.paid_sum())
+
+  def _histories_replaced(self):
+    self._max_paid = None  # a new street, or restored histories; recomputed on demand
+
+  def __check(self, name, maintained, scanned):
+    if maintained != scanned:
+      raise AssertionError("Seats lost track of %s: maintained %s, actual %s" % (name, maintained, scanned))
+
+  def __distinct_logs(self, players):
+    logs = []
+    for player in players:
+      if not any(player._log is log for log in logs): logs.append(player._log)
+    return logs
+
+  def __attach(self, player, pos):
+    player._seats, player._seat_pos, player._log = self, pos, self.action_log
+    self._update_seat(player)
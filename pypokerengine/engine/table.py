@@ -1,6 +1,7 @@
 from pypokerengine.engine.card import Card
 from pypokerengine.engine.seats import Seats
 from pypokerengine.engine.deck import Deck
+from pypokerengine.engine import zobrist
 
 class Table:
 
@@ -42,10 +43,22 @@ class Table:
     self.dealer_btn = self.next_active_player_pos(self.dealer_btn)
 
   def next_active_player_pos(self, start_pos):
-    return self.__find_entitled_player_pos(start_pos, lambda player: player.is_active() and player.stack != 0)
+    return self.__find_entitled_player_pos(start_pos, self.seats.active_mask & self.seats.funded_mask)
 
   def next_ask_waiting_player_pos(self, start_pos):
-    return self.__find_entitled_player_pos(start_pos, lambda player: player.is_waiting_ask())
+    return self.__find_entitled_player_pos(start_pos, self.seats.waiting_mask)
+
+  def zobrist_hash(self):
+    """64 bit hash of the seats, the board, the dealer button and the blind positions
+
+    The order of the undealt cards in the deck is left out: two tables that
+    differ only in what would come next are the same position.
+    """
+    h = self.seats.zobrist_hash() ^ zobrist.key(zobrist.DEALER_BTN, self.dealer_btn)
+    if self._blind_pos is not None: h ^= zobrist.key(zobrist.BLIND_POS, *self._blind_pos)
+    for i, card in enumerate(self._community_card):
+      h ^= zobrist.key(zobrist.COMMUNITY_CARD, i, zobrist.card_code(card))
+    return h
 
   def serialize(self):
     community_card = [card.to_id() for card in self._community_card]
@@ -65,13 +78,12 @@ class Table:
     table._blind_pos = serial[4]
     return table
 
-  def __find_entitled_player_pos(self, start_pos, check_method):
-    players = self.seats.players
-    search_targets = players + players
-    search_targets = search_targets[start_pos+1:start_pos+len(players)+1]
-    assert(len(search_targets) == len(players))
-    match_player = next((player for player in search_targets if check_method(player)), -1)
-    return self._player_not_found if match_player == -1 else players.index(match_player)
+  def __reduce__(self):
+    return (self.__class__.deserialize, (self.serialize(),))
+
+  def __find_entitled_player_pos(self, start_pos, mask):
+    pos = self.seats.next_seat_pos(mask, start_pos)
+    return self._player_not_found if pos is None else pos
 
   _player_not_found = "not_found"
 
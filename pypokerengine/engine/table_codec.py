@@ -0,0 +1,223 @@
+import struct
+import sys
+from array import array
+
+from pypokerengine.engine.table import Table
+
+class TableCodecError(ValueError):
+  pass
+
+class TableCodec:
+  """Compact, versioned binary form of a Table or a game state
+
+  The bytes carry the same data as Table.serialize() and decode back
+  through Table.deserialize, so they round-trip to the object model the
+  same way the list format does. Layout, all big endian:
+
+    header      "PPE", version (B), flags (B)            bit 0: amounts are doubles, bit 1: 64 bit ints
+    game state  round_count (I), small_blind_amount (A), street (B), next_player (h)
+                (encode_game_state only; next_player -1 = None, -2 = "not_found")
+    table       dealer_btn (H), blind flag (B), sb_pos (H), bb_pos (H)
+                community cards, cheat flag (B), cheat card ids, deck card ids
+                card lists are a count (B) followed by one byte per card id
+    players     count (B), then per player: name, uuid (H length + utf-8, 0xFFFF = None),
+                stack (A), hole card ids, pay amount (A), pay status (B)
+    action log  street (B), rows (I), then one packed column per field:
+                seat, street, action code (b each), amount, add_amount, paid (A each)
+
+  A is a signed 32 bit int (i); a 64 bit one (q) when some chip amount does
+  not fit, or a double (d) when some amount is not an int.
+  """
+
+  MAGIC = b"PPE"
+  VERSION = 1
+
+  FLOAT_AMOUNTS = 1
+  WIDE_AMOUNTS = 2
+
+  @classmethod
+  def encode(self, table):
+    serial = table.serialize()
+    flags = self.__amount_flags(self.__amounts(serial))
+    out = [self.__header(flags)]
+    self.__pack_table(out, serial, flags)
+    return b"".join(out)
+
+  @classmethod
+  def decode(self, data):
+    reader = _Reader(data)
+    flags = self.__read_header(reader)
+    table = self.__unpack_table(reader, flags)
+    reader.check_end()
+    return table
+
+  @classmethod
+  def encode_game_state(self, state):
+    serial = state["table"].serialize()
+    amounts = self.__amounts(serial) + [state["small_blind_amount"]]
+    flags = self.__amount_flags(amounts)
+    amount = self.__amount_format(flags)
+    out = [self.__header(flags)]
+    out.append(struct.pack("!I" + amount + "Bh", state["round_count"], state["small_blind_amount"],
+        state["street"], self.__next_player_code(state["next_player"])))
+    self.__pack_table(out, serial, flags)
+    return b"".join(out)
+
+  @classmethod
+  def decode_game_state(self, data):
+    reader = _Reader(data)
+    flags = self.__read_header(reader)
+    round_count, small_blind_amount, street, next_player =\
+        reader.unpack("!I" + self.__amount_format(flags) + "Bh")
+    table = self.__unpack_table(reader, flags)
+    reader.check_end()
+    return {
+        "round_count": round_count,
+        "small_blind_amount": small_blind_amount,
+        "street": street,
+        "next_player": self.__next_player_from_code(next_player),
+        "table": table
+    }
+
+  """ private """
+
+  __NONE_STR = 0xFFFF
+  __NEXT_PLAYER_NONE = -1
+  __NEXT_PLAYER_NOT_FOUND = -2
+
+  @classmethod
+  def __header(self, flags):
+    return self.MAGIC + struct.pack("!BB", self.VERSION, flags)
+
+  @classmethod
+  def __read_header(self, reader):
+    magic = reader.take(len(self.MAGIC))
+    if magic != self.MAGIC: raise TableCodecError("Not an encoded table")
+    version, flags = reader.unpack("!BB")
+    if version != self.VERSION: raise TableCodecError("Unsupported table encoding version %d" % version)
+    return flags
+
+  @classmethod
+  def __pack_table(self, out, serial, flags):
+    dealer_btn, seats, deck, community_card, blind_pos = serial
+    amount = self.__amount_format(flags)
+    sb_pos, bb_pos = blind_pos if blind_pos is not None else (0, 0)
+    out.append(struct.pack("!HBHH", dealer_btn, blind_pos is not None, sb_pos, bb_pos))
+    out.append(self.__cards(community_card))
+    cheat, cheat_card_ids, deck_ids = deck
+    out.append(struct.pack("!B", bool(cheat)))
+    out.append(self.__cards(cheat_card_ids))
+    out.append(self.__cards(deck_ids))
+    players, log = seats[:2]
+    out.append(struct.pack("!B", len(players)))
+    player_format = "!" + amount + "B%dB" + amount + "B"
+    for name, uuid, stack, hole, _, pay_info, _ in players:
+      out.append(self.__str(name) + self.__str(uuid))
+      out.append(struct.pack(player_format % len(hole), stack, len(hole), *hole, pay_info[0], pay_info[1]))
+    street, log_seats, log_streets, kinds = log[:4]
+    out.append(struct.pack("!BI", street, len(kinds)))
+    for column in (log_seats, log_streets, kinds):
+      out.append(array("b", column).tobytes())
+    for column in log[4:7]:
+      out.append(self.__big_endian(array(amount, column)).tobytes())
+
+  @classmethod
+  def __unpack_table(self, reader, flags):
+    amount = self.__amount_format(flags)
+    dealer_btn, has_blind_pos, sb_pos, bb_pos = reader.unpack("!HBHH")
+    community_card = reader.cards()
+    cheat, = reader.unpack("!B")
+    deck = [bool(cheat), reader.cards(), reader.cards()]
+    players = []
+    for _ in range(reader.unpack("!B")[0]):
+      name, uuid = reader.str(), reader.str()
+      stack, = reader.unpack("!" + amount)
+      hole = reader.cards()
+      pay_info = list(reader.unpack("!" + amount + "B"))
+      players.append([name, uuid, stack, hole, [], pay_info, [None]*4])
+    street, rows = reader.unpack("!BI")
+    log = [street] + [array("b", reader.take(rows)).tolist() for _ in range(3)]
+    for _ in range(3):
+      column = array(amount, reader.take(rows * struct.calcsize(amount)))
+      log.append(self.__big_endian(column).tolist())
+    blind_pos = [sb_pos, bb_pos] if has_blind_pos else None
+    return Table.deserialize([dealer_btn, [players, log], deck, community_card, blind_pos])
+
+  @classmethod
+  def __amounts(self, serial):
+    players, log = serial[1][:2]
+    amounts = [amount for player in players for amount in (player[2], player[5][0])]
+    for column in log[4:7]: amounts += column
+    return amounts
+
+  @classmethod
+  def __amount_flags(self, amounts):
+    if not set(map(type, amounts)) <= { int }: return self.FLOAT_AMOUNTS
+    if amounts and (max(amounts) > 0x7FFFFFFF or min(amounts) < -0x80000000): return self.WIDE_AMOUNTS
+    return 0
+
+  @classmethod
+  def __amount_format(self, flags):
+    if flags & self.FLOAT_AMOUNTS: return "d"
+    return "q" if flags & self.WIDE_AMOUNTS else "i"
+
+  @classmethod
+  def __big_endian(self, column):
+    # array.tobytes writes native byte order; the encoding is big endian on every machine
+    if sys.byteorder == "little": column.byteswap()
+    return column
+
+  @classmethod
+  def __cards(self, card_ids):
+    card_ids = list(card_ids)
+    return struct.pack("!B", len(card_ids)) + bytes(card_ids)
+
+  @classmethod
+  def __str(self, value):
+    if value is None: return struct.pack("!H", self.__NONE_STR)
+    data = value.encode("utf-8")
+    return struct.pack("!H", len(data)) + data
+
+  @classmethod
+  def __next_player_code(self, next_player):
+    if next_player is None: return self.__NEXT_PLAYER_NONE
+    if next_player == Table._player_not_found: return self.__NEXT_PLAYER_NOT_FOUND
+    return next_player
+
+  @classmethod
+  def __next_player_from_code(self, code):
+    if code == self.__NEXT_PLAYER_NONE: return None
+    if code == self.__NEXT_PLAYER_NOT_FOUND: return Table._player_not_found
+    return code
+
+
+class _Reader:
+
+  def __init__(self, data):
+    self.data = bytes(data)
+    self.pos = 0
+
+  def take(self, size):
+    end = self.pos + size
+    if end > len(self.data): raise TableCodecError("Encoded table is truncated")
+    chunk, self.pos = self.data[self.pos:end], end
+    return chunk
+
+  def unpack(self, fmt):
+    try:
+      values = struct.unpack_from(fmt, self.data, self.pos)
+    except struct.error:
+      raise TableCodecError("Encoded table is truncated")
+    self.pos += struct.calcsize(fmt)
+    return values
+
+  def cards(self):
+    return list(self.take(self.unpack("!B")[0]))
+
+  def str(self):
+    size, = self.unpack("!H")
+    if size == 0xFFFF: return None
+    return self.take(size).decode("utf-8")
+
+  def check_end(self):
+    if self.pos != len(self.data): raise TableCodecError("Unexpected bytes after the encoded table")
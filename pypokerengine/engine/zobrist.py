@@ -0,0 +1,61 @@
+"""64 bit keys for Zobrist style state hashing
+
+A state hash is the XOR of one key per (component, position, value) it
+contains, so changing a value costs two XORs: take the old key out, put the
+new one in. The keys are not drawn from a random table but computed by
+mixing the parts with splitmix64, which works for any chip amount and gives
+the same hashes in every process (worker processes can share a cache).
+
+Only ints and floats go into keys; Python's str and None hashes differ
+between processes. Ints are used as they are (masked to 64 bits), not
+through hash(), which maps -1 and -2 alike.
+"""
+
+MASK = (1 << 64) - 1
+
+# components
+STACK = 1
+PAID = 2
+STATUS = 3
+HOLE_CARD = 4
+COMMUNITY_CARD = 5
+ACTION = 6
+STREET = 7
+NEXT_PLAYER = 8
+ROUND = 9
+DEALER_BTN = 10
+BLIND_POS = 11
+
+def mix(x):
+  x = (x + 0x9E3779B97F4A7C15) & MASK
+  x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+  x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK
+  return x ^ (x >> 31)
+
+def key(*parts):
+  h = 0
+  for part in parts:
+    h = mix(h ^ _code(part))
+  return h
+
+def _code(part):
+  if isinstance(part, float) and part.is_integer(): part = int(part)  # 100.0 keys like 100
+  return (part if isinstance(part, int) else hash(part)) & MASK
+
+def card_code(card):
+  return card.suit * 16 + card.rank
+
+def seat_key(pos, player):
+  """Key of everything a seat holds: stack, paid amount, pay status and hole cards"""
+  pay_info = player.pay_info
+  h = key(STACK, pos, player.stack) ^ key(PAID, pos, pay_info.amount) ^ key(STATUS, pos, pay_info.status)
+  for card in player.hole_card:
+    h ^= key(HOLE_CARD, pos, card_code(card))
+  return h
+
+def action_key(seat, street, kind, amount, add_amount, paid):
+  return key(ACTION, seat, street, kind, amount, add_amount, paid)
+
+def chain(sequence_hash, entry_key):
+  """Order sensitive hash of a sequence, extended by one entry"""
+  return mix(sequence_hash ^ entry_key)
@@ -1,3 +1,5 @@
+import inspect
+
 class BasePokerPlayer(object):
   """Base Poker client implementation
 
@@ -49,27 +51,37 @@ class BasePokerPlayer(object):
 
   def receive_notification(self, message):
     """Called from Dealer when notification received from RoundManager"""
+    hook = self._notification_hook(message)
+    if hook:
+      receiver, args = hook
+      receiver(*args)
+
+  def _notification_hook(self, message):
+    """Returns (receive_xxx method, its arguments) for the notification, or None"""
     msg_type = message["message_type"]
 
     if msg_type == "game_start_message":
       info = self.__parse_game_start_message(message)
-      self.receive_game_start_message(info)
+      return self.receive_game_start_message, (info,)
 
     elif msg_type == "round_start_message":
       round_count, hole, seats = self.__parse_round_start_message(message)
-      self.receive_round_start_message(round_count, hole, seats)
+      return self.receive_round_start_message, (round_count, hole, seats)
 
     elif msg_type == "street_start_message":
       street, state = self.__parse_street_start_message(message)
-      self.receive_street_start_message(street, state)
+      return self.receive_street_start_message, (street, state)
 
     elif msg_type == "game_update_message":
       new_action, round_state = self.__parse_game_update_message(message)
-      self.receive_game_update_message(new_action, round_state)
+      return self.receive_game_update_message, (new_action, round_state)
 
     elif msg_type == "round_result_message":
       winners, hand_info, state = self.__parse_round_result_message(message)
-      self.receive_round_result_message(winners, hand_info, state)
+      return self.receive_round_result_message, (winners, hand_info, state)
+
+  def _parse_ask_message(self, message):
+    return self.__parse_ask_message(message)
 
 
   def __build_err_msg(self, msg):
@@ -107,3 +119,26 @@ class BasePokerPlayer(object):
     round_state = message["round_state"]
     return winners, hand_info, round_state
 
+
+class AsyncPokerPlayer(BasePokerPlayer):
+  """Poker client for AsyncDealer
+
+  Override the same methods as BasePokerPlayer. Any of them may be
+  defined with "async def" (e.g. a declare_action which waits for a
+  remote client), and AsyncDealer awaits it without blocking other games.
+  """
+
+  async def respond_to_ask(self, message):
+    """Called from AsyncDealer when ask message received from RoundManager"""
+    valid_actions, hole_card, round_state = self._parse_ask_message(message)
+    return await self.__resolve(self.declare_action(valid_actions, hole_card, round_state))
+
+  async def receive_notification(self, message):
+    """Called from AsyncDealer when notification received from RoundManager"""
+    hook = self._notification_hook(message)
+    if hook:
+      receiver, args = hook
+      await self.__resolve(receiver(*args))
+
+  async def __resolve(self, result):
+    return await result if inspect.isawaitable(result) else result
@@ -6,8 +6,10 @@ from pypokerengine.engine.card import Card
 from pypokerengine.engine.deck import Deck
 from pypokerengine.engine.player import Player
 from pypokerengine.engine.pay_info import PayInfo
+from pypokerengine.engine.action_record import ActionRecord
 from pypokerengine.engine.data_encoder import DataEncoder
 from pypokerengine.engine.poker_constants import PokerConstants as Const
+from pypokerengine.engine import zobrist
 
 def restore_game_state(round_state):
     return {
@@ -49,6 +51,25 @@ def replace_community_card(game_state, community_card):
     deepcopy["table"]._community_card = community_card
     return deepcopy
 
+def game_state_hash(game_state):
+    """64 bit hash of a game state
+
+    The table part is kept up as actions are applied: an action rekeys the
+    seats it changed and extends the action sequence hash, and a state
+    copied by RoundManager carries its seat keys along.
+
+    Equal states (the deck order aside) hash equal in every process; use
+    TranspositionTable to tell the rare collision from a real match.
+    """
+    next_player = game_state["next_player"]
+    next_player = _next_player_codes.get(next_player, next_player)
+    return game_state["table"].zobrist_hash()\
+            ^ zobrist.key(zobrist.STREET, game_state["street"])\
+            ^ zobrist.key(zobrist.NEXT_PLAYER, next_player)\
+            ^ zobrist.key(zobrist.ROUND, game_state["round_count"], game_state["small_blind_amount"])
+
+_next_player_codes = { None: -1, Table._player_not_found: -2 }
+
 def deepcopy_game_state(game_state):
     tabledeepcopy = Table.deserialize(game_state["table"].serialize())
     return {
@@ -90,30 +111,22 @@ def _restore_deck(str_exclude_cards):
 def _restore_seats(seats_info, action_histories):
     players = [Player(info["uuid"], info["stack"], info["name"]) for info in seats_info]
     players_state = [info["state"] for info in seats_info]
-    _restore_action_histories_on_players(players, action_histories)
     _restore_pay_info_on_players(players, players_state, action_histories)
     seats = Seats()
     seats.players = players
+    _restore_action_log(seats, action_histories)
     return seats
 
-def _restore_action_histories_on_players(players, round_action_histories):
+def _restore_action_log(seats, round_action_histories):
     ordered_street_names = sorted(round_action_histories.keys(), key=lambda x:_street_flg_translator[x])
-    current_street_name = ordered_street_names[-1]
-    past_street_names = ordered_street_names[:-1]
-
-    # restore round_action_histories
-    for street_name in past_street_names:
+    positions = { player.uuid: pos for pos, player in enumerate(seats.players) }
+    for street_name in ordered_street_names:
         street_flg = _street_flg_translator[street_name]
-        action_histories = round_action_histories[street_name]
-        for player in players: player.round_action_histories[street_flg] = []
-        for action_history in action_histories:
-            player = _find_user_by_uuid(players, action_history["uuid"])
-            player.round_action_histories[street_flg].append(action_history)
-
-    # resotre action_histories
-    for action_history in round_action_histories[current_street_name]:
-        player = _find_user_by_uuid(players, action_history["uuid"])
-        player.action_histories.append(action_history)
+        # every street but the last one listed is finished
+        if street_name != ordered_street_names[-1]: seats.action_log.close_street(street_flg)
+        for action_history in round_action_histories[street_name]:
+            seats.action_log.append_record(positions[action_history["uuid"]],
+                    ActionRecord.from_dict(action_history), street_flg)
 
 def _restore_pay_info_on_players(players, players_state, round_action_histories):
     _restore_pay_info_status_on_players(players, players_state)
@@ -0,0 +1,51 @@
+from multiprocessing import shared_memory
+
+from pypokerengine.engine.table_codec import TableCodec
+
+class SharedGameState(object):
+    """One game state in shared memory, for many worker processes
+
+    The state is encoded once (TableCodec) into a shared memory block. The
+    object itself pickles as just the block's name and size, so passing it
+    to every task of a process pool costs a few bytes however large the
+    state is; workers call load() to get their own copy of the state.
+
+        with SharedGameState(root_state) as shared:
+            results = pool.map(rollout, [(shared, seed) for seed in seeds])
+
+    The process that created it unlinks the block on close() (or when the
+    with block ends); other processes only detach from it.
+    """
+
+    def __init__(self, game_state):
+        data = TableCodec.encode_game_state(game_state)
+        self._memory = shared_memory.SharedMemory(create=True, size=len(data))
+        self._memory.buf[:len(data)] = data
+        self.name, self.size = self._memory.name, len(data)
+        self._owner = True
+
+    def load(self):
+        """A new game state decoded from the shared block"""
+        return TableCodec.decode_game_state(self._memory.buf[:self.size])
+
+    def close(self):
+        if self._memory is None: return
+        self._memory.close()
+        if self._owner: self._memory.unlink()
+        self._memory = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __reduce__(self):
+        return (_attach, (self.name, self.size))
+
+def _attach(name, size):
+    shared = SharedGameState.__new__(SharedGameState)
+    shared._memory = shared_memory.SharedMemory(name=name)
+    shared.name, shared.size = name, size
+    shared._owner = False
+    return shared
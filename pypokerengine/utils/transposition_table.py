@@ -0,0 +1,68 @@
+from collections import OrderedDict
+
+from pypokerengine.utils.game_state_utils import game_state_hash
+
+class TranspositionTable(object):
+    """Cache of values per game state, for tree search over Emulator states
+
+    Entries are found by game_state_hash, then checked against an exact
+    signature of the state, so a hash collision is a miss (counted in
+    `collisions`), never a wrong value. The signature is only built when a
+    value is stored or a hash matches.
+
+        table = TranspositionTable(max_entries=100000)
+        value = table.get(state)
+        if value is None:
+            value = search(state)
+            table.put(state, value)
+
+    With max_entries set, the oldest entry goes when the table is full.
+    """
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # hash => (signature, value)
+        self.hits = self.misses = self.collisions = 0
+
+    def get(self, game_state, default=None):
+        entry = self._entries.get(game_state_hash(game_state))
+        if entry is None:
+            self.misses += 1
+            return default
+        if entry[0] != state_signature(game_state):
+            self.collisions += 1
+            self.misses += 1
+            return default
+        self.hits += 1
+        return entry[1]
+
+    def put(self, game_state, value):
+        h = game_state_hash(game_state)
+        if h in self._entries:
+            del self._entries[h]  # a colliding state takes the slot over
+        elif self.max_entries is not None and len(self._entries) >= self.max_entries:
+            self._entries.popitem(last=False)
+        self._entries[h] = (state_signature(game_state), value)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = self.collisions = 0
+
+    def __contains__(self, game_state):
+        entry = self._entries.get(game_state_hash(game_state))
+        return entry is not None and entry[0] == state_signature(game_state)
+
+    def __len__(self):
+        return len(self._entries)
+
+def state_signature(game_state):
+    """Everything game_state_hash covers, as a comparable tuple"""
+    table = game_state["table"]
+    seats = table.seats
+    players = tuple((player.uuid, player.stack, player.pay_info.amount, player.pay_info.status,
+            tuple(card.to_id() for card in player.hole_card)) for player in seats.players)
+    log = seats.action_log.serialize()
+    return (game_state["round_count"], game_state["small_blind_amount"], game_state["street"],
+            game_state["next_player"], table.dealer_btn, tuple(table._blind_pos or ()),
+            tuple(card.to_id() for card in table.get_community_card()), players,
+            log[0], tuple(tuple(column) for column in log[1:7]))
@@ -0,0 +1,50 @@
+import random
+import string
+import threading
+
+
+class LobbyManager:
+    """Lobbies waiting for /begin, keyed by a 4 character game code"""
+
+    CODE_CHARS = string.ascii_uppercase + string.digits
+
+    def __init__(self):
+        self.lobbies = {}  # code → {"owner": user_id, "players": [user_id, ...]}
+        self._lock = threading.Lock()  # Slack commands are handled on several threads
+
+    def create_lobby(self, owner):
+        with self._lock:
+            code = self._new_code()
+            self.lobbies[code] = {"owner": owner, "players": [owner]}
+            return code
+
+    def join_lobby(self, user_id, code):
+        """(joined, message to show the user)"""
+        with self._lock:
+            lobby = self.lobbies.get(code)
+            if lobby is None:
+                return False, f"❌ No game with code *{code}*."
+            if user_id in lobby["players"]:
+                return False, f"You are already in game *{code}*."
+            lobby["players"].append(user_id)
+            return True, f"✅ Joined game *{code}*. Waiting for the host to `/begin {code}`."
+
+    def is_owner(self, user_id, code):
+        with self._lock:
+            lobby = self.lobbies.get(code)
+            return lobby is not None and lobby["owner"] == user_id
+
+    def get_players(self, code):
+        with self._lock:
+            lobby = self.lobbies.get(code)
+            return list(lobby["players"]) if lobby else []
+
+    def clear_lobby(self, code):
+        with self._lock:
+            self.lobbies.pop(code, None)
+
+    def _new_code(self):
+        while True:
+            code = "".join(random.choice(self.CODE_CHARS) for _ in range(4))
+            if code not in self.lobbies:
+                return code
@@ -0,0 +1,23 @@
+import json
+import re
+
+from .slack_player import ACTION_ID_PREFIX
+
+
+def register_handlers(app, game_scheduler):
+    """Route SlackPlayer's action buttons to game_scheduler.submit_action"""
+
+    @app.action(re.compile(f"^{ACTION_ID_PREFIX}"))
+    def handle_poker_action(ack, body, respond):
+        ack()
+        error = submit_click(game_scheduler, body)
+        if error:
+            respond(f"⚠️ {error}")
+
+
+def submit_click(game_scheduler, body):
+    """Pass a button click to its game; returns an error message or None"""
+    value = json.loads(body["actions"][0]["value"])
+    if body["user"]["id"] != value["user_id"]:
+        return "That button belongs to another player"
+    return game_scheduler.submit_action(value["game_id"], value["uuid"], value["action"], value["amount"])
@@ -0,0 +1,74 @@
+import json
+
+from engine.game_runner import DeferredPlayer
+
+ACTION_ID_PREFIX = "poker_"
+
+
+class SlackPlayer(DeferredPlayer):
+    """A human seat played through Slack direct messages.
+
+    request_action posts the action buttons and returns at once; the click comes back through
+    the handlers registered by slack_handlers.register_handlers, which pass it to
+    GameScheduler.submit_action. Notifications are posted to slack_client, normally the game's
+    SlackOutbox, so a street's worth of them goes out as one message.
+    """
+
+    def __init__(self, user_id, slack_client, game_id):
+        self.user_id = user_id
+        self.slack_client = slack_client
+        self.game_id = game_id
+
+    def request_action(self, valid_actions, hole_card, round_state):
+        text = (f"🎯 Your turn. Hole cards: {_cards(hole_card)}, board: {_cards(round_state['community_card'])}, "
+                f"pot: {round_state['pot']['main']['amount']}")
+        buttons = [self._button(label, action, amount) for label, action, amount in _choices(valid_actions)]
+        # The outbox puts the text in a section in front of the buttons
+        self._post(text, blocks=[{"type": "actions", "elements": buttons}])
+
+    def receive_game_start_message(self, game_info):
+        self._post(f"🃏 Game *{self.game_id}* started with {game_info['player_num']} players.")
+
+    def receive_round_start_message(self, round_count, hole_card, seats):
+        self._post(f"Hand {round_count}: you hold {_cards(hole_card)}")
+
+    def receive_street_start_message(self, street, round_state):
+        if round_state["community_card"]:
+            self._post(f"{street.capitalize()}: {_cards(round_state['community_card'])}")
+
+    def receive_game_update_message(self, action, round_state):
+        name = next((s["name"] for s in round_state["seats"] if s["uuid"] == action["player_uuid"]), "?")
+        if action["player_uuid"] != self.uuid:
+            self._post(f"<@{name}> {action['action'].lower()} {action['amount'] or ''}".rstrip())
+
+    def receive_round_result_message(self, winners, hand_info, round_state):
+        names = ", ".join(f"<@{w['name']}>" for w in winners)
+        self._post(f"🏆 {names} won the hand. Your stack: {self._stack(round_state)}")
+
+    def _button(self, label, action, amount):
+        value = {"game_id": self.game_id, "uuid": self.uuid, "user_id": self.user_id,
+                 "action": action, "amount": amount}
+        return {"type": "button", "text": {"type": "plain_text", "text": label},
+                "action_id": f"{ACTION_ID_PREFIX}{label.split()[0].lower()}", "value": json.dumps(value)}
+
+    def _stack(self, round_state):
+        return next((s["stack"] for s in round_state["seats"] if s["uuid"] == self.uuid), 0)
+
+    def _post(self, text, blocks=None):
+        self.slack_client.chat_postMessage(channel=self.user_id, text=text, blocks=blocks)
+
+
+def _choices(valid_actions):
+    """(button label, action, amount) for fold, call or check, the smallest raise and all-in"""
+    fold, call, raise_ = valid_actions
+    choices = [("Fold", "fold", 0), (f"Call {call['amount']}" if call["amount"] else "Check", "call", call["amount"])]
+    min_raise, max_raise = raise_["amount"]["min"], raise_["amount"]["max"]
+    if min_raise != -1:
+        if min_raise < max_raise:
+            choices.append((f"Raise {min_raise}", "raise", min_raise))
+        choices.append((f"All-in {max_raise}", "raise", max_raise))
+    return choices
+
+
+def _cards(cards):
+    return " ".join(cards) if cards else "-"
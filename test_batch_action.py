@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Batched action endpoint tests
+Run with: python3 test_batch_action.py
+"""
+
+import sys
+import os
+import unittest
+
+# Add the current directory to Python path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app as server
+
+
+class TestBatchAction(unittest.TestCase):
+
+    def setUp(self):
+        self.client = server.app.test_client()
+        self.engine = server.engine
+        self.game_ids = ["test_batch_001", "test_batch_002"]
+        for game_id in self.game_ids:
+            self.client.post("/start-game", json={"game_id": game_id, "players": [
+                {"user_id": "player1", "stack": 100},
+                {"user_id": "player2", "stack": 100}
+            ]})
+
+    def tearDown(self):
+        for game_id in self.game_ids:
+            self.engine.end_game(game_id)
+
+    def test_actions_across_games(self):
+        """Actions are applied in order and each touched game's final state is returned"""
+        g1, g2 = self.game_ids
+        response = self.client.post("/batch-action", json={"actions": [
+            {"game_id": g1, "user_id": "player1", "action": "call", "amount": 1},
+            {"game_id": g2, "user_id": "player1", "action": "fold"},
+            {"game_id": g1, "user_id": "player2", "action": "check"}
+        ]})
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+
+        self.assertEqual([r["success"] for r in data["results"]], [True, True, True])
+        self.assertEqual(data["results"][2]["version"], self.engine.get_version(g1))
+        self.assertEqual(set(data["games"]), {g1, g2})
+        self.assertEqual(len(data["games"][g1]["community_cards"]), 3)
+        self.assertTrue(data["games"][g2]["is_hand_over"])
+
+    def test_failed_item_does_not_stop_batch(self):
+        """Errors are reported per item"""
+        g1 = self.game_ids[0]
+        data = self.client.post("/batch-action", json={"actions": [
+            {"game_id": g1, "user_id": "player2", "action": "call", "amount": 1},
+            {"game_id": g1, "action": "call"},
+            {"game_id": g1, "user_id": "player1", "action": "call", "amount": 1}
+        ]}).get_json()
+
+        self.assertIn("Not your turn", data["results"][0]["error"])
+        self.assertEqual(data["results"][1]["error"], "Missing required fields")
+        self.assertTrue(data["results"][2]["success"])
+        self.assertEqual(data["games"][g1]["next_player"], "player2")
+
+    def test_malformed_items_are_reported(self):
+        """Items that are not action objects fail on their own instead of failing the request"""
+        g1 = self.game_ids[0]
+        response = self.client.post("/batch-action", json={"actions": [
+            1, None, ["call"], {"game_id": [g1], "user_id": "player1", "action": "call"},
+            {"game_id": g1, "user_id": "player1", "action": "call", "amount": 1}
+        ]})
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+
+        self.assertEqual([r["error"] for r in data["results"][:3]], ["Action must be an object"] * 3)
+        self.assertEqual(data["results"][3]["error"], "game_id, user_id and action must be strings")
+        self.assertTrue(data["results"][4]["success"])
+        self.assertEqual(set(data["games"]), {g1})
+
+    def test_rejects_body_that_is_not_an_object(self):
+        response = self.client.post("/batch-action", json=[{"game_id": self.game_ids[0]}])
+        self.assertEqual(response.status_code, 400)
+
+    def test_rejects_empty_batch(self):
+        response = self.client.post("/batch-action", json={"actions": []})
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Equity service and /equity endpoint tests
+Run with: python3 test_equity.py
+"""
+
+import sys
+import os
+import threading
+import unittest
+from concurrent.futures import Future
+
+# Add the current directory to Python path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app as server
+from engine.equity import EquityService, normalize_query
+
+
+class ManualExecutor:
+    """Executor whose futures complete only when the test says so"""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.submitted.append((future, fn, args))
+        return future
+
+    def run_all(self):
+        for future, fn, args in self.submitted:
+            future.set_result(fn(*args))
+
+
+class TestEquityService(unittest.TestCase):
+
+    def test_normalize_query(self):
+        key = normalize_query({"hole": ["SA", "HA"], "board": ["D2", "C7", "ST"], "players": 3, "simulations": 10})
+        self.assertEqual(key, (("HA", "SA"), ("C7", "D2", "ST"), 3, 10))
+
+        for query in [
+            {"hole": ["SA"]},
+            {"hole": ["SA", "XX"]},
+            {"hole": ["SA", "SA"]},
+            {"hole": ["SA", "HA"], "board": ["D2"]},
+            {"hole": ["SA", "HA"], "players": 1},
+            {"hole": ["SA", "HA"], "simulations": 0}
+        ]:
+            with self.assertRaises(ValueError):
+                normalize_query(query)
+
+    def test_identical_inflight_queries_are_coalesced_and_cached(self):
+        executor = ManualExecutor()
+        service = EquityService(executor=executor)
+        key = normalize_query({"hole": ["SA", "HA"], "simulations": 10})
+
+        first, how_first = service.submit(key)
+        second, how_second = service.submit(key)
+        self.assertEqual((how_first, how_second), ("computed", "coalesced"))
+        self.assertIs(first, second)
+        self.assertEqual(len(executor.submitted), 1)
+
+        executor.run_all()
+        third, how_third = service.submit(key)
+        self.assertEqual(how_third, "cache_hit")
+        self.assertEqual(third.result(), first.result())
+
+    def test_cache_is_bounded(self):
+        executor = ManualExecutor()
+        service = EquityService(executor=executor, cache_size=1)
+        first = normalize_query({"hole": ["SA", "HA"], "simulations": 1})
+        second = normalize_query({"hole": ["SK", "HK"], "simulations": 1})
+        service.submit(first)
+        service.submit(second)
+        executor.run_all()
+
+        self.assertEqual(service.submit(second)[1], "cache_hit")
+        self.assertEqual(service.submit(first)[1], "computed")
+
+    def test_evaluate_reports_errors_per_query(self):
+        executor = ManualExecutor()
+        service = EquityService(executor=executor)
+        threading.Timer(0.05, executor.run_all).start()
+
+        results = service.evaluate([
+            {"hole": ["SA", "HA"], "board": ["D2", "C7", "ST", "H3", "S9"], "simulations": 5},
+            {"hole": ["SA"]}
+        ], timeout=5)
+        self.assertEqual(results[0]["hole"], ["HA", "SA"])
+        self.assertTrue(0.0 <= results[0]["win_rate"] <= 1.0)
+        self.assertIn("error", results[1])
+
+
+class TestEquityEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.client = server.app.test_client()
+
+    def test_equity_in_worker_processes(self):
+        response = self.client.post("/equity", json={"queries": [
+            {"hole": ["SA", "HA"], "board": ["SK", "HK", "DK", "CK", "D2"], "players": 2, "simulations": 20},
+            {"hole": ["C2", "D7"], "players": 4, "simulations": 20}
+        ]})
+        self.assertEqual(response.status_code, 200)
+        results = response.get_json()["results"]
+
+        # Four kings on the board: aces always hold at least a split
+        self.assertEqual(results[0]["win_rate"], 1.0)
+        self.assertTrue(0.0 <= results[1]["win_rate"] <= 1.0)
+
+    def test_rejects_missing_queries(self):
+        self.assertEqual(self.client.post("/equity", json={}).status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Game event stream tests
+Run with: python3 test_event_stream.py
+"""
+
+import sys
+import os
+import json
+import unittest
+
+# Add the current directory to Python path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app as server
+from engine.broadcaster import GameBroadcaster
+
+
+def parse_frame(frame):
+    """Return (event, id, data) of a server-sent event frame"""
+    if isinstance(frame, bytes):
+        frame = frame.decode()
+    fields = dict(line.split(": ", 1) for line in frame.strip().split("\n"))
+    return fields.get("event"), fields.get("id"), json.loads(fields["data"])
+
+
+class TestGameBroadcaster(unittest.TestCase):
+
+    def setUp(self):
+        self.broadcaster = GameBroadcaster()
+
+    def test_publish_redacts_per_recipient(self):
+        """Players get their own hole cards, spectators only the public view"""
+        p1 = self.broadcaster.subscribe("G1", "p1")
+        p2 = self.broadcaster.subscribe("G1", "p2")
+        spectator = self.broadcaster.subscribe("G1")
+
+        self.broadcaster.publish("G1", 7, '{"street":0}', {"p1": '["CA","DK"]', "p2": '["H2","S3"]'})
+
+        event, version, data = parse_frame(p1.next_frame(timeout=0))
+        self.assertEqual(event, "state")
+        self.assertEqual(version, "7")
+        self.assertEqual(data, {"view": {"street": 0}, "hole_cards": ["CA", "DK"]})
+        self.assertEqual(parse_frame(p2.next_frame(timeout=0))[2]["hole_cards"], ["H2", "S3"])
+        self.assertEqual(parse_frame(spectator.next_frame(timeout=0))[2], {"view": {"street": 0}})
+
+    def test_slow_subscriber_keeps_latest_frame(self):
+        """Stale full-state frames are replaced rather than queued"""
+        subscription = self.broadcaster.subscribe("G1")
+        self.broadcaster.publish("G1", 1, '{}', {})
+        self.broadcaster.publish("G1", 2, '{}', {})
+        self.assertEqual(parse_frame(subscription.next_frame(timeout=0))[1], "2")
+        self.assertIsNone(subscription.next_frame(timeout=0))
+
+    def test_close_and_unsubscribe(self):
+        subscription = self.broadcaster.subscribe("G1", "p1")
+        self.assertTrue(self.broadcaster.has_subscribers("G1"))
+        self.broadcaster.close("G1")
+        self.assertEqual(subscription.next_frame(timeout=0), GameBroadcaster.END_FRAME)
+        self.assertFalse(self.broadcaster.has_subscribers("G1"))
+
+
+class TestStreamEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.client = server.app.test_client()
+        self.engine = server.engine
+        self.game_id = "test_event_stream_001"
+        response = self.client.post("/start-game", json={"game_id": self.game_id, "players": [
+            {"user_id": "player1", "stack": 100},
+            {"user_id": "player2", "stack": 100}
+        ]})
+        self.tokens = response.get_json()["player_tokens"]
+
+    def tearDown(self):
+        self.engine.end_game(self.game_id)
+
+    def test_stream_pushes_actions(self):
+        """A subscriber receives the current state and then each change"""
+        response = self.client.get(f"/stream/{self.game_id}?user_id=player1&token={self.tokens['player1']}",
+                                   buffered=False)
+        self.assertEqual(response.mimetype, "text/event-stream")
+        frames = iter(response.response)
+
+        _, version, data = parse_frame(next(frames))
+        self.assertEqual(int(version), self.engine.get_version(self.game_id))
+        self.assertEqual(len(data["hole_cards"]), 2)
+        self.assertTrue(all(p["hole_cards"] == [] for p in data["view"]["players"]))
+
+        self.engine.apply_action(self.game_id, "player1", "call", 1)
+        _, version, data = parse_frame(next(frames))
+        self.assertEqual(int(version), self.engine.get_version(self.game_id))
+        self.assertEqual(data["view"]["next_player"], "player2")
+
+        self.engine.end_game(self.game_id)
+        self.assertEqual(next(frames).decode(), GameBroadcaster.END_FRAME)
+        response.close()
+        self.assertFalse(server.broadcaster.has_subscribers(self.game_id))
+
+    def test_player_stream_needs_token(self):
+        """Nobody can subscribe as a player without that player's token"""
+        self.assertEqual(set(self.tokens), {"player1", "player2"})
+        for query in ["user_id=player1", f"user_id=player1&token={self.tokens['player2']}", "user_id=nobody&token=x"]:
+            response = self.client.get(f"/stream/{self.game_id}?{query}")
+            self.assertEqual(response.status_code, 403, query)
+        self.assertFalse(server.broadcaster.has_subscribers(self.game_id))
+
+        response = self.client.get(f"/stream/{self.game_id}", buffered=False)
+        _, _, data = parse_frame(next(iter(response.response)))
+        self.assertNotIn("hole_cards", data)
+        response.close()
+
+    def test_stream_unknown_game(self):
+        response = self.client.get("/stream/NO_SUCH_GAME")
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Resumable game and scheduler tests
+Run with: python3 test_game_runner.py
+"""
+
+import sys
+import os
+import threading
+import unittest
+
+# Add the current directory to Python path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pypokerengine.api.game import setup_config
+from examples.players.fish_player import FishPlayer
+from engine.game_runner import DeferredPlayer, ResumableGame, GameScheduler
+
+
+class RecordingPlayer(DeferredPlayer):
+    """Deferred player that only records what it was asked"""
+
+    def __init__(self):
+        self.requests = []
+        self.results = []
+
+    def request_action(self, valid_actions, hole_card, round_state):
+        self.requests.append([a["action"] for a in valid_actions])
+
+    def receive_game_start_message(self, game_info):
+        pass
+
+    def receive_round_start_message(self, round_count, hole_card, seats):
+        pass
+
+    def receive_street_start_message(self, street, round_state):
+        pass
+
+    def receive_game_update_message(self, action, round_state):
+        pass
+
+    def receive_round_result_message(self, winners, hand_info, round_state):
+        self.results.append(winners)
+
+
+def make_game(human, max_round=2, on_finish=None):
+    config = setup_config(max_round=max_round, initial_stack=100, small_blind_amount=5)
+    config.register_player(name="human", algorithm=human)
+    config.register_player(name="fish", algorithm=FishPlayer())
+    return ResumableGame("G1", config, on_finish=on_finish)
+
+
+class TestResumableGame(unittest.TestCase):
+
+    def test_parks_until_the_deferred_player_decides(self):
+        human = RecordingPlayer()
+        game = make_game(human)
+
+        self.assertEqual(game.run(), ResumableGame.WAITING)
+        self.assertEqual(len(human.requests), 1)
+        uuid = game.pending_player
+
+        # Running a waiting game does nothing and does not ask again
+        self.assertEqual(game.run(), ResumableGame.WAITING)
+        self.assertEqual(len(human.requests), 1)
+
+        self.assertEqual(game.submit_action("someone_else", "fold", 0), "Not your turn")
+        self.assertIn("Invalid action", game.submit_action(uuid, "shove", 0))
+        self.assertIsNone(game.submit_action(uuid, "fold", 0))
+        self.assertIsNotNone(game.submit_action(uuid, "fold", 0))  # Already answered
+
+        game.run()
+        self.assertEqual(len(human.results), 1)
+
+    def test_game_finishes_with_result(self):
+        human = RecordingPlayer()
+        game = make_game(human)
+        while game.run() == ResumableGame.WAITING:
+            game.submit_action(game.pending_player, "fold", 0)
+
+        self.assertEqual(game.status, ResumableGame.FINISHED)
+        self.assertEqual(len(human.results), 2)
+        stacks = sorted(p["stack"] for p in game.result["players"])
+        self.assertEqual(sum(stacks), 200)
+        self.assertEqual(game.result["rule"]["max_round"], 2)
+
+
+class TestGameScheduler(unittest.TestCase):
+
+    def test_waiting_games_hold_no_worker(self):
+        scheduler = GameScheduler(max_workers=1)
+        finished = threading.Event()
+        human = RecordingPlayer()
+        game = make_game(human, on_finish=lambda game, result: finished.set())
+        try:
+            scheduler.start(game).result(timeout=5)
+            self.assertEqual(scheduler.waiting_games(), [game])
+            with self.assertRaises(ValueError):
+                scheduler.start(game)
+
+            # A single worker is enough for another game while the first one waits
+            other = make_game(RecordingPlayer())
+            other.game_id = "G2"
+            scheduler.start(other).result(timeout=5)
+            self.assertEqual(len(scheduler.waiting_games()), 2)
+
+            self.assertEqual(scheduler.submit_action("NO_SUCH_GAME", "x", "fold"), "Game not found")
+            while not finished.wait(0.01):
+                if game.status == ResumableGame.WAITING:
+                    self.assertIsNone(scheduler.submit_action("G1", game.pending_player, "fold"))
+            self.assertNotIn("G1", scheduler.games)
+            self.assertEqual(len(human.results), 2)
+        finally:
+            scheduler.shutdown()
+
+    def test_deferred_only_refuses_blocking_players(self):
+        scheduler = GameScheduler(max_workers=1, deferred_only=True)
+        try:
+            with self.assertRaises(TypeError) as raised:
+                scheduler.start(make_game(RecordingPlayer()))
+            self.assertIn("fish", str(raised.exception))
+            self.assertEqual(scheduler.games, {})
+
+            config = setup_config(max_round=1, initial_stack=100, small_blind_amount=5)
+            config.register_player(name="human1", algorithm=RecordingPlayer())
+            config.register_player(name="human2", algorithm=RecordingPlayer())
+            scheduler.start(ResumableGame("G3", config)).result(timeout=5)
+            self.assertEqual(len(scheduler.waiting_games()), 1)
+        finally:
+            scheduler.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
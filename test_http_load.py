@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+HTTP load harness tests
+Run with: python3 test_http_load.py
+"""
+
+import sys
+import os
+import json
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the current directory to Python path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmarks.http_load import ApiClient, LatencyRecorder, LocalServer, game_id_of, route_of, run_workers, main
+
+
+class BrokenProxy(BaseHTTPRequestHandler):
+    """Answers every request with an HTML error page, like a proxy in front of a dead server"""
+
+    def do_GET(self):
+        body = b"<html>502 Bad Gateway</html>"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestParsing(unittest.TestCase):
+
+    def test_route_of(self):
+        self.assertEqual(route_of("/state/G1?since=3"), "/state")
+        self.assertEqual(route_of("/start-game"), "/start-game")
+
+    def test_game_id_of(self):
+        self.assertEqual(game_id_of({"path": "/action", "body": {"game_id": "G1"}}), "G1")
+        self.assertEqual(game_id_of({"path": "/batch-action", "body": {"actions": [{"game_id": "G2"}]}}), "G2")
+        self.assertEqual(game_id_of({"path": "/state/G3?since=1", "body": None}), "G3")
+        self.assertIsNone(game_id_of({"path": "/metrics", "body": None}))
+
+    def test_worker_failure_fails_the_run(self):
+        def worker(index):
+            if index == 1:
+                raise KeyError("boom")
+
+        with self.assertRaises(RuntimeError):
+            run_workers(worker, 2)
+
+
+class TestApiClient(unittest.TestCase):
+
+    def test_non_json_body_is_a_failed_request(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), BrokenProxy)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        recorder = LatencyRecorder()
+        client = ApiClient(f"http://127.0.0.1:{server.server_address[1]}", recorder)
+        try:
+            self.assertEqual(client.request("GET", "/state/G1"), (None, None, {}))
+        finally:
+            client.close()
+            server.shutdown()
+            server.server_close()
+
+        summary = recorder.summary(1.0)["routes"]["/state"]
+        self.assertEqual((summary["requests"], summary["errors"]), (1, 1))
+
+
+class TestRecordAndReplay(unittest.TestCase):
+
+    def test_replay_sends_the_recorded_requests(self):
+        server = LocalServer()
+        server.start()
+        path = os.path.join(tempfile.mkdtemp(), "run.jsonl")
+        common = ["--url", server.url, "--concurrency", "2", "--json"]
+        try:
+            recorded = main(["simulate", "--games", "3", "--seed", "1", "--record", path] + common)
+            with open(path) as f:
+                entries = [json.loads(line) for line in f]
+            replayed = main(["replay", path] + common)
+        finally:
+            server.stop()
+
+        self.assertEqual(len(entries), recorded["requests"])
+        self.assertEqual(recorded["games"], 3)
+        self.assertEqual(replayed["games"], 3)
+        self.assertEqual(replayed["requests"], recorded["requests"])
+        self.assertEqual({route: stats["requests"] for route, stats in replayed["routes"].items()},
+                         {route: stats["requests"] for route, stats in recorded["routes"].items()})
+        self.assertEqual(sum(stats["errors"] for stats in recorded["routes"].values()), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Metrics registry and /metrics endpoint tests
+Run with: python3 test_metrics.py
+"""
+
+import sys
+import os
+import unittest
+
+# Add the current directory to Python path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app as server
+from engine.metrics import MetricsRegistry, REGISTRY
+
+
+class TestMetricsRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter_and_gauge_exposition(self):
+        counter = self.registry.counter("requests_total", "Requests", ["route"])
+        counter.inc(route="/state")
+        counter.inc(2, route="/state")
+        gauge = self.registry.gauge("games", "Games")
+        gauge.set(3)
+
+        text = self.registry.expose()
+        self.assertIn("# TYPE requests_total counter", text)
+        self.assertIn('requests_total{route="/state"} 3', text)
+        self.assertIn("# TYPE games gauge\ngames 3", text)
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = self.registry.histogram("latency", "Latency", ["view"], buckets=(0.1, 1.0))
+        histogram.observe(0.05, view="state")
+        histogram.observe(0.5, view="state")
+        histogram.observe(5, view="state")
+
+        lines = self.registry.expose().splitlines()
+        self.assertIn('latency_bucket{view="state",le="0.1"} 1', lines)
+        self.assertIn('latency_bucket{view="state",le="1.0"} 2', lines)
+        self.assertIn('latency_bucket{view="state",le="+Inf"} 3', lines)
+        self.assertIn('latency_count{view="state"} 3', lines)
+        self.assertEqual(histogram.count(view="state"), 3)
+
+    def test_register_is_idempotent(self):
+        first = self.registry.counter("actions_total", "Actions", ["action"])
+        self.assertIs(self.registry.counter("actions_total", "Actions", ["action"]), first)
+        with self.assertRaises(ValueError):
+            self.registry.gauge("actions_total", "Actions")
+        with self.assertRaises(ValueError):
+            first.inc(route="/action")
+
+
+class TestMetricsEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.client = server.app.test_client()
+        self.engine = server.engine
+        self.game_id = "test_metrics_001"
+        self.client.post("/start-game", json={"game_id": self.game_id, "players": [
+            {"user_id": "player1", "stack": 100},
+            {"user_id": "player2", "stack": 100}
+        ]})
+
+    def tearDown(self):
+        self.engine.end_game(self.game_id)
+
+    def test_requests_and_actions_are_recorded(self):
+        requests_total = REGISTRY.get("poker_http_requests_total")
+        actions_total = REGISTRY.get("poker_actions_total")
+        polls_before = requests_total.value(route="/state/<game_id>", method="GET", status="200")
+        calls_before = actions_total.value(action="call", result="ok")
+
+        self.client.post("/action", json={
+            "game_id": self.game_id, "user_id": "player1", "action": "call", "amount": 1
+        })
+        self.client.get(f"/state/{self.game_id}")
+
+        self.assertEqual(requests_total.value(route="/state/<game_id>", method="GET", status="200"), polls_before + 1)
+        self.assertEqual(actions_total.value(action="call", result="ok"), calls_before + 1)
+
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content_type, MetricsRegistry.CONTENT_TYPE)
+        text = response.get_data(as_text=True)
+        self.assertIn('poker_apply_action_seconds_count{action="call"}', text)
+        self.assertIn('poker_render_seconds_count{view="state"}', text)
+        self.assertIn("poker_games_active", text)
+
+    def test_unknown_actions_share_one_label(self):
+        actions_total = REGISTRY.get("poker_actions_total")
+        before = actions_total.value(action="unknown", result="error")
+        self.engine.apply_action(self.game_id, "player1", "shove-it", 0)
+        self.assertEqual(actions_total.value(action="unknown", result="error"), before + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Multi-hand session tests
+Run with: python3 test_sessions.py
+"""
+
+import sys
+import os
+import unittest
+from unittest import mock
+
+# Add the current directory to Python path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app as server
+from pypokerengine.engine.poker_constants import PokerConstants as Const
+from pypokerengine.engine.game_evaluator import GameEvaluator
+
+
+class TestSessions(unittest.TestCase):
+
+    def setUp(self):
+        self.client = server.app.test_client()
+        self.engine = server.engine
+        self.game_id = "test_sessions_001"
+
+    def tearDown(self):
+        self.engine.end_game(self.game_id)
+
+    def start(self, *user_ids):
+        players = [{"user_id": user_id, "stack": 100} for user_id in user_ids]
+        return self.engine.start_game(self.game_id, players)
+
+    def test_next_hand_reuses_table_and_moves_button(self):
+        """The pot goes to the winner and the next hand is dealt on the same table"""
+        self.start("player1", "player2", "player3")
+        table = self.engine.games[self.game_id]["table"]
+
+        # Dealer (player1) and small blind fold, the big blind wins the blinds
+        self.engine.apply_action(self.game_id, "player1", "fold", 0)
+        self.engine.apply_action(self.game_id, "player2", "fold", 0)
+        self.assertEqual(self.engine.games[self.game_id]["current_state"]["street"], Const.Street.SHOWDOWN)
+
+        result = self.engine.next_hand(self.game_id)
+        self.assertNotIn("error", result)
+        game = self.engine.games[self.game_id]
+        self.assertIs(game["table"], table)
+        self.assertEqual(game["current_state"]["round_count"], 2)
+        self.assertEqual(table.dealer_btn, 1)
+        self.assertEqual(result["round_state"]["sb_pos"], 2)
+        self.assertEqual(result["round_state"]["bb_pos"], 0)
+        self.assertEqual(len(table.get_community_card()), 0)
+        self.assertTrue(all(len(p.hole_card) == 2 for p in table.seats.players))
+
+        # player3 won the blinds and then posted the small blind, player1 posted the big blind
+        stacks = [p.stack for p in table.seats.players]
+        self.assertEqual(stacks, [100 - 2, 100 - 1, 100 - 2 + 3 - 1])
+        self.assertEqual(game["current_state"]["next_player"], 1)
+
+    def test_next_hand_requires_finished_hand(self):
+        self.start("player1", "player2")
+        self.assertEqual(self.engine.next_hand(self.game_id), {"error": "Current hand is not over yet"})
+
+    def test_busted_player_sits_out(self):
+        """A player without chips is skipped for blinds, cards and positions"""
+        self.start("player1", "player2", "player3")
+        table = self.engine.games[self.game_id]["table"]
+        self.engine.apply_action(self.game_id, "player1", "fold", 0)
+        self.engine.apply_action(self.game_id, "player2", "fold", 0)
+        table.seats.players[0].stack = 0
+
+        self.engine.next_hand(self.game_id)
+        busted = table.seats.players[0]
+        self.assertFalse(busted.is_active())
+        self.assertEqual(busted.hole_card, [])
+        self.assertEqual(busted.position, "none")
+
+        # Heads-up between the remaining players: the dealer posts the small blind
+        self.assertEqual(table.dealer_btn, 1)
+        self.assertEqual((table.sb_pos(), table.bb_pos()), (1, 2))
+
+    def play_to_flop(self, *actions):
+        for user_id, action in actions:
+            result = self.engine.apply_action(self.game_id, user_id, action, 0)
+            self.assertNotIn("error", result)
+        state = self.engine.games[self.game_id]["current_state"]
+        self.assertEqual(state["street"], Const.Street.FLOP)
+        return state
+
+    def test_folded_button_does_not_act_postflop(self):
+        """Over several hands the first postflop actor is the first player left of the button still in"""
+        self.start("player1", "player2", "player3")
+
+        # Hand 1: the button (player1) folds, the blinds see a flop
+        state = self.play_to_flop(("player1", "fold"), ("player2", "call"), ("player3", "check"))
+        self.assertEqual(state["next_player"], 1)
+        self.engine.apply_action(self.game_id, "player2", "check", 0)
+        self.assertEqual(state["next_player"], 2)
+        self.engine.apply_action(self.game_id, "player3", "raise", 5)
+        self.engine.apply_action(self.game_id, "player2", "fold", 0)
+        self.engine.next_hand(self.game_id)
+
+        # Hand 2: the button moved to player2, who folds as well
+        table = self.engine.games[self.game_id]["table"]
+        self.assertEqual(table.dealer_btn, 1)
+        state = self.play_to_flop(("player2", "fold"), ("player3", "call"), ("player1", "check"))
+        self.assertEqual(state["next_player"], 2)
+
+    def test_busted_button_seat_does_not_act_postflop(self):
+        """Heads-up after a bust: the big blind acts first postflop and the busted seat is skipped"""
+        self.start("player1", "player2", "player3")
+        table = self.engine.games[self.game_id]["table"]
+        self.engine.apply_action(self.game_id, "player1", "fold", 0)
+        self.engine.apply_action(self.game_id, "player2", "fold", 0)
+        table.seats.players[0].stack = 0
+        self.engine.next_hand(self.game_id)
+        self.assertEqual((table.dealer_btn, table.sb_pos(), table.bb_pos()), (1, 1, 2))
+
+        state = self.play_to_flop(("player2", "call"), ("player3", "check"))
+        self.assertEqual(state["next_player"], 2)
+        self.engine.apply_action(self.game_id, "player3", "check", 0)
+        self.assertEqual(state["next_player"], 1)
+
+    def test_board_runs_out_when_nobody_can_bet(self):
+        self.start("player1", "player2")
+        self.engine.apply_action(self.game_id, "player1", "raise", 99)
+        self.engine.apply_action(self.game_id, "player2", "call", 0)
+        state = self.engine.games[self.game_id]["current_state"]
+        self.assertEqual(state["street"], Const.Street.SHOWDOWN)
+        self.assertEqual(len(self.engine.games[self.game_id]["table"].get_community_card()), 5)
+
+    def start_unequal_hand(self):
+        """Second hand with stacks 45 / 10 / 101; player2 is on the button and all-in first"""
+        self.start("player1", "player2", "player3")
+        table = self.engine.games[self.game_id]["table"]
+        self.engine.apply_action(self.game_id, "player1", "fold", 0)
+        self.engine.apply_action(self.game_id, "player2", "fold", 0)
+        self.engine.next_hand(self.game_id)
+        table.seats.players[0].stack, table.seats.players[1].stack = 45 - 2, 10  # player1 has posted the big blind
+        self.engine.apply_action(self.game_id, "player2", "raise", 10)
+        self.engine.apply_action(self.game_id, "player3", "raise", 29)
+        result = self.engine.apply_action(self.game_id, "player1", "call", 0)
+        self.assertEqual(result["current_street"], Const.Street.FLOP)  # The all-in for less does not hold up the street
+        return table
+
+    def test_unequal_stacks_reach_showdown(self):
+        """Two short all-ins: side pots are judged and the bettor's excess comes back"""
+        table = self.start_unequal_hand()
+        state = self.engine.games[self.game_id]["current_state"]
+        self.assertEqual(state["next_player"], 2)  # The button is all-in
+        self.engine.apply_action(self.game_id, "player3", "raise", 30)
+        self.engine.apply_action(self.game_id, "player1", "raise", 15)  # All-in for less
+
+        state = self.engine.games[self.game_id]["current_state"]
+        self.assertEqual(state["street"], Const.Street.SHOWDOWN)
+        self.assertEqual(len(table.get_community_card()), 5)
+        prize_map = state["showdown_results"]["prize_map"]
+        self.assertGreaterEqual(prize_map[2], 60 - 45)  # Nobody else covered the last 15
+        self.assertEqual(sum(prize_map.values()), 45 + 10 + 60)
+
+        # Paid out whether or not player3 took every chip and ended the game
+        result = self.engine.next_hand(self.game_id)
+        in_pot = 0 if "error" in result else sum(p.pay_info.amount for p in table.seats.players)
+        self.assertEqual(sum(p.stack for p in table.seats.players) + in_pot, 45 + 10 + 101)
+
+    def test_failed_judge_keeps_hand_open(self):
+        self.start("player1", "player2")
+        with mock.patch.object(GameEvaluator, "judge", side_effect=ValueError("no eligible player")):
+            self.engine.apply_action(self.game_id, "player1", "raise", 99)
+            self.engine.apply_action(self.game_id, "player2", "call", 0)
+        state = self.engine.games[self.game_id]["current_state"]
+        self.assertEqual(state["street"], Const.Street.RIVER)
+        self.assertNotIn("showdown_results", state)
+        self.assertEqual(self.engine.next_hand(self.game_id), {"error": "Current hand is not over yet"})
+
+    def test_uncalled_chips_return_on_fold_win(self):
+        """The short all-in player wins only what it covered from each player"""
+        table = self.start_unequal_hand()
+        self.engine.apply_action(self.game_id, "player3", "fold", 0)
+        self.engine.apply_action(self.game_id, "player1", "fold", 0)
+
+        showdown_results = self.engine.games[self.game_id]["current_state"]["showdown_results"]
+        self.assertEqual(showdown_results["prize_map"], {1: 30})
+        self.assertEqual([p.stack for p in table.seats.players], [15 + 20, 0, 71 + 20])
+
+    def test_next_hand_without_result_is_an_error(self):
+        self.start("player1", "player2")
+        state = self.engine.games[self.game_id]["current_state"]
+        state["street"] = Const.Street.SHOWDOWN
+        self.assertEqual(self.engine.next_hand(self.game_id), {"error": "Current hand has no result to pay out"})
+
+    def test_small_blind_amount(self):
+        players = [{"user_id": "player1", "stack": 100}, {"user_id": "player2", "stack": 100}]
+        self.assertIn("error", self.engine.start_game(self.game_id, players, small_blind_amount=0))
+        self.engine.start_game(self.game_id, players, small_blind_amount=5)
+        table = self.engine.games[self.game_id]["table"]
+        self.assertEqual([p.pay_info.amount for p in table.seats.players], [5, 10])
+
+        self.engine.apply_action(self.game_id, "player1", "fold", 0)
+        self.engine.next_hand(self.game_id)
+        self.assertEqual([p.pay_info.amount for p in table.seats.players], [10, 5])
+
+        data = self.client.post("/start-game", json={
+            "game_id": self.game_id, "players": players, "small_blind_amount": 2}).get_json()
+        self.assertEqual(data["total_pot"], 6)
+
+    def test_game_over_when_one_player_has_chips(self):
+        self.start("player1", "player2")
+        table = self.engine.games[self.game_id]["table"]
+        self.engine.apply_action(self.game_id, "player1", "fold", 0)
+        table.seats.players[0].stack = 0
+
+        self.assertIn("error", self.engine.next_hand(self.game_id))
+        self.assertEqual(self.engine.games[self.game_id]["status"], "finished")
+        self.assertEqual(table.seats.players[1].stack, 100 + 1)
+
+        # The pot is paid out only once
+        self.engine.next_hand(self.game_id)
+        self.assertEqual(table.seats.players[1].stack, 100 + 1)
+
+    def test_next_hand_endpoint(self):
+        self.start("player1", "player2")
+        self.assertEqual(self.client.post(f"/next-hand/{self.game_id}").status_code, 400)
+
+        self.engine.apply_action(self.game_id, "player1", "fold", 0)
+        response = self.client.post(f"/next-hand/{self.game_id}")
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertFalse(data["is_hand_over"])
+        self.assertEqual(data["next_player"], "player2")
+        self.assertEqual(data["version"], self.engine.get_version(self.game_id))
+
+
+if __name__ == "__main__":
+    unittest.main()
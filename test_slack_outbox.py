@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Slack outbox coalescing and retry tests
+Run with: python3 test_slack_outbox.py
+"""
+
+import sys
+import os
+import time
+import unittest
+
+# Add the current directory to Python path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pypokerengine.api.game import setup_config
+from examples.players.fish_player import FishPlayer
+from engine.game_runner import DeferredPlayer, ResumableGame
+from engine.slack_outbox import SlackOutbox, StubSlackClient
+
+
+class RateLimited(Exception):
+    """Looks like slack_sdk's SlackApiError for a 429 response"""
+
+    class Response:
+        status_code = 429
+        headers = {"Retry-After": "7"}
+
+    response = Response()
+
+
+class ChattyPlayer(DeferredPlayer):
+    """Posts every notification it gets, like the Slack player does"""
+
+    def __init__(self, channel, slack_client):
+        self.channel = channel
+        self.slack_client = slack_client
+
+    def post(self, text, blocks=None):
+        self.slack_client.chat_postMessage(channel=self.channel, text=text, blocks=blocks)
+
+    def request_action(self, valid_actions, hole_card, round_state):
+        self.post("Your turn", blocks=[{"type": "actions", "elements": []}])
+
+    def receive_game_start_message(self, game_info):
+        self.post("Game started")
+
+    def receive_round_start_message(self, round_count, hole_card, seats):
+        self.post(f"Round {round_count}")
+
+    def receive_street_start_message(self, street, round_state):
+        self.post(f"Street {street}")
+
+    def receive_game_update_message(self, action, round_state):
+        self.post(f"{action['action']}")
+
+    def receive_round_result_message(self, winners, hand_info, round_state):
+        self.post("Round over")
+
+
+class TestSlackOutbox(unittest.TestCase):
+
+    def setUp(self):
+        self.client = StubSlackClient()
+        self.scheduled = []  # (delay, callback) of retries, run by the test instead of a timer
+        self.outbox = SlackOutbox(self.client, max_retries=2, backoff=0.5,
+                                  schedule=lambda delay, callback: self.scheduled.append((delay, callback)))
+
+    def run_retries(self):
+        delays = []
+        while self.scheduled:
+            delay, callback = self.scheduled.pop(0)
+            delays.append(delay)
+            callback()
+        return delays
+
+    def test_coalesces_per_channel(self):
+        self.outbox.chat_postMessage(channel="U1", text="a")
+        self.outbox.chat_postMessage(channel="U2", text="b")
+        self.outbox.chat_postMessage(channel="U1", text="c", blocks=[{"type": "actions"}])
+        self.assertEqual(self.client.calls, [])
+        self.assertEqual(self.outbox.pending(), 3)
+
+        self.assertEqual(self.outbox.flush(), 2)
+        u1 = self.client.messages_for("U1")
+        self.assertEqual(len(u1), 1)
+        self.assertEqual(u1[0]["text"], "a\nc")
+        self.assertEqual([b["type"] for b in u1[0]["blocks"]], ["section", "actions"])
+        self.assertEqual(self.client.messages_for("U2"), [{"channel": "U2", "text": "b"}])
+        self.assertEqual(self.outbox.flush(), 0)
+
+    def test_retries_with_backoff(self):
+        self.client.fail_times = 2
+        self.outbox.chat_postMessage(channel="U1", text="a")
+        # flush does not wait for the retry, it is scheduled
+        self.assertEqual(self.outbox.flush(), 0)
+        self.assertEqual(self.outbox.retrying(), 1)
+        self.assertEqual(self.run_retries(), [0.5, 1.0])
+        self.assertEqual(self.client.calls, [{"channel": "U1", "text": "a"}])
+        self.assertEqual(self.outbox.retrying(), 0)
+
+    def test_messages_wait_behind_a_retry(self):
+        self.client.fail_times = 1
+        self.outbox.chat_postMessage(channel="U1", text="a")
+        self.outbox.flush()
+        self.outbox.chat_postMessage(channel="U1", text="b")
+        self.outbox.chat_postMessage(channel="U2", text="c")
+        self.assertEqual(self.outbox.flush(), 1)  # U2 only; U1 keeps its order
+        self.assertEqual(self.outbox.pending(), 1)
+
+        self.run_retries()
+        self.assertEqual([call["text"] for call in self.client.messages_for("U1")], ["a", "b"])
+        self.assertEqual(self.outbox.pending(), 0)
+
+    def test_honours_retry_after_and_gives_up(self):
+        def rate_limited(channel, **kwargs):
+            raise RateLimited()
+
+        self.client.chat_postMessage = rate_limited
+        self.outbox.chat_postMessage(channel="U1", text="a")
+        self.assertEqual(self.outbox.flush(), 0)
+        self.assertEqual(self.run_retries(), [7.0, 7.0])
+        self.assertEqual(self.outbox.pending(), 0)  # Dropped, not resent with the next update
+        self.assertEqual(self.outbox.retrying(), 0)
+
+    def test_default_schedule_retries_on_a_timer(self):
+        client = StubSlackClient(fail_times=1)
+        outbox = SlackOutbox(client, backoff=0.01)
+        outbox.chat_postMessage(channel="U1", text="a")
+        self.assertEqual(outbox.flush(), 0)
+        deadline = time.time() + 2
+        while not client.calls and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(client.calls, [{"channel": "U1", "text": "a"}])
+
+
+class TestGameOutbox(unittest.TestCase):
+
+    def test_one_message_per_player_between_decisions(self):
+        client = StubSlackClient()
+        outbox = SlackOutbox(client)
+        config = setup_config(max_round=3, initial_stack=100, small_blind_amount=5)
+        config.register_player(name="human", algorithm=ChattyPlayer("U1", outbox))
+        config.register_player(name="fish", algorithm=FishPlayer())
+        game = ResumableGame("G1", config, outbox=outbox)
+
+        decisions = 0
+        while game.run() == ResumableGame.WAITING:
+            decisions += 1
+            # Game start, round start and street start all arrive with the first ask
+            self.assertEqual(len(client.calls), decisions)
+            self.assertIn("Your turn", client.calls[-1]["text"])
+            game.submit_action(game.pending_player, "call", 10)
+
+        self.assertEqual(game.status, ResumableGame.FINISHED)
+        self.assertIn("Game started", client.calls[0]["text"])
+        self.assertLessEqual(len(client.calls), decisions + 1)
+        self.assertEqual(outbox.pending(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Slack player and button handler tests
+Run with: python3 test_slackbot.py
+"""
+
+import sys
+import os
+import json
+import time
+import unittest
+
+# Add the current directory to Python path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pypokerengine.api.game import setup_config
+from engine.game_runner import GameScheduler, ResumableGame
+from engine.slack_outbox import SlackOutbox, StubSlackClient
+from slackbot.lobby_manager import LobbyManager
+from slackbot.slack_handlers import register_handlers
+from slackbot.slack_player import SlackPlayer
+
+
+class FakeApp:
+    """Collects the handlers slack_bolt's App.action would register"""
+
+    def __init__(self):
+        self.actions = []
+
+    def action(self, pattern):
+        def register(handler):
+            self.actions.append((pattern, handler))
+            return handler
+        return register
+
+    def click(self, user_id, button):
+        """Deliver a button click the way slack_bolt does; returns what was sent back to the user"""
+        pattern, handler = next((p, h) for p, h in self.actions if p.match(button["action_id"]))
+        responses = []
+        body = {"user": {"id": user_id}, "actions": [button]}
+        handler(ack=lambda: None, body=body, respond=responses.append)
+        return responses
+
+
+def wait_until_parked(game, timeout=5):
+    deadline = time.time() + timeout
+    while game.status == ResumableGame.READY and time.time() < deadline:
+        time.sleep(0.01)
+    return game.status
+
+
+class TestSlackBot(unittest.TestCase):
+
+    def setUp(self):
+        self.client = StubSlackClient()
+        self.outbox = SlackOutbox(self.client)
+        self.scheduler = GameScheduler(max_workers=2, deferred_only=True)
+        self.app = FakeApp()
+        register_handlers(self.app, self.scheduler)
+
+        config = setup_config(max_round=2, initial_stack=100, small_blind_amount=5)
+        for uid in ["U1", "U2"]:
+            config.register_player(name=uid, algorithm=SlackPlayer(uid, self.outbox, game_id="ABCD"))
+        self.game = ResumableGame("ABCD", config, outbox=self.outbox)
+
+    def tearDown(self):
+        self.scheduler.shutdown()
+
+    def last_buttons(self):
+        message = next(call for call in reversed(self.client.calls) if call.get("blocks"))
+        return message["channel"], message["blocks"][-1]["elements"]
+
+    def test_game_runs_on_deferred_only_scheduler(self):
+        self.scheduler.start(self.game)
+        self.assertEqual(wait_until_parked(self.game), ResumableGame.WAITING)
+
+        clicks = 0
+        while self.game.status == ResumableGame.WAITING:
+            channel, buttons = self.last_buttons()
+            self.assertEqual([json.loads(b["value"])["action"] for b in buttons][:2], ["fold", "call"])
+            self.assertEqual(self.app.click(channel, buttons[1]), [])
+            clicks += 1
+            wait_until_parked(self.game)
+
+        self.assertEqual(self.game.status, ResumableGame.FINISHED)
+        self.assertGreater(clicks, 0)
+        self.assertNotIn("ABCD", self.scheduler.games)
+
+    def test_rejects_another_players_click(self):
+        self.scheduler.start(self.game)
+        wait_until_parked(self.game)
+        channel, buttons = self.last_buttons()
+        other = "U2" if channel == "U1" else "U1"
+
+        self.assertEqual(self.app.click(other, buttons[0]), ["⚠️ That button belongs to another player"])
+        self.assertEqual(self.game.status, ResumableGame.WAITING)
+        self.assertEqual(json.loads(buttons[0]["value"])["action"], "fold")
+
+
+class TestLobbyManager(unittest.TestCase):
+
+    def test_lobby_lifecycle(self):
+        lobbies = LobbyManager()
+        code = lobbies.create_lobby("U1")
+        self.assertEqual(len(code), 4)
+        self.assertTrue(lobbies.is_owner("U1", code))
+
+        self.assertTrue(lobbies.join_lobby("U2", code)[0])
+        self.assertFalse(lobbies.join_lobby("U2", code)[0])
+        self.assertFalse(lobbies.join_lobby("U3", "ZZZZZ")[0])
+        self.assertEqual(lobbies.get_players(code), ["U1", "U2"])
+
+        lobbies.clear_lobby(code)
+        self.assertEqual(lobbies.get_players(code), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Versioned state view tests
+Run with: python3 test_state_views.py
+"""
+
+import sys
+import os
+import unittest
+
+# Add the current directory to Python path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app as server
+
+
+class TestStateViews(unittest.TestCase):
+
+    def setUp(self):
+        """Use a fresh test client against the module level engine"""
+        self.client = server.app.test_client()
+        self.engine = server.engine
+        self.game_id = "test_state_views_001"
+        self.players = [
+            {"user_id": "player1", "stack": 100},
+            {"user_id": "player2", "stack": 100}
+        ]
+        self.client.post("/start-game", json={"game_id": self.game_id, "players": self.players})
+
+    def tearDown(self):
+        self.engine.end_game(self.game_id)
+
+    def test_version_increases_on_action(self):
+        """Every applied action moves the game to a newer version"""
+        before = self.engine.get_version(self.game_id)
+        self.engine.apply_action(self.game_id, "player1", "call", 1)
+        self.assertGreater(self.engine.get_version(self.game_id), before)
+
+    def test_rejected_action_keeps_version(self):
+        """Actions rejected before touching the table do not invalidate views"""
+        before = self.engine.get_version(self.game_id)
+        self.engine.apply_action(self.game_id, "player2", "call", 0)  # Not player2's turn
+        self.assertEqual(self.engine.get_version(self.game_id), before)
+
+    def test_view_rendered_once_per_version(self):
+        """The cached view is reused until the state changes"""
+        calls = []
+        render = lambda gid: calls.append(gid) or len(calls)
+
+        self.assertEqual(self.engine.get_view(self.game_id, "probe", render), 1)
+        self.assertEqual(self.engine.get_view(self.game_id, "probe", render), 1)
+        self.engine.apply_action(self.game_id, "player1", "call", 1)
+        self.assertEqual(self.engine.get_view(self.game_id, "probe", render), 2)
+
+    def test_state_conditional_get(self):
+        """/state answers 304 while the client's ETag is still current"""
+        response = self.client.get(f"/state/{self.game_id}")
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers["ETag"]
+        self.assertEqual(response.get_json()["game_id"], self.game_id)
+
+        response = self.client.get(f"/state/{self.game_id}", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b"")
+
+        action_response = self.client.post("/action", json={
+            "game_id": self.game_id, "user_id": "player1", "action": "call", "amount": 1
+        })
+        self.assertNotEqual(action_response.headers["ETag"], etag)
+
+        response = self.client.get(f"/state/{self.game_id}", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["ETag"], action_response.headers["ETag"])
+
+    def test_state_delta_since_version(self):
+        """/state?since= returns only the fields that changed"""
+        version = self.client.get(f"/state/{self.game_id}").get_json()["version"]
+        self.engine.apply_action(self.game_id, "player1", "call", 1)
+
+        delta = self.client.get(f"/state/{self.game_id}?since={version}").get_json()
+        self.assertTrue(delta["delta"])
+        self.assertEqual(delta["since"], version)
+        self.assertEqual(delta["version"], self.engine.get_version(self.game_id))
+        self.assertEqual(delta["players"], [{"user_id": "player1", "stack": 98}])
+        self.assertEqual(delta["pot"], [{"user_id": "player1", "delta": 1}])
+        self.assertEqual(delta["new_community_cards"], [])
+        self.assertEqual(delta["next_player"], "player2")
+
+    def test_action_delta_across_street(self):
+        """/action with since_version reports the dealt flop and the next actor's options"""
+        version = self.engine.get_version(self.game_id)
+        self.engine.apply_action(self.game_id, "player1", "call", 1)
+
+        delta = self.client.post("/action", json={
+            "game_id": self.game_id, "user_id": "player2", "action": "check", "since_version": version
+        }).get_json()
+        self.assertTrue(delta["delta"])
+        self.assertEqual(delta["action_applied"], "check")
+        self.assertEqual(len(delta["new_community_cards"]), 3)
+        self.assertEqual(delta["street"], 1)
+        self.assertEqual(delta["next_player"], "player2")  # the big blind acts first postflop
+        self.assertEqual(delta["valid_actions"][1]["action"], "check")
+
+    def test_delta_across_next_hand(self):
+        """A delta spanning /next-hand is answered with the full state and the new hole cards"""
+        version = self.engine.get_version(self.game_id)
+        self.engine.apply_action(self.game_id, "player1", "fold", 0)
+        self.assertEqual(self.client.post(f"/next-hand/{self.game_id}").status_code, 200)
+
+        response = self.client.get(f"/state/{self.game_id}?since={version}").get_json()
+        self.assertNotIn("delta", response)
+        table = self.engine.games[self.game_id]["table"]
+        for player, seat in zip(response["players"], table.seats.players):
+            self.assertEqual(player["hole_cards"], [str(card) for card in seat.hole_card])
+            self.assertEqual(len(player["hole_cards"]), 2)
+
+        delta = self.client.post("/action", json={
+            "game_id": self.game_id, "user_id": response["next_player"], "action": "call", "amount": 1,
+            "since_version": version
+        }).get_json()
+        self.assertNotIn("delta", delta)
+
+    def test_delta_from_unknown_version(self):
+        """Unknown versions fall back to the full state"""
+        response = self.client.get(f"/state/{self.game_id}?since=0").get_json()
+        self.assertNotIn("delta", response)
+        self.assertIn("community_cards", response)
+
+    def test_state_unknown_game(self):
+        """Unknown games are still reported as errors"""
+        response = self.client.get("/state/NO_SUCH_GAME")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("error", response.get_json())
+
+
+if __name__ == "__main__":
+    unittest.main()
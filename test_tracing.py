@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Game tracing tests
+Run with: python3 test_tracing.py
+"""
+
+import sys
+import os
+import unittest
+
+# Add the current directory to Python path so we can import modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app as server
+from engine.tracing import Tracer, TRACER, DEBUG, INFO, ERROR, parse_level
+
+
+class TestTracer(unittest.TestCase):
+
+    def setUp(self):
+        self.tracer = Tracer(level=INFO, capacity=3, echo_level=ERROR + 1)
+        self.tracer.start("G1")
+
+    def events(self, game_id="G1"):
+        return [r["event"] for r in self.tracer.dump(game_id)["records"]]
+
+    def test_level_gating(self):
+        with self.tracer.bind("G1"):
+            self.tracer.debug("skipped")
+            self.tracer.info("kept", street=1)
+            self.assertFalse(self.tracer.enabled(DEBUG))
+        self.assertEqual(self.events(), ["kept"])
+        self.assertEqual(self.tracer.dump("G1")["records"][0]["street"], 1)
+
+    def test_per_game_level_and_ring_buffer(self):
+        self.tracer.start("G2")
+        self.tracer.set_level("G1", DEBUG)
+        with self.tracer.bind("G1"):
+            for i in range(5):
+                self.tracer.debug("step", i=i)
+        with self.tracer.bind("G2"):
+            self.tracer.debug("other")
+
+        # Only the newest records are kept, and only for the game that was bound
+        self.assertEqual([r["i"] for r in self.tracer.dump("G1")["records"]], [2, 3, 4])
+        self.assertEqual(self.events("G2"), [])
+
+    def test_fields_are_made_json_ready_on_dump(self):
+        class Card:
+            def __str__(self):
+                return "CA"
+
+        with self.tracer.bind("G1"):
+            self.tracer.info("cards", cards=(Card(), Card()), players={1, 2})
+        record = self.tracer.dump("G1")["records"][0]
+        self.assertEqual(record["cards"], ["CA", "CA"])
+        self.assertEqual(sorted(record["players"]), [1, 2])
+
+    def test_unbound_records_are_not_buffered(self):
+        self.tracer.info("nowhere")
+        self.assertEqual(self.events(), [])
+        self.assertIsNone(self.tracer.dump("NO_SUCH_GAME"))
+
+    def test_parse_level(self):
+        self.assertEqual(parse_level("debug"), DEBUG)
+        self.assertEqual(parse_level("40"), ERROR)
+        self.assertEqual(parse_level(None), INFO)
+        self.assertEqual(parse_level("verbose"), INFO)
+
+
+class TestTraceEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.client = server.app.test_client()
+        self.engine = server.engine
+        self.game_id = "test_tracing_001"
+        self.client.post("/start-game", json={"game_id": self.game_id, "players": [
+            {"user_id": "player1", "stack": 100},
+            {"user_id": "player2", "stack": 100}
+        ]})
+
+    def tearDown(self):
+        self.engine.end_game(self.game_id)
+
+    def test_dump_and_raise_level_for_one_game(self):
+        data = self.client.get(f"/trace/{self.game_id}").get_json()
+        self.assertEqual(data["trace_id"], TRACER.get(self.game_id).trace_id)
+        self.assertIn("hand_started", [r["event"] for r in data["records"]])
+
+        response = self.client.post(f"/trace/{self.game_id}", json={"level": "debug"})
+        self.assertEqual(response.status_code, 200)
+        self.client.post("/action", json={
+            "game_id": self.game_id, "user_id": "player1", "action": "call", "amount": 1
+        })
+
+        events = [r["event"] for r in self.client.get(f"/trace/{self.game_id}").get_json()["records"]]
+        self.assertIn("action", events)
+        self.assertIn("street_complete_check", events)
+        self.assertIn("valid_actions", events)  # Rendering is traced for the same game
+
+    def test_trace_is_dropped_with_the_game(self):
+        self.engine.end_game(self.game_id)
+        self.assertEqual(self.client.get(f"/trace/{self.game_id}").status_code, 400)
+
+    def test_rejects_unknown_level(self):
+        response = self.client.post(f"/trace/{self.game_id}", json={"level": "verbose"})
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import os
+import tempfile
+import unittest
+
+from tests.base_unittest import BaseUnitTest
+from pypokerengine.api.game_tree import BetAbstraction
+from pypokerengine.engine.player import Player
+from pypokerengine.engine.table import Table
+from pypokerengine.utils.card_utils import gen_cards
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+if numpy is not None:
+    from pypokerengine.api.cfr import CFRSolver, StrategyTable, HandClassAbstraction, OUTCOME_SAMPLING
+
+class OneBucket(object):
+    """Every hand in one bucket, so each decision is a single information set"""
+
+    def bucket(self, hole_card, community_card):
+        return 0
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class CFRSolverTest(BaseUnitTest):
+
+    def setUp(self):
+        self.abstraction = BetAbstraction(pot_fractions=[1], min_raise=False)
+
+    def test_hand_class_abstraction(self):
+        abstraction = HandClassAbstraction()
+        self.eq(abstraction.bucket(gen_cards(["SA", "SK"]), []), abstraction.bucket(gen_cards(["HK", "HA"]), []))
+        self.neq(abstraction.bucket(gen_cards(["SA", "SK"]), []), abstraction.bucket(gen_cards(["SA", "HK"]), []))
+        board = gen_cards(["D2", "C7", "H9"])
+        self.eq(abstraction.bucket(gen_cards(["S9", "SK"]), board), abstraction.bucket(gen_cards(["C7", "HA"]), board))
+        self.neq(abstraction.bucket(gen_cards(["S9", "SK"]), board), abstraction.bucket(gen_cards(["S3", "HA"]), board))
+
+    def test_external_sampling(self):
+        solver = self.__solver(seed=1)
+        solver.iterate(3)
+        self.eq(3, solver.iterations)
+        self.true(len(solver.table) > 0)
+        self.__check_average_strategies(solver.table)
+
+    def test_outcome_sampling(self):
+        solver = self.__solver(sampling=OUTCOME_SAMPLING, seed=2)
+        solver.iterate(20)
+        self.true(len(solver.table) > 0)
+        self.__check_average_strategies(solver.table)
+
+    def test_cfr_plus_keeps_regrets_positive(self):
+        solver = self.__solver(plus=True, seed=3)
+        solver.iterate(3)
+        self.true((solver.table.regrets >= 0).all())
+
+    def test_same_seed_same_tables(self):
+        solver1, solver2 = self.__solver(seed=4), self.__solver(seed=4)
+        solver1.iterate(2)
+        solver2.iterate(2)
+        self.eq(solver1.table.keys, solver2.table.keys)
+        self.true(numpy.array_equal(solver1.table.regrets, solver2.table.regrets))
+
+    def test_checkpoint(self):
+        solver = self.__solver(seed=5)
+        solver.iterate(2)
+        path = os.path.join(tempfile.mkdtemp(), "strategy.npz")
+        solver.table.save(path)
+        loaded = StrategyTable.load(path)
+        self.eq(solver.table.keys, loaded.keys)
+        self.eq(solver.table.labels, loaded.labels)
+        key = solver.table.keys[0]
+        self.eq(solver.table.average_strategy(key), loaded.average_strategy(key))
+        loaded.row("new key")  # a loaded table keeps growing
+        self.eq(len(solver.table) + 1, len(loaded))
+
+    def test_average_strategy_lookup(self):
+        solver = self.__solver(seed=6)
+        solver.iterate(5)
+        state, _ = solver._CFRSolver__deal()
+        strategy = solver.average_strategy(state, "")
+        if strategy is not None:
+            self.true(abs(sum(strategy.values()) - 1) < 1e-9)
+            self.true(set(strategy) <= set(self.abstraction.labels))
+
+    def test_add_difference(self):
+        base = StrategyTable(["fold", "call"])
+        row = base.row("a")
+        base.regrets[row] = [1, 1]
+        worker = base.copy()
+        worker.regrets[worker.row("a")] += [2, 0]
+        row = worker.row("b")  # may grow the arrays, so before indexing them
+        worker.regrets[row] = [0, 3]
+        merged = base.copy()
+        merged.add_difference(worker, base)
+        merged.add_difference(worker, base)
+        self.eq([5, 1], merged.regrets[merged.index["a"]].tolist())
+        self.eq([0, 6], merged.regrets[merged.index["b"]].tolist())
+
+    def test_iterate_parallel(self):
+        solver = self.__solver(seed=7)
+        solver.iterate_parallel(2, processes=2)
+        self.eq(2, solver.iterations)
+        self.true(len(solver.table) > 0)
+
+    def test_iterate_parallel_runs_every_iteration(self):
+        # the opening node is reached once per iteration, so its strategy sums count the iterations run
+        for iterations, processes in [(3, 2), (1, 3)]:
+            solver = self.__all_in_blind_solver(seed=8)
+            solver.iterate_parallel(iterations, processes)
+            self.eq(iterations, solver.iterations)
+            self.eq(iterations, round(solver.table.strategy_sums[solver.table.index["0|0|"]].sum()))
+
+    def test_dominated_fold_is_dropped(self):
+        # the big blind is all-in from the blinds: calling 1 for a pot of 4 beats folding with any hand
+        solver = self.__all_in_blind_solver(seed=9)
+        solver.iterate(50)
+        self.true(solver.table.average_strategy("0|0|").get("fold", 0) < 0.05)
+
+    def __solver(self, **options):
+        table = Table()
+        for i in range(2):
+            table.seats.sitdown(Player("uuid%d" % i, 20, "player%d" % i))
+        table.dealer_btn = 1
+        table.set_blind_pos(0, 1)
+        return CFRSolver(table, 1, bet_abstraction=self.abstraction, **options)
+
+    def __all_in_blind_solver(self, **options):
+        table = Table()
+        table.seats.sitdown(Player("uuid0", 20, "player0"))
+        table.seats.sitdown(Player("uuid1", 2, "player1"))
+        table.dealer_btn = 1
+        table.set_blind_pos(0, 1)
+        return CFRSolver(table, 1, bet_abstraction=self.abstraction, card_abstraction=OneBucket(), **options)
+
+    def __check_average_strategies(self, table):
+        for key in table.keys:
+            strategy = table.average_strategy(key)
+            if strategy is None: continue
+            self.true(abs(sum(strategy.values()) - 1) < 1e-9)
@@ -56,3 +56,40 @@ class GameTest(BaseUnitTest):
         config = G.setup_config(1, 100, 10)
         config.register_player("p1", "dummy")
 
+
+    def test_game_stops_at_each_decision(self):
+        config = G.setup_config(2, 100, 10)
+        config.register_player("p1", FoldMan())
+        config.register_player("p2", FoldMan())
+        game = G.Game(config)
+        p1, p2 = [player.uuid for player in game.table.seats.players]
+
+        decision = game.pending_decision()
+        self.eq(p2, decision["uuid"])
+        self.eq(["fold", "call", "raise"], [a["action"] for a in decision["valid_actions"]])
+        message_types = [msg["message"]["message_type"] for _, msg in game.events()]
+        self.eq(["game_start_message", "round_start_message", "round_start_message", "street_start_message"], message_types)
+        self.eq([], game.events())
+
+        decision = game.submit("fold", 0)
+        self.eq(p1, decision["uuid"])
+        self.eq(2, game.round_count)
+        message_types = [msg["message"]["message_type"] for _, msg in game.events()]
+        self.eq(["game_update_message", "round_result_message", "round_start_message"], message_types[:3])
+
+        self.eq(None, game.submit("fold", 0))
+        self.true(game.is_finished())
+        self.eq("game_result_message", game.events()[-1][1]["message"]["message_type"])
+        self.eq([100, 100], [player["stack"] for player in game.result["players"]])
+        with self.assertRaises(Exception):
+            game.submit("fold", 0)
+
+    def test_game_matches_start_poker(self):
+        config = G.setup_config(1, 100, 10, 15)
+        config.register_player("p1", FoldMan())
+        config.register_player("p2", FoldMan())
+        game = G.Game(config)
+        while not game.is_finished():
+            game.submit("fold", 0)
+        self.eq(G.start_poker(config, verbose=0)["players"][0]["stack"], game.result["players"][0]["stack"])
+        self.eq(125, game.result["players"][0]["stack"])
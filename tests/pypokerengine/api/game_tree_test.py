@@ -0,0 +1,69 @@
+from tests.base_unittest import BaseUnitTest
+from pypokerengine.api.game_tree import BetAbstraction, GameTree, pot_raise_amount
+from pypokerengine.api.emulator import Emulator
+from pypokerengine.engine.round_manager import RoundManager
+from pypokerengine.engine.player import Player
+from pypokerengine.engine.table import Table
+from pypokerengine.engine.poker_constants import PokerConstants as Const
+
+class GameTreeTest(BaseUnitTest):
+
+    def setUp(self):
+        table = Table()
+        for i in range(3):
+            table.seats.sitdown(Player("uuid%d" % i, 100, "player%d" % i))
+        table.dealer_btn = 2
+        table.set_blind_pos(0, 1)
+        self.state, _ = RoundManager.start_new_round(1, 5, 0, table)
+        self.abstraction = BetAbstraction(pot_fractions=[0.5, 1])
+
+    def test_labels(self):
+        self.eq(["fold", "call", "min_raise", "pot_0.5", "pot_1", "allin"], self.abstraction.labels)
+        self.eq(["fold", "call", "pot_1"], BetAbstraction([1], min_raise=False, allin=False).labels)
+
+    def test_translate(self):
+        # pot of 15, 10 to call: a pot raise makes it 10 + (15 + 10)
+        self.eq(35, pot_raise_amount(self.state, 1))
+        self.eq(("fold", 0), self.abstraction.translate(self.state, "fold"))
+        self.eq(("call", 10), self.abstraction.translate(self.state, "call"))
+        self.eq(("raise", 15), self.abstraction.translate(self.state, "min_raise"))
+        self.eq(("raise", 22), self.abstraction.translate(self.state, "pot_0.5"))
+        self.eq(("raise", 35), self.abstraction.translate(self.state, "pot_1"))
+        self.eq(("raise", 100), self.abstraction.translate(self.state, "allin"))
+
+    def test_translate_is_clamped_to_stack(self):
+        self.eq(("raise", 100), BetAbstraction([10]).translate(self.state, "pot_10"))
+        labels = [label for label, _, _ in BetAbstraction([10]).legal_actions(self.state)]
+        self.eq(["fold", "call", "min_raise", "pot_10"], labels)
+
+    def test_no_raise_when_short(self):
+        self.state["table"].seats.players[2].stack = 10
+        self.eq(None, self.abstraction.translate(self.state, "pot_1"))
+        labels = [label for label, _, _ in self.abstraction.legal_actions(self.state)]
+        self.eq(["fold", "call"], labels)
+
+    def test_to_abstract(self):
+        self.eq("pot_1", self.abstraction.to_abstract(self.state, "raise", 40))
+        self.eq("pot_0.5", self.abstraction.to_abstract(self.state, "raise", 24))
+        self.eq("call", self.abstraction.to_abstract(self.state, "call", 10))
+        self.eq("fold", self.abstraction.to_abstract(self.state, "fold", 0))
+
+    def test_children(self):
+        tree = GameTree(self.abstraction)
+        children = dict(tree.children(self.state))
+        self.eq(["fold", "call", "min_raise", "pot_0.5", "pot_1", "allin"], list(children.keys()))
+        self.eq(35, children["pot_1"]["table"].seats.players[2].paid_sum())
+        self.eq(0, self.state["table"].seats.players[2].paid_sum())  # the parent is left alone
+        self.eq(children["pot_1"]["table"].serialize(), tree.child(self.state, "pot_1")["table"].serialize())
+
+    def test_walk_to_leaves(self):
+        tree = GameTree(BetAbstraction(pot_fractions=[], min_raise=False))
+        state = self.state
+        while not tree.is_terminal(state):
+            state = tree.child(state, "call")
+        self.eq([], tree.actions(state))
+        self.eq(Const.Street.FINISHED, state["street"])
+
+    def test_emulator_abstract_actions(self):
+        actions = Emulator().generate_abstract_actions(self.state, self.abstraction)
+        self.eq(("pot_1", "raise", 35), actions[4])
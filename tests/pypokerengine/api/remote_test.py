@@ -0,0 +1,60 @@
+import io
+
+from tests.base_unittest import BaseUnitTest
+from pypokerengine.api.game import setup_config, start_poker
+from pypokerengine.api import remote as R
+
+class FramingTest(BaseUnitTest):
+
+  def test_round_trip(self):
+    stream = io.BytesIO()
+    R.write_frame(stream, R.ASK, { "player": 1, "messages": [], "ask": { "hole_card": ["SA", "HA"] } })
+    R.write_frame(stream, R.RELEASE, { "player": 1 })
+    stream.seek(0)
+    self.eq((R.ASK, { "player": 1, "messages": [], "ask": { "hole_card": ["SA", "HA"] } }), R.read_frame(stream))
+    self.eq((R.RELEASE, { "player": 1 }), R.read_frame(stream))
+    self.eq((None, None), R.read_frame(stream))
+
+  def test_truncated_frame(self):
+    stream = io.BytesIO()
+    R.write_frame(stream, R.NOTIFY, { "player": 1, "messages": [] })
+    stream = io.BytesIO(stream.getvalue()[:-2])
+    with self.assertRaises(R.RemotePlayerError):
+      R.read_frame(stream)
+
+  def test_serve_batches_notifications_before_ask(self):
+    requests = io.BytesIO()
+    R.write_frame(requests, R.CREATE, { "player": 1, "factory": "examples.players.fold_man:FoldMan", "args": [] })
+    R.write_frame(requests, R.UUID, { "player": 1, "uuid": "u1" })
+    R.write_frame(requests, R.ASK, { "player": 1, "messages": [{ "message_type": "round_start_message",\
+        "round_count": 1, "hole_card": [], "seats": [] }], "ask": ask_message() })
+    R.write_frame(requests, R.CREATE, { "player": 2, "factory": "no.such.module:Bot", "args": [] })
+    R.write_frame(requests, R.ASK, { "player": 2, "messages": [], "ask": ask_message() })
+    requests.seek(0)
+    responses = io.BytesIO()
+    R.serve(requests, responses)
+    responses.seek(0)
+    self.eq((R.ACTION, { "action": "fold", "amount": 0 }), R.read_frame(responses))
+    kind, payload = R.read_frame(responses)
+    self.eq(R.ERROR, kind)
+    self.true("could not be created" in payload["error"])
+
+class RemotePlayerPoolTest(BaseUnitTest):
+
+  def test_play_game_with_bots_in_worker_processes(self):
+    with R.RemotePlayerPool(workers=2) as pool:
+      config = setup_config(1, 100, 10)
+      config.register_player("p1", pool.player("examples.players.fold_man:FoldMan"))
+      config.register_player("p2", pool.player("examples.players.fold_man:FoldMan"))
+      result = start_poker(config, verbose=0)
+    self.eq([110, 90], [p["stack"] for p in result["players"]])
+
+  def test_bot_errors_are_raised_in_the_engine(self):
+    with R.RemotePlayerPool(workers=1) as pool:
+      player = pool.player("examples.players.fold_man:NoSuchBot")
+      with self.assertRaises(R.RemotePlayerError):
+        player.respond_to_ask(ask_message())
+
+def ask_message():
+  valid_actions = [{ "action": "fold", "amount": 0 }, { "action": "call", "amount": 10 }]
+  return { "message_type": "ask_message", "valid_actions": valid_actions, "hole_card": [], "round_state": {} }
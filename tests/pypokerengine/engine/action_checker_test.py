@@ -2,6 +2,7 @@ from tests.base_unittest import BaseUnitTest
 from pypokerengine.engine.player import Player
 from pypokerengine.engine.poker_constants import PokerConstants as Const
 from pypokerengine.engine.action_checker import ActionChecker
+from pypokerengine.engine.seats import Seats
 
 class ActionCheckerTest(BaseUnitTest):
 
@@ -188,6 +189,20 @@ class ActionCheckerTest(BaseUnitTest):
     self.eq(("fold", 0), ActionChecker.correct_action(players, 2, 5, "raise", 15))
 
 
+  def test_seated_players_use_the_shared_log(self):
+    seated = Seats()
+    loose = self.__setup_blind_players() + [Player("uuid", 100)]
+    for player in self.__setup_blind_players() + [Player("uuid", 100)]:
+      seated.sitdown(player)
+    for players in (seated.players, loose):
+      players[2].add_action_history(Const.Action.RAISE, 30, 20)
+      players[0].add_action_history(Const.Action.CALL, 30)
+    self.eq(ActionChecker.legal_actions(loose, 1, 5), ActionChecker.legal_actions(seated.players, 1, 5))
+    self.eq(30, ActionChecker.agree_amount(seated.players))
+    self.eq(50, ActionChecker.legal_actions(seated.players, 1, 5)[2]["amount"]["min"])
+    seated.players[0].save_street_action_histories(Const.Street.PREFLOP)
+    self.eq(0, ActionChecker.agree_amount(seated.players))
+
   def __setup_clean_players(self):
     return [Player("uuid", 100) for  _ in range(2)]
 
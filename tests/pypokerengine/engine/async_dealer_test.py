@@ -0,0 +1,72 @@
+import asyncio
+import time
+
+from tests.base_unittest import BaseUnitTest
+from pypokerengine.engine.dealer import AsyncDealer
+from pypokerengine.api.game import setup_config, start_poker_async
+from pypokerengine.players import AsyncPokerPlayer
+from examples.players.fold_man import FoldMan
+
+class AsyncDealerTest(BaseUnitTest):
+
+  def test_play_game_with_async_and_sync_players(self):
+    dealer = AsyncDealer(5, 100)
+    remote = RemoteCallMan(delay=0)
+    dealer.register_player("remote", remote)
+    dealer.register_player("local", FoldMan())
+    result = asyncio.run(dealer.start_game(2))
+
+    stacks = [player["stack"] for player in result["message"]["game_information"]["seats"]]
+    self.eq(200, sum(stacks))
+    self.eq(["game_start_message", "round_start_message", "street_start_message"], remote.received[:3])
+    self.eq(2, remote.received.count("round_result_message"))
+    self.true(remote.asked > 0)
+
+  def test_games_waiting_on_players_share_one_loop(self):
+    delay, games = 0.05, 20
+
+    async def play(i):
+      config = setup_config(1, 100, 5)
+      config.register_player("p1", RemoteCallMan(delay))
+      config.register_player("p2", RemoteCallMan(delay))
+      return await start_poker_async(config, verbose=0)
+
+    async def play_all():
+      return await asyncio.gather(*[play(i) for i in range(games)])
+
+    start = time.monotonic()
+    results = asyncio.run(play_all())
+    elapsed = time.monotonic() - start
+
+    self.eq(games, len(results))
+    for result in results:
+      self.eq(200, sum([player["stack"] for player in result["players"]]))
+    # Every game waits on its players at least once, but the waits overlap
+    self.true(elapsed < games * delay)
+
+class RemoteCallMan(AsyncPokerPlayer):
+
+  def __init__(self, delay):
+    self.delay = delay
+    self.asked = 0
+    self.received = []
+
+  async def declare_action(self, valid_actions, hole_card, round_state):
+    await asyncio.sleep(self.delay)
+    self.asked += 1
+    return valid_actions[1]["action"], valid_actions[1]["amount"]
+
+  async def receive_game_start_message(self, game_info):
+    self.received.append("game_start_message")
+
+  async def receive_round_start_message(self, round_count, hole_card, seats):
+    self.received.append("round_start_message")
+
+  async def receive_street_start_message(self, street, round_state):
+    self.received.append("street_start_message")
+
+  def receive_game_update_message(self, new_action, round_state):
+    self.received.append("game_update_message")
+
+  def receive_round_result_message(self, winners, hand_info, round_state):
+    self.received.append("round_result_message")
@@ -1,3 +1,5 @@
+import pickle
+
 from tests.base_unittest import BaseUnitTest
 from pypokerengine.engine.card import Card
 
@@ -15,6 +17,10 @@ class CardTest(BaseUnitTest):
     self.eq(str(Card(Card.DIAMOND, 12)), "DQ")
     self.eq(str(Card(Card.DIAMOND, 13)), "DK")
 
+  def test_pickle(self):
+    card = Card.from_id(14)
+    self.eq(card, pickle.loads(pickle.dumps(card)))
+
   def test_to_id(self):
     self.eq(Card(Card.HEART, 3).to_id(), 29)
     self.eq(Card(Card.SPADE, 1).to_id(), 40)
@@ -0,0 +1,166 @@
+import asyncio
+import threading
+import time
+
+from tests.base_unittest import BaseUnitTest
+from pypokerengine.engine.dealer import DecisionTimer, MessageHandler, AsyncMessageHandler
+from pypokerengine.api.game import setup_config, start_poker
+from pypokerengine.players import AsyncPokerPlayer
+from examples.players.fold_man import FoldMan
+
+class DecisionTimerTest(BaseUnitTest):
+
+  def setUp(self):
+    self.timer = DecisionTimer(0.05, time_bank=0.1)
+    self.mh = MessageHandler()
+
+  def test_fast_player_keeps_time_bank(self):
+    self.mh.register_algorithm("a", SlowMan(0, "raise"))
+    self.eq(("raise", 20), self.timer.ask(self.mh, "a", ask_msg(call_amount=10)))
+    self.eq(0.1, self.timer.banks["a"])
+    self.eq(1, self.timer.stats["a"]["decisions"])
+    self.eq(0, self.timer.stats["a"]["timeouts"])
+
+  def test_slow_player_uses_time_bank(self):
+    self.mh.register_algorithm("a", SlowMan(0.08, "raise"))
+    self.eq(("raise", 20), self.timer.ask(self.mh, "a", ask_msg(call_amount=10)))
+    self.true(self.timer.banks["a"] < 0.08)
+
+  def test_default_action_on_timeout(self):
+    self.mh.register_algorithm("a", SlowMan(1, "raise"))
+    start = time.monotonic()
+    self.eq(("fold", 0), self.timer.ask(self.mh, "a", ask_msg(call_amount=10)))
+    self.true(time.monotonic() - start < 0.5)
+    self.eq(0, self.timer.banks["a"])
+    self.eq(1, self.timer.stats["a"]["timeouts"])
+    # with the bank spent only decision_time is left, and a free check is taken
+    self.eq(0.05, self.timer.time_limit("a"))
+    self.eq(("call", 0), self.timer.ask(self.mh, "a", ask_msg(call_amount=0)))
+
+  def test_stalled_player_is_not_asked_again(self):
+    player = SlowMan(0.3, "raise")
+    self.mh.register_algorithm("a", player)
+    self.eq(("fold", 0), self.timer.ask(self.mh, "a", ask_msg(call_amount=10)))
+    self.true(self.timer.is_stalled("a"))
+    # the late answer is still running: no second thread, the default action right away
+    start = time.monotonic()
+    self.eq(("fold", 0), self.timer.ask(self.mh, "a", ask_msg(call_amount=10)))
+    self.true(time.monotonic() - start < 0.05)
+    self.eq(1, player.asked)
+    self.eq(2, self.timer.stats["a"]["timeouts"])
+    # once it has returned the player is asked again
+    self.timer.stalled["a"].join()
+    self.false(self.timer.is_stalled("a"))
+    player.delay = 0
+    self.eq(("raise", 20), self.timer.ask(self.mh, "a", ask_msg(call_amount=10)))
+    self.eq(2, player.asked)
+
+  def test_stalled_player_gets_notifications_after_returning(self):
+    player = ListeningSlowMan(0.2, "raise")
+    other = ListeningSlowMan(0, "call")
+    self.mh.register_algorithm("a", player)
+    self.mh.register_algorithm("b", other)
+    self.eq(("fold", 0), self.timer.ask(self.mh, "a", ask_msg(call_amount=10)))
+    self.timer.notify(self.mh, -1, notification_msg("first"))
+    self.timer.notify(self.mh, "a", notification_msg("second"))
+    # the others are not held up, the stalled player is not touched while it is answering
+    self.eq(["first"], other.notified)
+    self.eq([], player.notified)
+    self.timer.stalled["a"].join()
+    self.eq(["first", "second"], player.notified)
+    self.false(player.overlapped)
+    self.false(self.timer.is_stalled("a"))
+    self.timer.notify(self.mh, "a", notification_msg("third"))
+    self.eq(["first", "second", "third"], player.notified)
+
+  def test_no_deadline_asks_directly(self):
+    timer = DecisionTimer(None)
+    player = ThreadRecorder()
+    self.mh.register_algorithm("a", player)
+    self.eq(("call", 10), timer.ask(self.mh, "a", ask_msg(call_amount=10)))
+    self.eq(threading.current_thread(), player.thread)
+    self.eq(1, timer.stats["a"]["decisions"])
+
+  def test_errors_are_raised(self):
+    self.mh.register_algorithm("a", BrokenMan())
+    with self.assertRaises(ValueError):
+      self.timer.ask(self.mh, "a", ask_msg(call_amount=10))
+
+  def test_async_timeout(self):
+    mh = AsyncMessageHandler()
+    mh.register_algorithm("a", AsyncSlowMan(1))
+    action = asyncio.run(self.timer.ask_async(mh, "a", ask_msg(call_amount=10)))
+    self.eq(("fold", 0), action)
+    self.eq(1, self.timer.stats["a"]["timeouts"])
+
+  def test_start_poker_reports_stats(self):
+    config = setup_config(1, 100, 10)
+    config.set_decision_time(0.05)
+    config.register_player("p1", FoldMan())
+    config.register_player("p2", SlowMan(1, "raise"))
+    result = start_poker(config, verbose=0)
+    self.eq([110, 90], [p["stack"] for p in result["players"]])
+    slow_uuid = result["players"][1]["uuid"]
+    self.eq(1, result["decision_stats"][slow_uuid]["timeouts"])
+
+def ask_msg(call_amount):
+  valid_actions = [
+      { "action": "fold", "amount": 0 },
+      { "action": "call", "amount": call_amount },
+      { "action": "raise", "amount": { "min": 20, "max": 100 } }
+  ]
+  return { "type": "ask", "message": { "valid_actions": valid_actions, "hole_card": [], "round_state": {} } }
+
+def notification_msg(text):
+  return { "type": "notification", "message": { "message_type": "game_update_message", "text": text } }
+
+class SlowMan(FoldMan):
+
+  def __init__(self, delay, action):
+    self.delay = delay
+    self.action = action
+    self.asked = 0
+
+  def declare_action(self, valid_actions, hole_card, round_state):
+    self.asked += 1
+    time.sleep(self.delay)
+    return self.action, 20
+
+class ListeningSlowMan(SlowMan):
+  """Records notifications and whether one arrived while it was still deciding"""
+
+  def __init__(self, delay, action):
+    SlowMan.__init__(self, delay, action)
+    self.deciding = False
+    self.overlapped = False
+    self.notified = []
+
+  def declare_action(self, valid_actions, hole_card, round_state):
+    self.deciding = True
+    action = SlowMan.declare_action(self, valid_actions, hole_card, round_state)
+    self.deciding = False
+    return action
+
+  def receive_notification(self, message):
+    self.overlapped |= self.deciding
+    self.notified.append(message["text"])
+
+class ThreadRecorder(FoldMan):
+
+  def declare_action(self, valid_actions, hole_card, round_state):
+    self.thread = threading.current_thread()
+    return valid_actions[1]["action"], valid_actions[1]["amount"]
+
+class BrokenMan(FoldMan):
+
+  def declare_action(self, valid_actions, hole_card, round_state):
+    raise ValueError("broken")
+
+class AsyncSlowMan(AsyncPokerPlayer):
+
+  def __init__(self, delay):
+    self.delay = delay
+
+  async def declare_action(self, valid_actions, hole_card, round_state):
+    await asyncio.sleep(self.delay)
+    return "raise", 20
@@ -1,6 +1,10 @@
+import json
+import pickle
+
 from tests.base_unittest import BaseUnitTest
 from pypokerengine.engine.card import Card
 from pypokerengine.engine.player import Player
+from pypokerengine.engine.action_record import ActionRecord
 from pypokerengine.engine.poker_constants import PokerConstants as Const
 from nose.tools import *
 
@@ -175,6 +179,35 @@ class PlayerTest(BaseUnitTest):
     self.eq(player.pay_info.amount, restored.pay_info.amount)
     self.eq(player.pay_info.status, restored.pay_info.status)
 
+  def test_pickle(self):
+    player = self.__setup_player_for_serialization()
+    restored = pickle.loads(pickle.dumps(player))
+    self.eq(player.serialize(), restored.serialize())
+
+  def test_serialize_is_plain_data(self):
+    player = self.__setup_player_for_serialization()
+    serial = player.serialize()
+    self.true(all(type(h) is dict for h in serial[4]))
+    self.true(all(type(h) is dict for street in serial[6] if street is not None for h in street))
+    self.eq(serial, json.loads(json.dumps(serial)))
+
+  def test_deserialize_dict_histories(self):
+    player = self.__setup_player_for_serialization()
+    serial = player.serialize()
+    restored = Player.deserialize(serial)
+    self.true(all(isinstance(h, ActionRecord) for h in restored.action_histories))
+    self.eq(player.action_histories, restored.action_histories)
+
+  def test_action_record_reads_like_dict(self):
+    self.player.add_action_history(Const.Action.RAISE, 10, 5)
+    record = self.player.action_histories[-1]
+    self.eq({ "action": "RAISE", "amount": 10, "paid": 10, "add_amount": 5, "uuid": "uuid" }, record)
+    self.eq(10, record["paid"])
+    self.false("fold" in record)
+    self.eq(None, record.get("fold"))
+    with self.assertRaises(AttributeError):
+      record.extra = 1
+
   def __setup_player_for_serialization(self):
     player = Player("uuid", 50, "hoge")
     player.add_holecard([Card.from_id(cid) for cid in range(1,3)])
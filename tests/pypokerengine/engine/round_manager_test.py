@@ -355,6 +355,30 @@ class RoundManagerTest(BaseUnitTest):
     self.eq(75, pot_amount(raised_state))
 
 
+  def test_runout_when_everyone_is_allin(self):
+    state, _ = self.__start_round()
+    state, _ = RoundManager.apply_action(state, "raise", 100)
+    state, _ = RoundManager.apply_action(state, "call", 100)
+    state, msgs = RoundManager.apply_action(state, "call", 100)
+    self.eq(Const.Street.FINISHED, state["street"])
+    msg_types = [msg["message"]["message_type"] for _, msg in msgs]
+    self.eq(["game_update_message"] + ["street_start_message"]*3 + ["round_result_message"], msg_types)
+    streets = [msg["message"]["street"] for _, msg in msgs[1:4]]
+    self.eq(["flop", "turn", "river"], streets)
+    self.eq(5, len(msgs[-1][1]["message"]["round_state"]["community_card"]))
+
+  def test_runout_without_street_messages(self):
+    results = []
+    for runout_messages in [True, False]:
+      state, _ = self.__start_round()
+      state, _ = RoundManager.apply_action(state, "raise", 100, runout_messages)
+      state, _ = RoundManager.apply_action(state, "call", 100, runout_messages)
+      state, msgs = RoundManager.apply_action(state, "call", 100, runout_messages)
+      results.append((msgs[-1][1]["message"], [p.stack for p in state["table"].seats.players]))
+    self.eq(["game_update_message", "round_result_message"],\
+        [msg["message"]["message_type"] for _, msg in msgs])
+    self.eq(results[0], results[1])
+
   def test_deepcopy_state(self):
     table = self.__setup_table()
     original = RoundManager._RoundManager__gen_initial_state(2, 5, table)
@@ -1,6 +1,11 @@
 from tests.base_unittest import BaseUnitTest
 from pypokerengine.engine.player import Player
 from pypokerengine.engine.seats import Seats
+from pypokerengine.engine.pay_info import PayInfo
+from pypokerengine.engine.action_record import ActionRecord
+from pypokerengine.engine.poker_constants import PokerConstants as Const
+from pypokerengine.api.game import setup_config, start_poker
+from examples.players.fish_player import FishPlayer
 
 class SeatsTest(BaseUnitTest):
 
@@ -35,6 +40,95 @@ class SeatsTest(BaseUnitTest):
     for i in range(len(self.seats.players)):
       self.eq(Player.serialize(self.seats.players[i]), Player.serialize(restored.players[i]))
 
+  def test_masks_follow_player_changes(self):
+    self.__sitdown_players()
+    self.eq((0b111, 0b111, 0b111), self.__masks())
+    self.__setup_pay_status()
+    self.eq((0b101, 0b001, 0b111), self.__masks())
+    self.p1.collect_bet(100)
+    self.p2.pay_info.status = PayInfo.PAY_TILL_END
+    self.eq((0b111, 0b011, 0b110), self.__masks())
+    self.p3.clear_pay_info()
+    self.p1.stack = 5
+    self.eq((0b111, 0b111, 0b111), self.__masks())
+
+  def test_masks_of_assigned_players(self):
+    self.__setup_pay_status()
+    self.seats.players = [self.p3, self.p2, self.p1]
+    self.eq((0b101, 0b100, 0b111), self.__masks())
+    self.eq(self.seats, self.p1._seats)
+
+  def test_next_seat_pos(self):
+    self.__sitdown_players()
+    self.eq(1, self.seats.next_seat_pos(0b111, 0))
+    self.eq(0, self.seats.next_seat_pos(0b111, 2))
+    self.eq(0, self.seats.next_seat_pos(0b001, 0))
+    self.eq(2, self.seats.next_seat_pos(0b100, 2))
+    self.eq(None, self.seats.next_seat_pos(0, 1))
+
+  def test_players_after(self):
+    self.__sitdown_players()
+    self.eq([self.p2, self.p3, self.p1], self.seats.players_after(0))
+    self.eq([self.p1, self.p2, self.p3], self.seats.players_after(2))
+
+  def test_max_paid_sum(self):
+    self.__sitdown_players()
+    self.eq(0, self.seats.max_paid_sum())
+    self.p1.add_action_history(Const.Action.CALL, 10)
+    self.p2.add_action_history(Const.Action.RAISE, 30, 20)
+    self.eq(30, self.seats.max_paid_sum())
+    self.p2.save_street_action_histories(Const.Street.PREFLOP)
+    self.eq(0, self.seats.max_paid_sum())
+    self.p1.add_action_history(Const.Action.CALL, 10)
+    self.eq(10, self.seats.max_paid_sum())
+
+  def test_players_share_action_log(self):
+    self.p1.add_action_history(Const.Action.CALL, 10)  # before sitting down
+    self.__sitdown_players()
+    self.p3.add_action_history(Const.Action.RAISE, 30, 20)
+    self.p2.add_action_history(Const.Action.FOLD)
+    self.eq([0, 2, 1], list(self.seats.action_log.seats))
+    self.eq(30, self.p3.paid_sum())
+    self.eq(["RAISE"], [h["action"] for h in self.p3.action_histories])
+    self.seats.players = [self.p3, self.p2, self.p1]
+    self.eq([2, 0, 1], list(self.seats.action_log.seats))
+    self.eq(30, self.p3.paid_sum())
+
+  def test_serialization_keeps_action_order(self):
+    self.__sitdown_players()
+    self.p2.add_action_history(Const.Action.CALL, 10)
+    self.p1.add_action_history(Const.Action.RAISE, 30, 20)
+    self.p2.save_street_action_histories(Const.Street.PREFLOP)
+    self.p1.add_action_history(Const.Action.FOLD)
+    restored = Seats.deserialize(self.seats.serialize())
+    self.eq(list(self.seats.action_log.seats), list(restored.action_log.seats))
+    self.eq(1, restored.action_log.street)
+    self.eq(self.p1.round_action_histories, restored.players[0].round_action_histories)
+    self.eq(self.p1.action_histories, restored.players[0].action_histories)
+
+  def test_invariant_check_catches_untracked_change(self):
+    self.__sitdown_players()
+    self.seats.check_invariants = False
+    self.seats.max_paid_sum()
+    self.seats.action_log.append_record(0, ActionRecord(Const.Action.CALL, 50, paid=50))
+    self.eq(0, self.seats.max_paid_sum())
+    self.seats.check_invariants = True
+    with self.assertRaises(AssertionError):
+      self.seats.max_paid_sum()
+
+  def test_invariants_hold_through_games(self):
+    check_invariants, Seats.check_invariants = Seats.check_invariants, True
+    try:
+      config = setup_config(10, 100, 5)
+      for name in ["p1", "p2", "p3", "p4"]:
+        config.register_player(name, FishPlayer())
+      start_poker(config, verbose=0)
+    finally:
+      Seats.check_invariants = check_invariants
+
+  def __masks(self):
+    return self.seats.active_mask, self.seats.waiting_mask, self.seats.funded_mask
+
   def __setup_pay_status(self):
     self.p1.pay_info.update_by_pay(10)
     self.p2.pay_info.update_to_fold()
@@ -0,0 +1,71 @@
+import pickle
+
+from tests.base_unittest import BaseUnitTest
+from pypokerengine.engine.table_codec import TableCodec, TableCodecError
+from pypokerengine.engine.round_manager import RoundManager
+from pypokerengine.engine.player import Player
+from pypokerengine.engine.table import Table
+from pypokerengine.engine.poker_constants import PokerConstants as Const
+
+class TableCodecTest(BaseUnitTest):
+
+  def setUp(self):
+    self.state = self.__play_to_flop()
+
+  def test_table_round_trip(self):
+    table = self.state["table"]
+    restored = TableCodec.decode(TableCodec.encode(table))
+    self.eq(table.serialize(), restored.serialize())
+    self.eq(table.seats.players[2].round_action_histories, restored.seats.players[2].round_action_histories)
+    self.eq(table.next_ask_waiting_player_pos(0), restored.next_ask_waiting_player_pos(0))
+
+  def test_game_state_round_trip(self):
+    restored = TableCodec.decode_game_state(TableCodec.encode_game_state(self.state))
+    for key in ["round_count", "small_blind_amount", "street", "next_player"]:
+      self.eq(self.state[key], restored[key])
+    self.eq(self.state["table"].serialize(), restored["table"].serialize())
+    # the restored state plays on like the original
+    state, _ = RoundManager.apply_action(restored, "call", 0)
+    self.eq(Const.Street.FLOP, state["street"])
+
+  def test_next_player_not_found(self):
+    self.state["next_player"] = Table._player_not_found
+    restored = TableCodec.decode_game_state(TableCodec.encode_game_state(self.state))
+    self.eq(Table._player_not_found, restored["next_player"])
+
+  def test_float_amounts(self):
+    table = self.state["table"]
+    table.seats.players[0].stack = 90.5
+    restored = TableCodec.decode(TableCodec.encode(table))
+    self.eq(90.5, restored.seats.players[0].stack)
+    self.eq(table.serialize(), restored.serialize())
+
+  def test_large_amounts(self):
+    table = self.state["table"]
+    table.seats.players[0].stack = 2**40
+    restored = TableCodec.decode(TableCodec.encode(table))
+    self.eq(2**40, restored.seats.players[0].stack)
+
+  def test_smaller_than_list_format(self):
+    table = self.state["table"]
+    self.true(len(TableCodec.encode(table)) < len(pickle.dumps(table.serialize())))
+
+  def test_rejects_broken_data(self):
+    data = TableCodec.encode(self.state["table"])
+    with self.assertRaises(TableCodecError):
+      TableCodec.decode(b"XYZ" + data[3:])
+    with self.assertRaises(TableCodecError):
+      TableCodec.decode(data[:-1])
+    with self.assertRaises(TableCodecError):
+      TableCodec.decode(data[:3] + bytes([TableCodec.VERSION + 1]) + data[4:])
+
+  def __play_to_flop(self):
+    table = Table()
+    for i in range(3):
+      table.seats.sitdown(Player("uuid%d" % i, 100, "player%d" % i))
+    table.dealer_btn = 2
+    table.set_blind_pos(0, 1)
+    state, _ = RoundManager.start_new_round(1, 5, 1, table)
+    for action, amount in [("call", 10), ("raise", 20), ("call", 20), ("call", 20)]:
+      state, _ = RoundManager.apply_action(state, action, amount)
+    return state
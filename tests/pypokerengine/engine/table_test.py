@@ -1,3 +1,5 @@
+import pickle
+
 from tests.base_unittest import BaseUnitTest
 from nose.tools import *
 
@@ -82,6 +84,22 @@ class TableTest(BaseUnitTest):
     self.eq(1, restored.sb_pos())
     self.eq(2, restored.bb_pos())
 
+  def test_pickle(self):
+    table = self.__setup_players_with_table()
+    table.set_blind_pos(1, 2)
+    table.seats.players[1].add_action_history(Const.Action.SMALL_BLIND, sb_amount=5)
+    table.seats.players[1].pay_info.update_to_allin()
+    restored = pickle.loads(pickle.dumps(table))
+    self.eq(table.serialize(), restored.serialize())
+    self.true(restored.seats.players[1]._seats is restored.seats)
+    self.eq(table.next_ask_waiting_player_pos(0), restored.next_ask_waiting_player_pos(0))
+    self.eq(5, restored.seats.players[1].paid_sum())
+
+  def test_empty_deck_survives_serialization(self):
+    table = self.__setup_players_with_table()
+    table.deck.draw_cards(table.deck.size())
+    self.eq(0, Table.deserialize(table.serialize()).deck.size())
+
   def __setup_table(self):
     self.table = Table()
     for card in self.table.deck.draw_cards(5):
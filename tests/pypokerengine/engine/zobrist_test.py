@@ -0,0 +1,104 @@
+from tests.base_unittest import BaseUnitTest
+from pypokerengine.engine.round_manager import RoundManager
+from pypokerengine.engine.player import Player
+from pypokerengine.engine.table import Table
+from pypokerengine.engine.card import Card
+from pypokerengine.engine.seats import Seats
+from pypokerengine.engine.table_codec import TableCodec
+from pypokerengine.engine import zobrist
+from pypokerengine.utils.game_state_utils import deepcopy_game_state
+
+class ZobristTest(BaseUnitTest):
+
+  def setUp(self):
+    self.state = self.__start_round()
+
+  def test_same_actions_give_same_hash(self):
+    state1 = self.__apply(self.state, [("call", 10), ("raise", 20)])
+    state2 = self.__apply(deepcopy_game_state(self.state), [("call", 10), ("raise", 20)])
+    self.eq(state1["table"].zobrist_hash(), state2["table"].zobrist_hash())
+
+  def test_different_actions_give_different_hash(self):
+    call = self.__apply(self.state, [("call", 10)])
+    fold = self.__apply(self.state, [("fold", 0)])
+    self.neq(call["table"].zobrist_hash(), fold["table"].zobrist_hash())
+    self.neq(self.state["table"].zobrist_hash(), call["table"].zobrist_hash())
+
+  def test_action_order_changes_hash(self):
+    table1, table2 = self.__table(), self.__table()
+    table1.seats.players[0].add_action_history(0)  # fold
+    table1.seats.players[1].add_action_history(0)
+    table2.seats.players[1].add_action_history(0)
+    table2.seats.players[0].add_action_history(0)
+    self.neq(table1.zobrist_hash(), table2.zobrist_hash())
+
+  def test_hash_follows_changes(self):
+    table = self.state["table"]
+    before = table.zobrist_hash()
+    table.seats.players[0].stack += 1
+    self.neq(before, table.zobrist_hash())
+    table.seats.players[0].stack -= 1
+    self.eq(before, table.zobrist_hash())
+    table.seats.players[1].pay_info.update_by_pay(5)
+    self.neq(before, table.zobrist_hash())
+    table.seats.players[1].pay_info.amount -= 5
+    self.eq(before, table.zobrist_hash())
+    table.seats.players[2].pay_info.update_to_fold()
+    self.neq(before, table.zobrist_hash())
+
+  def test_hole_and_community_cards(self):
+    table = self.__table()
+    before = table.zobrist_hash()
+    table.seats.players[0].add_holecard([Card.from_id(1), Card.from_id(2)])
+    with_hole = table.zobrist_hash()
+    self.neq(before, with_hole)
+    table.add_community_card(Card.from_id(3))
+    self.neq(with_hole, table.zobrist_hash())
+
+  def test_deck_order_is_left_out(self):
+    table = self.__table()
+    before = table.zobrist_hash()
+    table.deck.shuffle()
+    self.eq(before, table.zobrist_hash())
+
+  def test_hash_survives_copies(self):
+    table = self.__apply(self.state, [("call", 10), ("raise", 20)])["table"]
+    self.eq(table.zobrist_hash(), Table.deserialize(table.serialize()).zobrist_hash())
+    self.eq(table.zobrist_hash(), TableCodec.decode(TableCodec.encode(table)).zobrist_hash())
+
+  def test_copies_keep_seat_keys(self):
+    state = self.__apply(self.state, [("call", 10)])
+    copied = deepcopy_game_state(state)["table"].seats
+    self.eq(0, copied._stale_mask)
+    self.eq(state["table"].seats._seat_keys, copied._seat_keys)
+    child = self.__apply(state, [("raise", 20)])
+    self.eq(1 << 0, child["table"].seats._stale_mask)  # only the raiser is rekeyed
+
+  def test_negative_ints_do_not_collide(self):
+    self.neq(zobrist.key(zobrist.NEXT_PLAYER, -1), zobrist.key(zobrist.NEXT_PLAYER, -2))
+    self.eq(zobrist.key(zobrist.STACK, 100), zobrist.key(zobrist.STACK, 100.0))
+
+  def test_matches_scan_under_invariant_checks(self):
+    Seats.check_invariants, original = True, Seats.check_invariants
+    try:
+      state = self.__apply(self.state, [("call", 10), ("raise", 20), ("call", 20)])
+      state["table"].zobrist_hash()
+    finally:
+      Seats.check_invariants = original
+
+  def __table(self):
+    table = Table()
+    for i in range(3):
+      table.seats.sitdown(Player("uuid%d" % i, 100, "player%d" % i))
+    table.dealer_btn = 2
+    table.set_blind_pos(0, 1)
+    return table
+
+  def __start_round(self):
+    state, _ = RoundManager.start_new_round(1, 5, 0, self.__table())
+    return state
+
+  def __apply(self, state, actions):
+    for action, amount in actions:
+      state, _ = RoundManager.apply_action(state, action, amount)
+    return state
@@ -0,0 +1,44 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+from tests.base_unittest import BaseUnitTest
+from pypokerengine.utils.shared_state import SharedGameState
+from pypokerengine.engine.round_manager import RoundManager
+from pypokerengine.engine.player import Player
+from pypokerengine.engine.table import Table
+
+class SharedGameStateTest(BaseUnitTest):
+
+  def setUp(self):
+    table = Table()
+    for i in range(6):
+      table.seats.sitdown(Player("uuid%d" % i, 100, "player%d" % i))
+    table.dealer_btn = 5
+    table.set_blind_pos(0, 1)
+    self.state, _ = RoundManager.start_new_round(1, 5, 0, table)
+
+  def test_pickles_as_a_reference(self):
+    with SharedGameState(self.state) as shared:
+      self.true(len(pickle.dumps(shared)) < 100)
+      attached = pickle.loads(pickle.dumps(shared))
+      self.eq(self.state["table"].serialize(), attached.load()["table"].serialize())
+      attached.close()
+
+  def test_workers_load_the_state(self):
+    with SharedGameState(self.state) as shared:
+      with ProcessPoolExecutor(max_workers=2) as pool:
+        stacks = list(pool.map(call_and_report_stacks, [shared]*3))
+    expected = call_and_report_stacks(SharedState(self.state))
+    self.eq([expected]*3, stacks)
+
+class SharedState:
+
+  def __init__(self, state):
+    self.state = state
+
+  def load(self):
+    return self.state
+
+def call_and_report_stacks(shared):
+  state, _ = RoundManager.apply_action(shared.load(), "call", 10)
+  return [player.stack for player in state["table"].seats.players]
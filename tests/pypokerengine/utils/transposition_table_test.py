@@ -0,0 +1,64 @@
+from tests.base_unittest import BaseUnitTest
+from pypokerengine.utils.transposition_table import TranspositionTable
+from pypokerengine.utils.game_state_utils import game_state_hash, deepcopy_game_state
+from pypokerengine.engine.round_manager import RoundManager
+from pypokerengine.engine.player import Player
+from pypokerengine.engine.table import Table
+from pypokerengine.engine.poker_constants import PokerConstants as Const
+from pypokerengine.utils import transposition_table
+
+class TranspositionTableTest(BaseUnitTest):
+
+    def setUp(self):
+        table = Table()
+        for i in range(3):
+            table.seats.sitdown(Player("uuid%d" % i, 100, "player%d" % i))
+        table.dealer_btn = 2
+        table.set_blind_pos(0, 1)
+        self.state, _ = RoundManager.start_new_round(1, 5, 0, table)
+
+    def test_game_state_hash(self):
+        state, _ = RoundManager.apply_action(self.state, "call", 10)
+        self.eq(game_state_hash(state), game_state_hash(deepcopy_game_state(state)))
+        self.neq(game_state_hash(self.state), game_state_hash(state))
+        moved = deepcopy_game_state(state)
+        moved["street"] = Const.Street.FLOP
+        self.neq(game_state_hash(state), game_state_hash(moved))
+
+    def test_next_player_sentinels_hash_differently(self):
+        finished, not_found = deepcopy_game_state(self.state), deepcopy_game_state(self.state)
+        finished["next_player"], not_found["next_player"] = None, Table._player_not_found
+        self.neq(game_state_hash(finished), game_state_hash(not_found))
+
+    def test_transposition_is_found(self):
+        tt = TranspositionTable()
+        # the same line played on a copy reaches the same state
+        state, _ = RoundManager.apply_action(self.state, "call", 10)
+        tt.put(state, "value")
+        replayed, _ = RoundManager.apply_action(deepcopy_game_state(self.state), "call", 10)
+        self.true(replayed in tt)
+        self.eq("value", tt.get(replayed))
+        self.eq(None, tt.get(self.state))
+        self.eq((1, 1, 0), (tt.hits, tt.misses, tt.collisions))
+
+    def test_collision_is_a_miss(self):
+        tt = TranspositionTable()
+        original_hash = transposition_table.game_state_hash
+        transposition_table.game_state_hash = lambda game_state: 0  # every state collides
+        try:
+            tt.put(self.state, "value")
+            state, _ = RoundManager.apply_action(self.state, "call", 10)
+            self.eq("default", tt.get(state, "default"))
+            self.false(state in tt)
+            self.eq(1, tt.collisions)
+        finally:
+            transposition_table.game_state_hash = original_hash
+
+    def test_oldest_entry_is_evicted(self):
+        tt = TranspositionTable(max_entries=1)
+        state, _ = RoundManager.apply_action(self.state, "call", 10)
+        tt.put(self.state, 1)
+        tt.put(state, 2)
+        self.eq(1, len(tt))
+        self.false(self.state in tt)
+        self.eq(2, tt.get(state))